@@ -3,72 +3,87 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "abilities.py 2023-03-30T01:38:08-03:00"
+__version__ = "abilities.py 2026-10-19T00:30-03:00"
 
 # TODO:
 
 from utils import convert_to_numeric, convert_to_ability
 
+# The names of the abilities, in the order of their slots in Abilities
+ABILITY_NAMES = ('STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA')
+
 class Abilities():
     '''
-    A template for characteristics of Being abilities.
+    A template for characteristics of Being abilities, kept as six ints in slots.
     '''
+    __slots__ = ('_STR', '_DEX', '_CON', '_INT', '_WIS', '_CHA')
+
     def __init__(self, strength=10, dexterity=10, constitution=10, intelligence=10, wisdom=10, charisma=10):
-        self.abilities = {}
-        self.abilities['STR'] = convert_to_ability(strength)
-        self.abilities['DEX'] = convert_to_ability(dexterity)
-        self.abilities['CON'] = convert_to_ability(constitution)
-        self.abilities['INT'] = convert_to_ability(intelligence)
-        self.abilities['WIS'] = convert_to_ability(wisdom)
-        self.abilities['CHA'] = convert_to_ability(charisma)
+        self._STR = convert_to_ability(strength)
+        self._DEX = convert_to_ability(dexterity)
+        self._CON = convert_to_ability(constitution)
+        self._INT = convert_to_ability(intelligence)
+        self._WIS = convert_to_ability(wisdom)
+        self._CHA = convert_to_ability(charisma)
+
+    def to_dict(self):
+        '''
+        Get the Abilities as a dictionary for JSON, the values keyed under 'abilities'.
+        '''
+        return {'abilities': self.get_abilities()}
 
     def copy(self):
         '''
         Get an independent copy of an Abilities instance.
         '''
-        return Abilities(self.STR(), self.DEX(), self.CON(), 
-                         self.INT(), self.WIS(), self.CHA())
+        new_abilities = Abilities.__new__(Abilities)
+        for slot in self.__slots__:
+            setattr(new_abilities, slot, getattr(self, slot))
+        return new_abilities
+
     def STR(self):
         '''
         Set the value of the Strength ability.
         '''
-        return self.abilities.get('STR')
+        return self._STR
 
     def DEX(self):
         '''
         Set the value of the Dexterity ability.
         '''
-        return self.abilities.get('DEX')
+        return self._DEX
 
     def CON(self):
         '''
         Set the value of the Constitution ability.
         '''
-        return self.abilities.get('CON')
+        return self._CON
 
     def INT(self):
         '''
         Set the value of the Intelligence ability.
         '''
-        return self.abilities.get('INT')
+        return self._INT
 
     def WIS(self):
         '''
         Set the value of the Wisdom ability.
         '''
-        return self.abilities.get('WIS')
+        return self._WIS
 
     def CHA(self):
         '''
         Set the value of the Charisma ability.
         '''
-        return self.abilities.get('CHA')
+        return self._CHA
 
     def get_abilities(self):
         '''
-        Get the entire ability dictionary.
+        Get the entire ability dictionary. Changing the dictionary does not change the
+        Abilities.
         '''
-        return self.abilities
+        return {name: getattr(self, slot)
+                for name, slot in zip(ABILITY_NAMES, self.__slots__)}
 
     def set_ability(self, ability, new_value):
         '''
@@ -78,5 +93,5 @@ class Abilities():
             return
         v = convert_to_ability(new_value)
         a = ability[:3].upper()
-        if v >= 0 and a in ['STR', 'DEX', 'CON', 'INT', 'WIS', 'CHA']:
-            self.abilities[a] = v
+        if v >= 0 and a in ABILITY_NAMES:
+            setattr(self, '_' + a, v)
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "action.py 2024-03-03T10:16-3:00"
+__version__ = "action.py 2026-10-18T21:15-03:00"
 
 # TODO: Implement drop_weapon()
 # TODO: Implement other options in damage_potential()
@@ -11,15 +11,146 @@ __version__ = "action.py 2024-03-03T10:16-3:00"
 # TODO: Implement Spells as instruments
 
 import json
+import random
+import uuid
+from bisect import bisect_right
+from fractions import Fraction
 
+from actiondictionary import ACTION_KIND_CODES, ACTION_KIND_OTHER, ACTION_KIND_SWING, \
+    ACTION_KIND_THRUST
 from armor import ArmorInstance
 from being import BeingInstance
+from damage import Hit, apply_hit, shield_stage, armor_stage
 from event import Event
 from object import ObjectInstance
 from strategy import Strategy
 from utils import roll_dice, get_random_key
 from weapon import WeaponInstance
 
+# The possible results of an attempt to hit, as returned by Action.hit_result()
+HIT_RESULTS = ("normal", "critical", "fatal", "hit self", "drop weapon", "miss", 
+               "spectacular miss")
+# The outcome code of each hit result, its position in HIT_RESULTS
+HIT_RESULT_CODES = {result: code for code, result in enumerate(HIT_RESULTS)}
+
+def hit_result_probabilities(level, difficulty_class, save_modifier):
+    """
+    Get the exact probability of each hit result of Action.hit_result() as a dictionary of
+    result to Fraction, where level is the attack level of the actor less the defense level
+    of the target and save_modifier is the saving throw modifier of the actor.
+    """
+    # BeingInstance.makes_save(): 1 fails, 20 succeeds, otherwise the roll must reach 
+    # the difficulty class less the modifier
+    saves = sum(1 for roll in range(2, 20) if roll >= difficulty_class - save_modifier) + 1
+    p_save = Fraction(saves, 20)
+    die = Fraction(1, 20)
+    probabilities = {result: Fraction(0) for result in HIT_RESULTS}
+    for roll in range(1, 21):
+        if roll == 20:
+            for threat_roll in range(1, 21):
+                if threat_roll == 20:
+                    probabilities["fatal"] += die * die * (1 - p_save)
+                    probabilities["critical"] += die * die * p_save
+                elif threat_roll + level >= difficulty_class:
+                    probabilities["critical"] += die * die
+                else:
+                    probabilities["normal"] += die * die
+        elif roll == 1:
+            probabilities["hit self"] += die * die
+            if not roll + level >= difficulty_class:
+                probabilities["drop weapon"] += die * (1 - die) * (1 - p_save)
+                probabilities["spectacular miss"] += die * (1 - die) * p_save
+            else:
+                probabilities["miss"] += die * (1 - die)
+        elif roll + level >= difficulty_class:
+            probabilities["normal"] += die
+        else:
+            probabilities["miss"] += die
+    return probabilities
+
+# Cumulative hit result tables by (level, difficulty_class, save_modifier)
+_hit_result_tables = {}
+
+def hit_result_table(level, difficulty_class, save_modifier):
+    """
+    Get the cumulative probabilities and results from which Action.fast_hit_result() 
+    draws, computing them the first time they are needed.
+    """
+    key = (level, difficulty_class, save_modifier)
+    table = _hit_result_tables.get(key)
+    if table is None:
+        cumulative = []
+        results = []
+        total = Fraction(0)
+        for result, p in hit_result_probabilities(*key).items():
+            if p > 0:
+                total += p
+                cumulative.append(float(total))
+                results.append(result)
+        cumulative[-1] = 1.0
+        table = (cumulative, results)
+        _hit_result_tables[key] = table
+    return table
+
+def action_name(actor_name, event_type, time):
+    """
+    Get the name of an Action by an actor of the given name started at the given time.
+    """
+    if event_type == "thrust":
+        return f"{actor_name} thrust at t={time}"
+    return f"{actor_name} {event_type} t={time}"
+
+class ActionRecord():
+    """
+    A compact record of a resolved Action, which takes the place of the Action in the 
+    event history: the ids of the actor, target and instrument, the times, the outcome 
+    code of the hit result (None if there was none), the damage rolled, the damage the 
+    shield and armor of the victim stopped and the damage applied to the victim.
+    """
+    __slots__ = ("id", "event_type", "actor_id", "target_id", "instrument_id", 
+                 "start_time", "end_time", "outcome", "rolled_damage", "shield_stopped",
+                 "armor_stopped", "applied_damage")
+    type = "ActionRecord"
+
+    def __init__(self, id, event_type, actor_id, target_id, instrument_id, start_time,
+                 end_time, outcome=None, rolled_damage=0, shield_stopped=0, 
+                 armor_stopped=0, applied_damage=0):
+        self.id = id
+        self.event_type = event_type
+        self.actor_id = actor_id
+        self.target_id = target_id
+        self.instrument_id = instrument_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.outcome = outcome
+        self.rolled_damage = rolled_damage
+        self.shield_stopped = shield_stopped
+        self.armor_stopped = armor_stopped
+        self.applied_damage = applied_damage
+
+    def hit_result(self):
+        """
+        Get the hit result of the outcome code, None if there was none.
+        """
+        if self.outcome is None:
+            return None
+        return HIT_RESULTS[self.outcome]
+
+    def to_dict(self):
+        """
+        Get the ActionRecord as a dictionary, with its type.
+        """
+        data = {"type": self.type}
+        for slot in self.__slots__:
+            data[slot] = getattr(self, slot)
+        return data
+
+    def to_json(self):
+        """
+        Serialize the ActionRecord as JSON.
+        """
+        return json.dumps(self.to_dict(), indent = 2)
+
 class Action(Event):
     """
     An Event with an ObjectInstance as the actor and an ObjectInstance or Location as an
@@ -39,6 +170,7 @@ class Action(Event):
         location=None,
         name=None,
         parent_event_id=None,
+        id=None,
     ):
         Event.__init__(
             self,
@@ -49,18 +181,80 @@ class Action(Event):
             location,
             name,
             parent_event_id,
+            id,
         )
         self.actor_id = actor_id
         self.target_id = target_id
         self.instrument_id = instrument_id
         self.strategy = strategy or Strategy()
+        self._prepare()
+
+    def _prepare(self):
+        """
+        Set the working state of a new or recycled Action and its end time.
+        """
+        # Objects resolved once by bind(), used instead of registry lookups when bound
+        self._bound = False
+        self._actor = None
+        self._target = None
+        self._instrument = None
+        self._actor_armor = None
+        self._target_armor = None
+        self._actor_shields = None
+        self._target_shields = None
+        self._shield_instances = None
+        # The attack level and save modifier of the bound actor against the bound target
+        self._attack_level = None
+        self._save_modifier = None
+        # The outcome of the Action once resolved, None until then (see set_outcome())
+        self.outcome = None
+        self.rolled_damage = None
+        self.shield_stopped = None
+        self.armor_stopped = None
+        self.applied_damage = None
+        # The kind code of the event_type, compared instead of the string when resolving
+        self._kind = ACTION_KIND_CODES.get(self.event_type, ACTION_KIND_OTHER)
         self.end_time = self.calculate_end_time(0, self.strategy.timing_adjustment())
         instrument = self.get_instrument()
         if instrument is not None:
-            if self.event_type == 'swing':
+            if self._kind == ACTION_KIND_SWING:
                 self.end_time = self.calculate_end_time(instrument.current.St(), self.strategy.timing_adjustment())
-            elif self.event_type == 'thrust':
+            elif self._kind == ACTION_KIND_THRUST:
                 self.end_time = self.calculate_end_time(instrument.current.Tt(), self.strategy.timing_adjustment())
+        # The hit result table that fast_hit_result() draws from, once worked out, and the
+        # difficulty class it is for
+        self._hit_table = None
+        self._hit_table_dc = None
+
+    def recycle(self, start_time, event_type, actor_id, target_id, instrument_id, 
+                parent_event_id=None, id=None):
+        """
+        Make this Action, once resolved and recorded, into a new one with the given times, 
+        ids and parent and the same Universe and Strategy. It has no name until one is set
+        or it is read (see __getattr__()).
+        """
+        self.id = id
+        self.start_time = start_time
+        self.end_time = None
+        self.event_type = event_type
+        self.location = None
+        self.parent_event_id = parent_event_id
+        self.actor_id = actor_id
+        self.target_id = target_id
+        self.instrument_id = instrument_id
+        self.__dict__.pop("name", None)
+        self._prepare()
+
+    def __getattr__(self, attribute):
+        """
+        Make the name of an Action that has none (see recycle()) the first time it is read.
+        """
+        if attribute == "name":
+            actor = self.universe.get_object_by_id(self.actor_id)
+            actor_name = None if actor is None else actor.name
+            self.name = action_name(actor_name, self.event_type, self.start_time)
+            return self.name
+        raise AttributeError(f"'Action' object has no attribute '{attribute}'")
 
     def to_json(self):
         """
@@ -77,29 +271,122 @@ class Action(Event):
             "actor_id": self.actor_id,
             "target_id": self.target_id,
             "instrument_id": self.instrument_id,
-            "strategy": json.loads(self.strategy.to_json())
+            "strategy": json.loads(self.strategy.to_json()),
+            "outcome": self.outcome,
+            "rolled_damage": self.rolled_damage,
+            "shield_stopped": self.shield_stopped,
+            "armor_stopped": self.armor_stopped,
+            "applied_damage": self.applied_damage
         }
         return json.dumps(data, indent = 2)
 
-    def resolve(self, difficulty_class):
+    def resolve(self, difficulty_class, rng=None, use_hit_table=False):
+        """
+        Resolve the effects of this Action. rng is a random.Random or compatible generator,
+        the random module if None. With use_hit_table, the hit result comes from 
+        fast_hit_result(). Return the hit result and the applied Hit, None if the result 
+        does no damage.
+        """
+        hit_type, hit = self.roll_hit(difficulty_class, rng, use_hit_table)
+        if hit is not None:
+            apply_hit(hit)
+        self.set_outcome(hit_type, hit)
+        return hit_type, hit
+
+    def set_outcome(self, hit_type, hit=None):
+        """
+        Record on this Action the outcome code of its hit result and, from its applied 
+        Hit, the damage rolled, the damage stopped by the shield and armor of the victim 
+        and the damage applied to the victim, all 0 if there was no Hit.
+        """
+        self.outcome = HIT_RESULT_CODES.get(hit_type)
+        if hit is None or hit.applied is None:
+            self.rolled_damage = 0
+            self.shield_stopped = 0
+            self.armor_stopped = 0
+            self.applied_damage = 0
+            return
+        self.rolled_damage = hit.damage + hit.unstopped
+        self.shield_stopped = hit.shield_stopped
+        self.armor_stopped = hit.armor_stopped
+        self.applied_damage = hit.applied
+
+    def record(self):
+        """
+        Get an ActionRecord of this Action with the outcome recorded by set_outcome().
         """
-        Resolve the effects of this Action.
+        return ActionRecord(self.id, self.event_type, self.actor_id, self.target_id, 
+                            self.instrument_id, self.start_time, self.end_time,
+                            self.outcome, self.rolled_damage or 0, self.shield_stopped or 0,
+                            self.armor_stopped or 0, self.applied_damage or 0)
+
+    def roll_hit(self, difficulty_class, rng=None, use_hit_table=False):
         """
-        hit_type = self.hit_result(difficulty_class)
+        Roll the hit result of this Action and, if it does damage, the Hit that carries
+        the damage to its victim, without applying it. Return (hit type, Hit or None). The
+        hit results that do no damage are resolved at once.
+        """
+        if use_hit_table:
+            hit_type = self.fast_hit_result(difficulty_class, rng)
+        else:
+            hit_type = self.hit_result(difficulty_class, rng)
         if hit_type == "normal":
-            self.do_normal_hit()
+            return hit_type, self.roll_normal_hit(rng)
         elif hit_type == "critical":
-            self.do_critical_hit()
+            return hit_type, self.roll_critical_hit(rng)
         elif hit_type == "fatal":
-            self.do_fatal_hit()
+            return hit_type, self.roll_fatal_hit()
         elif hit_type == "hit self":
-            self.do_critical_failure()
+            return hit_type, self.roll_critical_failure(rng)
         elif hit_type == "drop weapon":
             self.do_drop_weapon()
         elif hit_type == "miss":
             self.do_miss()
         elif hit_type == "spectacular miss":
             self.do_spectacular_miss()
+        return hit_type, None
+
+    def bind(self):
+        """
+        Resolve the actor, target, instrument and the armor and shields of the actor and 
+        target to the objects themselves, once, so that resolving the Action does not 
+        look them up again. The attack level and save modifier that fast_hit_result() 
+        needs are worked out here too. Changes to them after bind() are not seen by the 
+        Action. Only the ids are serialized.
+        """
+        self._bound = False
+        self._hit_table = None
+        self._hit_table_dc = None
+        actor = self.get_actor()
+        target = self.get_target()
+        self._actor = actor
+        self._target = target
+        self._instrument = self.get_instrument()
+        self._actor_armor = None
+        self._actor_shields = {}
+        if isinstance(actor, BeingInstance):
+            self._actor_armor = self.universe.get_object_by_id(actor.get_armor_id())
+            self._actor_shields = actor.shielded_with(self.universe)
+        self._target_armor = None
+        self._target_shields = {}
+        if isinstance(target, BeingInstance):
+            self._target_armor = self.universe.get_object_by_id(target.get_armor_id())
+            self._target_shields = target.shielded_with(self.universe)
+        self._shield_instances = {}
+        for shield_id in list(self._actor_shields.values()) + list(self._target_shields.values()):
+            self._shield_instances[shield_id] = self.universe.get_object_by_id(shield_id)
+        self._attack_level = None
+        self._save_modifier = None
+        if actor is not None:
+            self._attack_level = self.attack_level(actor)
+            self._save_modifier = actor.save_modifier()
+        self._bound = True
+
+    def is_bound(self):
+        """
+        Determine if the Action uses the objects resolved by bind().
+        """
+        return self._bound
 
     # Actor Management
     def set_actor_id(self, actor_id):
@@ -117,6 +404,8 @@ class Action(Event):
         """
         Get the instance of the actor for the Action.
         """
+        if self._bound:
+            return self._actor
         return self.universe.get_object_by_id(self.actor_id)
 
     def get_actor_strategy(self):
@@ -157,6 +446,8 @@ class Action(Event):
         """
         Get the instance of the target of the Action.
         """
+        if self._bound:
+            return self._target
         return self.universe.get_object_by_id(self.target_id)
 
     def get_target_strategy(self):
@@ -197,6 +488,8 @@ class Action(Event):
         """
         Get the instance of the instrument used for the Action.
         """
+        if self._bound:
+            return self._instrument
         return self.universe.get_object_by_id(self.instrument_id)
 
     # Strategy Management
@@ -216,112 +509,126 @@ class Action(Event):
         Get the base damage that can be done by the instrument in the Action.
         """
         instrument = self.get_instrument()
-        if self.event_type == 'swing':
+        if self._kind == ACTION_KIND_SWING:
             if instrument.Sd() is None:
                 return 0
             return instrument.Sd()
-        elif self.event_type == 'thrust':
+        elif self._kind == ACTION_KIND_THRUST:
             if instrument.Td() is None:
                 return 0
             return instrument.Td()
         return 0
 
-    def _resolve_damage_to_target_shield(self, damage):
+    def _resolve_damage_to_target_shield(self, damage, rng=None):
         """
         Apply damage to the target's shield and return the amount that gets through.
         """
-        # See if damage hits a shield
-        target = self.get_target()
-        if not isinstance(target, BeingInstance):
-            return damage
-        shields = target.shielded_with(self.universe)
-        target_shield_location = get_random_key(shields)
-        target_shield_id = shields.get(target_shield_location)
-        return self._resolve_damage_to_shield(target_shield_id, damage)
+        shield, shield_roll = self._roll_target_shield(rng)
+        return shield_stage(damage, shield, shield_roll)
 
-    def _resolve_damage_to_actor_shield(self, damage):
+    def _resolve_damage_to_actor_shield(self, damage, rng=None):
         """
         Apply damage to the actor's shield and return the amount that gets through.
         """
-        # See if damage hits a shield
-        actor = self.get_actor()
-        if not isinstance(actor, BeingInstance):
-            return damage
-        shields = actor.shielded_with(self.universe)
-        actor_shield_location = get_random_key(shields)
-        actor_shield_id = shields.get(actor_shield_location)
-#        print(f"actor_shield: {actor_shield_id} location: {actor_shield_location} shields: {shields}")
-        return self._resolve_damage_to_shield(actor_shield_id, damage)
-
-    def _resolve_damage_to_shield(self, shield_id, damage):
-        """
-        Apply damage to a specified shield and return the amount that gets through.
-        """
-        shield_instance = self.universe.get_object_by_id(shield_id)
-#        print(f"{shield_instance.to_json()}")
-        if shield_instance is None:
-#            print(f"No shield instance in _resolve_damage_to_actor_shield()")
-            return damage
-        if not isinstance(shield_instance, WeaponInstance):
-#            print(f"Shield instance not a WeaponInstance in _resolve_damage_to_actor_shield()")
-            return damage
-        shield_size = shield_instance.get_weapon_size()
-        # If a roll on a d10 is less than or equal to the shield size+4, the attack
-        # hits the shield first and it will stop damage equal to the lesser of a) the
-        # damage done in the attack and, b) the shield size. For each hit on the
-        # shield,  the total damage in excess of the shield size is taken from the
-        # shield’s hit points.
-        shield_roll = roll_dice("1d10+0")
-#        print(f"Shield size: {shield_size} shield roll: {shield_roll}")
-        if shield_roll <= int(shield_size) + 4:
-            # Damage shield
-            shield_instance.damage(damage)
-#            print(f"Shield {shield_instance.name} was hit for {damage} damage leaving {shield_instance.current.hit_points} hit points")
-            remaining_damage = damage - int(shield_size)
-            if remaining_damage < 0:
-                remaining_damage = 0
-#            print(f"{remaining_damage} gets through shield")
-            return remaining_damage
-        else:
-#            print(f"All {damage} damage passes shield")
-            pass
-        return damage
+        shield, shield_roll = self._roll_actor_shield(rng)
+        return shield_stage(damage, shield, shield_roll)
 
     def _resolve_damage_to_target_armor(self, damage):
         """
         Apply damage to the target's armor and return the amount that gets through.
         """
-        target_armor = self.universe.get_object_by_id(self.get_target_armor_id())
-        if target_armor is None:
-            return damage
-        weapon = self.universe.get_object_by_id(self.instrument_id)
-        if weapon is None:
-            return damage
-        attack_type = self.event_type
-        penetration_types = weapon.get_penetration_types(attack_type)
-        damage_to_armor = target_armor.damage_to_armor(damage, penetration_types)
-        damage_through = target_armor.damage_through(damage, weapon, attack_type)
-        target_armor.damage(damage_to_armor)
-#        print(f"_resolve_damage_to_target_armor(): {target_armor.name} hit for {damage_to_armor} from {attack_type} leaving {target_armor.hit_points()}, penetration types: {penetration_types}, {damage_through} gets through")
-        return damage_through
+        armor, penetration_types = self._armor_hit(self._get_target_armor())
+        return armor_stage(damage, armor, penetration_types)
 
     def _resolve_damage_to_actor_armor(self, damage):
         """
         Apply damage to the actor's armor and return the amount that gets through.
         """
-        actor_armor = self.universe.get_object_by_id(self.get_actor_armor_id())
-        if actor_armor is None:
-            return damage
-        weapon = self.universe.get_object_by_id(self.instrument_id)
+        armor, penetration_types = self._armor_hit(self._get_actor_armor())
+        return armor_stage(damage, armor, penetration_types)
+
+    def _roll_target_shield(self, rng=None):
+        """
+        Choose the target's shield that the attack may hit and roll for whether it does.
+        """
+        target = self.get_target()
+        if not isinstance(target, BeingInstance):
+            return None, None
+        if self._bound:
+            return self._roll_shield(self._target_shields, rng)
+        return self._roll_shield(target.shielded_with(self.universe), rng)
+
+    def _roll_actor_shield(self, rng=None):
+        """
+        Choose the actor's shield that the attack may hit and roll for whether it does.
+        """
+        actor = self.get_actor()
+        if not isinstance(actor, BeingInstance):
+            return None, None
+        if self._bound:
+            return self._roll_shield(self._actor_shields, rng)
+        return self._roll_shield(actor.shielded_with(self.universe), rng)
+
+    def _roll_shield(self, shields, rng=None):
+        """
+        Choose one of the given shields, a dictionary of locations to shield ids, at
+        random and roll the d10 that decides if the attack hits it. Return (shield, roll),
+        (None, None) if there is no shield.
+        """
+        shield_id = shields.get(get_random_key(shields, rng))
+        if self._bound:
+            shield_instance = self._shield_instances.get(shield_id)
+        else:
+            shield_instance = self.universe.get_object_by_id(shield_id)
+        if not isinstance(shield_instance, WeaponInstance):
+            return None, None
+        return shield_instance, roll_dice("1d10+0", rng)
+
+    def _get_target_armor(self):
+        """
+        Get the ArmorInstance of the target, None if none.
+        """
+        if self._bound:
+            return self._target_armor
+        return self.universe.get_object_by_id(self.get_target_armor_id())
+
+    def _get_actor_armor(self):
+        """
+        Get the ArmorInstance of the actor, None if none.
+        """
+        if self._bound:
+            return self._actor_armor
+        return self.universe.get_object_by_id(self.get_actor_armor_id())
+
+    def _armor_hit(self, armor):
+        """
+        Get the armor that stops part of the attack and the penetration types of the 
+        attack against it, (None, None) if there is no armor or no instrument.
+        """
+        if armor is None:
+            return None, None
+        weapon = self.get_instrument()
         if weapon is None:
-            return damage
-        attack_type = self.event_type
-        penetration_types = weapon.get_penetration_types(attack_type)
-        damage_to_armor = actor_armor.damage_to_armor(damage, penetration_types)
-        damage_through = actor_armor.damage_through(damage, weapon, attack_type)
-        actor_armor.damage(damage_to_armor)
-#        print(f"PTs: {penetration_types} damage to armor: {damage_to_armor} damage through: {damage_through}")
-        return damage_through
+            return None, None
+        return armor, weapon.get_penetration_types(self.event_type)
+
+    def _target_hit(self, damage, unstopped, rng=None):
+        """
+        Make the Hit of damage to the target, rolling for whether it hits a shield.
+        """
+        shield, shield_roll = self._roll_target_shield(rng)
+        armor, penetration_types = self._armor_hit(self._get_target_armor())
+        return Hit(self.get_target(), damage, unstopped, shield, shield_roll, armor,
+                   penetration_types)
+
+    def _actor_hit(self, damage, rng=None):
+        """
+        Make the Hit of damage to the actor, rolling for whether it hits a shield.
+        """
+        shield, shield_roll = self._roll_actor_shield(rng)
+        armor, penetration_types = self._armor_hit(self._get_actor_armor())
+        return Hit(self.get_actor(), damage, 0, shield, shield_roll, armor,
+                   penetration_types)
 
     # Hit Results and Types
     def roll_hits(self, roll, difficulty_class):
@@ -332,35 +639,42 @@ class Action(Event):
         if actor is None:
             print("Ojo, eh! This shouldn't happen. roll_hits() has no actor.")
             return False
+        return roll + self.attack_level(actor) >= difficulty_class
+
+    def attack_level(self, actor=None):
+        """
+        Get the attack level of the actor less the defense level of the target. Pass the
+        actor if it is at hand to save looking it up.
+        """
+        if actor is None:
+            actor = self.get_actor()
 
         # Get the attacker's attack level
-        actor_strategy = self.get_actor_strategy()
-        aal = 0
-        aal += actor.get_weapon_skill_level(self.instrument_id)
-        if actor_strategy is not None:
-            aal += actor_strategy.attack 
+        aal = actor.get_weapon_skill_level(self.instrument_id)
+        if actor.strategy is not None:
+            aal += actor.strategy.attack 
 
         # Get the defender's defense level
         target_strategy = self.get_target_strategy()
         ddl = 0
         if target_strategy is not None:
             ddl = target_strategy.defense
-        return roll + aal - ddl >= difficulty_class
+        return aal - ddl
 
-    def hit_result(self, difficulty_class):
+    def hit_result(self, difficulty_class, rng=None):
         """
         Determine the type of result from an attempt to hit.
         """
-        roll = roll_dice("1d20")
+        roll = roll_dice("1d20", rng)
         actor = self.get_actor()
         if actor is None:
             print("Ojo, eh! This shouldn't happen. hit_result() has no actor.")
             return None
         if roll == 20:
             # The hit is a threat
-            threat_roll = roll_dice("1d20")
+            threat_roll = roll_dice("1d20", rng)
             if threat_roll == 20:
-                saved = actor.makes_save(actor.current.abilities.CON, difficulty_class)
+                saved = actor.makes_save(actor.current.abilities.CON, difficulty_class, rng)
                 if not saved:
                     return "fatal"
                 else:
@@ -372,13 +686,13 @@ class Action(Event):
                 return "normal"
         elif roll == 1:
             # The attempt was a potentially dangerous failure
-            threat_roll = roll_dice("1d20")
+            threat_roll = roll_dice("1d20", rng)
             if threat_roll == 1:
                 # Hit actor instead of target
                 return "hit self"
             elif not self.roll_hits(roll, difficulty_class):
                 # Actor must make Reflex Saving Throw
-                saved = actor.makes_save(actor.current.abilities.DEX, difficulty_class)
+                saved = actor.makes_save(actor.current.abilities.DEX, difficulty_class, rng)
                 if saved == False:
                     return "drop weapon"
                 else:
@@ -390,26 +704,83 @@ class Action(Event):
         else:
             return "miss"
 
-    def do_normal_hit(self):
+    def fast_hit_result(self, difficulty_class, rng=None):
+        """
+        Determine the type of result from an attempt to hit with a single uniform draw from
+        the precomputed table of hit result probabilities. The results have the same 
+        distribution as those of hit_result(). The Action keeps its table (see hit_table()),
+        so each draw after the first is one random number and a bisection.
+        """
+        table = self._hit_table
+        if table is None or self._hit_table_dc != difficulty_class:
+            table = self.hit_table(difficulty_class)
+            if table is None:
+                return None
+        if rng is None:
+            rng = random
+        cumulative, results = table
+        return results[bisect_right(cumulative, rng.random())]
+
+    def hit_table(self, difficulty_class):
+        """
+        Get the (cumulative probabilities, results) table of the hit results of the 
+        Action, None if it has no actor. The table is kept for the difficulty class, so 
+        changes to the actor and target after that are not seen. A bound Action uses the 
+        attack level and save modifier worked out by bind(), with no lookups.
+        """
+        if self._bound:
+            if self._actor is None:
+                print("Ojo, eh! This shouldn't happen. hit_table() has no actor.")
+                return None
+            self._hit_table = hit_result_table(self._attack_level, difficulty_class,
+                                               self._save_modifier)
+            self._hit_table_dc = difficulty_class
+            return self._hit_table
+        actor = self.get_actor()
+        if actor is None:
+            print("Ojo, eh! This shouldn't happen. hit_table() has no actor.")
+            return None
+        self._hit_table = hit_result_table(self.attack_level(actor), difficulty_class,
+                                           actor.save_modifier())
+        self._hit_table_dc = difficulty_class
+        return self._hit_table
+
+    def do_normal_hit(self, rng=None):
         """
         Distribute damage from a successful normal hit.
         """
+        apply_hit(self.roll_normal_hit(rng))
+
+    def do_critical_hit(self, rng=None):
+        """
+        Distribute damage from a successful critical hit.
+        """
+        apply_hit(self.roll_critical_hit(rng))
+
+    def do_critical_failure(self, rng=None):
+        """
+        Distribute damage to the actor from a critical failure.
+        """
+        apply_hit(self.roll_critical_failure(rng))
+
+    def roll_normal_hit(self, rng=None):
+        """
+        Roll the damage of a successful normal hit.
+        """
         normal_damage = self.damage_potential()
         extra_damage = self.strategy.extra_damage
         damage_roll = 0
         try:
-            damage_roll = roll_dice(f"1d{normal_damage}")
+            damage_roll = roll_dice(f"1d{normal_damage}", rng)
         except Exception as e:
             instrument = self.get_instrument()
             print("Ojo, eh! This shouldn't happen. do_normal_hit() trying to roll 1d{normal_damage}.")
             print(f"event type: {self.event_type} normal_damage: {normal_damage} SD: {instrument.Sd()} TD: {instrument.Td()}")
-        remaining_damage = self._resolve_damage_to_target_shield(damage_roll + extra_damage)
-        remaining_damage = self._resolve_damage_to_target_armor(remaining_damage)
-        self.get_target().damage(remaining_damage)
+        return self._target_hit(damage_roll + extra_damage, 0, rng)
 
-    def do_critical_hit(self):
+    def roll_critical_hit(self, rng=None):
         """
-        Distribute damage from a successful critical hit.
+        Roll the damage of a successful critical hit.
         """
         # Critical hit damage (that part of damage from extra dice due to a hit being 
         # critical) is not stopped by shields or armor.
@@ -418,26 +789,33 @@ class Action(Event):
         damage_roll = 0
         critical_damage_roll = 0
         try:
-            damage_roll = roll_dice(f"1d{normal_damage}")
-            critical_damage_roll = roll_dice(f"1d{normal_damage}")
+            damage_roll = roll_dice(f"1d{normal_damage}", rng)
+            critical_damage_roll = roll_dice(f"1d{normal_damage}", rng)
         except Exception as e:
             instrument = self.get_instrument()
             print("Ojo, eh! This shouldn't happen. do_critical_hit() trying to roll 1d{normal_damage}.")
             print(f"event type: {self.event_type} normal_damage: {normal_damage} SD: {instrument.Sd()} TD: {instrument.Td()}")
-        remaining_damage = self._resolve_damage_to_target_shield(damage_roll + extra_damage)
-        remaining_damage = self._resolve_damage_to_target_armor(remaining_damage)
-        self.get_target().damage(remaining_damage + critical_damage_roll)
+        return self._target_hit(damage_roll + extra_damage, critical_damage_roll, rng)
 
-    def do_critical_failure(self):
+    def roll_critical_failure(self, rng=None):
         """
-        Distribute damage to the actor from a critical failure.
+        Roll the damage to the actor from a critical failure.
         """
         normal_damage = self.damage_potential()
         extra_damage = self.strategy.extra_damage
-        damage_roll = roll_dice(f"1d{normal_damage}")
-        remaining_damage = self._resolve_damage_to_actor_shield(damage_roll + extra_damage)
-        remaining_damage = self._resolve_damage_to_actor_armor(remaining_damage)
-        self.get_actor().damage(remaining_damage)
+        damage_roll = roll_dice(f"1d{normal_damage}", rng)
+        return self._actor_hit(damage_roll + extra_damage, rng)
+
+    def roll_fatal_hit(self):
+        """
+        Get the Hit of a critical hit that kills the target outright, None if there is
+        no target.
+        """
+        target = self.get_target()
+        if target is None:
+            print("Ojo, eh! This shouldn't happen. do_fatal_hit() has no target.")
+            return None
+        return Hit(target, fatal=True)
 
     def do_miss(self):
         """
@@ -468,13 +846,9 @@ class Action(Event):
         """
         Resolve the effect of a critical hit that kills the target outright.
         """
-        target = self.get_target()
-        if target is None:
-            print("Ojo, eh! This shouldn't happen. do_fatal_hit() has no target.")
-            return
-        if target.hit_points() > -10:
-            target.set_hit_points(-10)
-#        print(f"{target.name} fatally hit leaving {target.current.hit_points} hit points")
+        hit = self.roll_fatal_hit()
+        if hit is not None:
+            apply_hit(hit)
 
     # Utility Methods
     def calculate_end_time(self, action_timing, timing_adjustment):
@@ -487,3 +861,48 @@ class Action(Event):
             return self.start_time + 1
         else: 
             return self.start_time + action_timing - timing_adjustment
+
+class ActionPool():
+    """
+    Resolved Actions of a Universe kept for reuse, so that a long run makes no more 
+    Actions than it has pending at once. An Action from acquire() has a sequential id, unique to the 
+    pool, rather than a uuid, and no name until it is first read. An Action given back
+    with release() must no longer be referred to, other than by its ActionRecord.
+    """
+    def __init__(self, universe):
+        self.universe = universe
+        # Ids are the prefix and a count, so they do not clash with those of other pools
+        self.prefix = f"{uuid.uuid4().hex[:12]}-"
+        self.count = 0
+        self.free = []
+        # The number of Actions made rather than recycled
+        self.made = 0
+
+    def next_id(self):
+        """
+        Get the next sequential id.
+        """
+        self.count += 1
+        return f"{self.prefix}{self.count}"
+
+    def acquire(self, start_time, event_type, actor_id, target_id, instrument_id,
+                parent_event_id=None):
+        """
+        Get an Action with the default Strategy, recycled if one is free.
+        """
+        if len(self.free) > 0:
+            action = self.free.pop()
+            action.recycle(start_time, event_type, actor_id, target_id, instrument_id,
+                           parent_event_id, self.next_id())
+            return action
+        action = Action(self.universe, start_time, None, event_type, actor_id, target_id, 
+                        instrument_id, parent_event_id=parent_event_id, id=self.next_id())
+        del action.name
+        self.made += 1
+        return action
+
+    def release(self, action):
+        """
+        Give back a resolved and recorded Action for reuse.
+        """
+        self.free.append(action)
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "actiondictionary.py 2023-12-27T13:09-03:00"
+__version__ = "actiondictionary.py 2026-10-18T23:05-03:00"
 
 # TODO: Make action categories and populate the config/action_categories.tsv
 
@@ -11,6 +11,54 @@ import json
 
 from object import ObjectInstance
 
+# Codes of the kinds of Action, by the attack they make, so that the combat loop need 
+# not tell them apart by their names
+ACTION_KIND_OTHER = 0
+ACTION_KIND_SWING = 1
+ACTION_KIND_THRUST = 2
+# The kind code of each Action event_type
+ACTION_KIND_CODES = {"swing": ACTION_KIND_SWING, "thrust": ACTION_KIND_THRUST}
+
+# Codes of the target types of ActionDefinitions
+TARGET_NONE = 0
+TARGET_BEING = 1
+TARGET_OBJECT = 2
+TARGET_ATTACK = 3
+TARGET_WEAPON = 4
+TARGET_TYPE_CODES = {'none': TARGET_NONE, 'being': TARGET_BEING, 'object': TARGET_OBJECT,
+                     'attack': TARGET_ATTACK, 'weapon': TARGET_WEAPON}
+
+def action_kind(action_name):
+    '''
+    Get the kind code of an action from its name: a swing if the name has "swing" in it, 
+    otherwise a thrust if it has "thrust" in it.
+    '''
+    if "swing" in action_name:
+        return ACTION_KIND_SWING
+    if "thrust" in action_name:
+        return ACTION_KIND_THRUST
+    return ACTION_KIND_OTHER
+
+class CompiledAction():
+    '''
+    The properties of an ActionDefinition as codes, compiled once when it is added to an
+    ActionDictionary: the kind, the target type (TARGET_NONE if unknown), whether it is 
+    a melee action and the event_type of the Action it makes ("swing", "thrust" or None).
+    '''
+    __slots__ = ("name", "kind", "target_type", "required_skill", "is_melee", "event_type")
+
+    def __init__(self, name, target_type='object', required_skill='none', is_melee=False):
+        self.name = name
+        self.kind = action_kind(name)
+        self.target_type = TARGET_TYPE_CODES.get(target_type, TARGET_NONE)
+        self.required_skill = required_skill
+        # is_melee is the string 'True' when loaded from actions.tsv
+        self.is_melee = is_melee is True or is_melee == 'True'
+        self.event_type = None
+        for event_type, kind in ACTION_KIND_CODES.items():
+            if kind == self.kind:
+                self.event_type = event_type
+
 class ActionDefinition():
     '''
     A template for characteristics of an Action.
@@ -45,12 +93,84 @@ class ActionDefinition():
         '''
         return {'target_type': self.target_type, 'required_skill': self.required_skill, 'is_melee': self.is_melee}
 
+class ActionRule():
+    '''
+    The requirements that the equipment of a Being must meet for an action to be 
+    currently possible, compiled from the comma-separated requires column of 
+    action_rules.tsv. The requirements are:
+    free hand - a body part that holds nothing
+    armed - a body part that holds a weapon
+    swing weapon, thrust weapon - a weapon that can swing, or thrust
+    shield - a body part that holds a shield
+    category <weapon category> - a weapon of the given weapon category
+    not implemented - never met
+    No requirements are always met.
+    '''
+    requirements = ("free hand", "armed", "swing weapon", "thrust weapon", "shield",
+                    "not implemented")
+
+    def __init__(self, requires='', weapon_dictionary=None):
+        self.requires = requires
+        self.needs = set()
+        # A set of weapon types for each required weapon category
+        self.weapon_types = []
+        for requirement in requires.split(','):
+            requirement = requirement.strip()
+            if requirement == '':
+                continue
+            if requirement.startswith('category '):
+                category = requirement[len('category '):]
+                weapon_types = None
+                if weapon_dictionary is not None:
+                    weapon_types = weapon_dictionary.get_objects_in_category(category)
+                if weapon_types is None:
+                    raise ValueError(f"Unknown weapon category {category} in rule {requires}")
+                self.weapon_types.append(frozenset(weapon_types))
+            elif requirement in self.requirements:
+                self.needs.add(requirement)
+            else:
+                raise ValueError(f"Unknown requirement {requirement} in rule {requires}")
+
+    def is_met(self, capabilities):
+        '''
+        Determine if the CapabilityProfile of a Being meets the requirements.
+        '''
+        needs = self.needs
+        if "not implemented" in needs:
+            return False
+        if "free hand" in needs and not capabilities.has_free_hand:
+            return False
+        if "armed" in needs and len(capabilities.weapons) == 0:
+            return False
+        if "swing weapon" in needs and "swing" not in capabilities.melee_types:
+            return False
+        if "thrust weapon" in needs and "thrust" not in capabilities.melee_types:
+            return False
+        if "shield" in needs and len(capabilities.shields) == 0:
+            return False
+        for weapon_types in self.weapon_types:
+            if weapon_types.isdisjoint(capabilities.weapon_types):
+                return False
+        return True
+
 class ActionDictionary():
     '''
     A reference for information about ActionDefinitions.
     '''
     def __init__(self, dictionary_file=None):
         self.actions = {}
+        # A CompiledAction for each action
+        self.compiled_actions = {}
+        # The names of the actions that require each skill, in the order of the actions
+        self.actions_by_skill = {}
+        # The position of each action in the order of the actions
+        self._positions = {}
+        # Changed whenever the actions change, to tell when results based on them are stale
+        self.version = 0
+        # An ActionRule for each action that can be currently possible
+        self.rules = {}
+        # The actions whose rules are met, by the loadout of a CapabilityProfile
+        self._eligible = {}
 
         if dictionary_file is not None:
             self.load_actions(dictionary_file)
@@ -68,7 +188,25 @@ class ActionDictionary():
         if not isinstance(action_definition, ActionDefinition):
             raise TypeError('action_definition must be an instance of ActionDefinition')
             return
-        self.actions[action_definition.name]=action_definition.get_property_dict()
+        name = action_definition.name
+        old_properties = self.actions.get(name)
+        if old_properties is not None:
+            self.actions_by_skill[old_properties.get('required_skill')].remove(name)
+        else:
+            self._positions[name] = len(self.actions)
+        self.actions[name]=action_definition.get_property_dict()
+        self.compiled_actions[name] = CompiledAction(name, **self.actions[name])
+        self._index_action(name)
+        self.version += 1
+        self._eligible = {}
+
+    def _index_action(self, name):
+        '''
+        Add an action to the list of those that require its skill, in action order.
+        '''
+        names = self.actions_by_skill.setdefault(self.actions[name].get('required_skill'), [])
+        names.append(name)
+        names.sort(key=self._positions.__getitem__)
 
     def get_action_definition(self, action_name):
         '''
@@ -77,6 +215,12 @@ class ActionDictionary():
         '''
         return self.actions.get(action_name)
 
+    def get_compiled_action(self, action_name):
+        '''
+        Get the CompiledAction of an action. If not in the dictionary, return None
+        '''
+        return self.compiled_actions.get(action_name)
+
     def load_actions(self, filename):
         '''
         Load the ActionDictionary from file.
@@ -103,6 +247,73 @@ class ActionDictionary():
         Load the ActionDictionary from a dictionary.
         '''
         self.actions = action_dict.get('actions')
+        self.compiled_actions = {}
+        self.actions_by_skill = {}
+        self._positions = {}
+        self.version += 1
+        self._eligible = {}
+        if self.actions is not None:
+            for name, properties in self.actions.items():
+                self._positions[name] = len(self._positions)
+                if isinstance(properties, dict):
+                    self.compiled_actions[name] = CompiledAction(name, **properties)
+                    self._index_action(name)
+
+    def actions_requiring(self, skills):
+        '''
+        Get the names of the actions that require any of the given skills, in the order
+        of the actions.
+        '''
+        names = []
+        for skill in skills:
+            names.extend(self.actions_by_skill.get(skill, ()))
+        return sorted(set(names), key=self._positions.__getitem__)
+
+    def load_rules(self, filename, weapon_dictionary=None):
+        '''
+        Load the ActionRules of the actions from a file with the columns name, requires 
+        and notes, compiling weapon category requirements with the weapon_dictionary.
+        Raise a ValueError if an action in the ActionDictionary has no rule in the file.
+        '''
+        rules = {}
+        with open(filename, 'r') as f:
+            lines = f.readlines()
+            headers = lines[0].rstrip('\n').split('\t')
+            for line in lines[1:]:
+                fields = line.rstrip('\n').split('\t')
+                row = dict(zip(headers, fields))
+                if row.get('name', '') == '':
+                    continue
+                rules[row['name']] = ActionRule(row.get('requires', ''), weapon_dictionary)
+        self.check_rules(rules, filename)
+        self.rules = rules
+        self._eligible = {}
+
+    def check_rules(self, rules=None, source='the ActionDictionary'):
+        '''
+        Raise a ValueError if an action has no ActionRule in rules (the rules of the 
+        ActionDictionary if None), as it would never be possible.
+        '''
+        if rules is None:
+            rules = self.rules
+        missing = [name for name in self.actions if name not in rules]
+        if len(missing) > 0:
+            raise ValueError(f"No action rule in {source} for: {', '.join(missing)}")
+
+    def eligible_actions(self, capabilities):
+        '''
+        Get the set of the names of the actions whose ActionRules a CapabilityProfile 
+        meets. The set is worked out once for each distinct loadout. Raise a ValueError
+        if an action has no rule, such as when no rules were loaded.
+        '''
+        loadout = capabilities.loadout()
+        eligible = self._eligible.get(loadout)
+        if eligible is None:
+            self.check_rules()
+            eligible = frozenset(name for name, rule in self.rules.items() 
+                                 if rule.is_met(capabilities))
+            self._eligible[loadout] = eligible
+        return eligible
 
     def __iter__(self):
         '''
@@ -3,14 +3,32 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "armor.py 2024-03-15T22:47-03:00"
+__version__ = "armor.py 2026-10-18T23:40-03:00"
 
 # TODO: ArmorDefinitions will need widths and heights eventually
 
 import json
-from object import ObjectInstance, ObjectDefinition, ObjectDictionary
+from object import ObjectInstance, ObjectDefinition, ObjectDictionary, overlay
 from utils import convert_to_numeric
 
+def worst_defense_values(defenses, penetration_types):
+    '''
+    Get the (damage stopped, hardness) of the worst defenses in a dictionary of defenses
+    among the given comma-separated penetration types (e.g., "B,P,S"). Both are 0 if any
+    of the penetration types is not defended against (e.g., E (Entangle)).
+    '''
+    least_defense_damage = 1000
+    least_defense_hardness = 1000
+    for p in penetration_types.split(','):
+        defense = defenses.get(p)
+        if defense is None:
+            return (0, 0)
+        if defense['d'] < least_defense_damage:
+            least_defense_damage = defense['d']
+        if defense['h'] < least_defense_hardness:
+            least_defense_hardness = defense['h']
+    return (least_defense_damage, least_defense_hardness)
+
 class ArmorDefinition(ObjectDefinition):
     '''
     A template for characteristics of an Armor, which is a subtype of Object.
@@ -113,8 +131,21 @@ class ArmorInstance(ObjectInstance):
     '''
     def __init__(self, armor_definition, name=None):
         ObjectInstance.__init__(self, armor_definition, name)
-        self.original = armor_definition
-        self.current = armor_definition.copy()
+        # (damage stopped, hardness) by penetration types, possibly shared with the
+        # PenetrationMatrix of a Library until the defenses of the ArmorInstance change
+        self._defense_table = {}
+        # The shared table, if any, to go back to when the ArmorInstance is reset
+        self._shared_defense_table = None
+
+    def reset(self):
+        '''
+        Set all of the current values of the ArmorInstance to their original values.
+        '''
+        self.current = overlay(self.original)
+        if self._shared_defense_table is not None:
+            self._defense_table = self._shared_defense_table
+        else:
+            self._defense_table = {}
 
     def Bh(self):
         '''
@@ -178,35 +209,47 @@ class ArmorInstance(ObjectInstance):
         Set a given defense attribute of a defense type to a new value.
         '''
         try:
-            self.defenses[defense_type][defense_attribute] = new_value
-            if self.defenses[defense_type][defense_attribute] < 0:
-                self.defenses[defense_type][defense_attribute] = 0
-        except Exception(e):
+            self.current.defenses[defense_type][defense_attribute] = new_value
+            if self.current.defenses[defense_type][defense_attribute] < 0:
+                self.current.defenses[defense_type][defense_attribute] = 0
+        except (KeyError, TypeError):
             return
+        self._defense_table = {}
 
     def set_defenses(self, new_defenses_dict):
         '''
         Set the current defenses of the armor via a dictionary of defenses.
         '''
         self.current.defenses = new_defenses_dict
+        self._defense_table = {}
+
+    def share_defense_table(self, defense_table):
+        '''
+        Use a table of (damage stopped, hardness) by penetration types computed for the
+        defenses of the ArmorDefinition, such as one from a PenetrationMatrix. The table
+        is dropped when the defenses of the ArmorInstance are set, and used again when it
+        is reset.
+        '''
+        self._defense_table = defense_table
+        self._shared_defense_table = defense_table
+
+    def worst_defense_values(self, penetration_types):
+        '''
+        Get the (damage stopped, hardness) of the worst current defenses among the given
+        list of penetration types, looked up once per list of penetration types.
+        '''
+        values = self._defense_table.get(penetration_types)
+        if values is None:
+            values = worst_defense_values(self.current.defenses, penetration_types)
+            self._defense_table[penetration_types] = values
+        return values
 
     def worst_defense_damage_stopped(self, penetration_types):
         '''
         Return the amount of damage stopped by the armor for the worst defense among the 
         given list of penetration types.
         '''
-        least_defense_damage = 1000
-        for p in penetration_types.split(','):
-            try:
-                pdamage = self.current.defenses[p]['d']
-    #            print(f'damage stopped for pt {p} is {pdamage}')
-            except Exception as e:
-                # The penetration type is E (Entangle) only and the weapon does no damage
-#                print(f"defenses: {self.current.defenses}")
-                return 0
-            if pdamage < least_defense_damage:
-                least_defense_damage = pdamage
-        return least_defense_damage
+        return self.worst_defense_values(penetration_types)[0]
 
     def worst_defense_hardness(self, penetration_types):
         '''
@@ -214,18 +257,7 @@ class ArmorInstance(ObjectInstance):
         penetration types. The list must be a comma-separated string of valid penetration
         types (e.g., "B,P,S").
         '''
-        least_defense_hardness = 1000
-        for p in penetration_types.split(','):
-            try:
-                phardness = self.current.defenses[p]['h']
-            except Exception as e:
-                # The penetration type is E (Entangle) only and the weapon does no damage
-#                print(f"defenses: {self.current.defenses}")
-                return 0
-#            print(f'hardness for pt {p} is {phardness}')
-            if phardness < least_defense_hardness:
-                least_defense_hardness = phardness
-        return least_defense_hardness
+        return self.worst_defense_values(penetration_types)[1]
 
     def damage_to_armor(self, damage, penetration_types):
         '''
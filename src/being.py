@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "being.py 2024-03-15T22:47-03:00"
+__version__ = "being.py 2026-10-18T23:55-03:00"
 
 # TODO: BeingDictionary should probably be saved and loaded as JSON.
 # TODO: Check for properties that need constraints and implement them (a finished example is experience)
@@ -16,15 +16,21 @@ import random
 
 from abilities import Abilities
 from actiondictionary import ActionDictionary
-from object import ObjectDefinition, ObjectInstance, ObjectDictionary
+from object import ObjectDefinition, ObjectInstance, ObjectDictionary, overlay
 from skill import Skills
 from speeds import Speed
-from states import States
+from states import States, state_bit
 from strategy import Strategy
 from utils import convert_to_numeric, convert_to_experience, convert_to_fatigue, roll_dice
 from utils import experience_level, saving_throw_experience_modifier
 from weapon import WeaponInstance, WeaponDictionary
 
+# The bits of the states checked on every tick in the bitsets of States
+PINNED = state_bit('pinned')
+PARALYZED = state_bit('paralyzed')
+STUNNED = state_bit('stunned')
+HELPLESS_STATES = PARALYZED | STUNNED
+
 class BeingDefinition(ObjectDefinition):
     '''
     A template for characteristics of a Being, which is a subtype of Object.
@@ -336,23 +342,90 @@ class BeingDefinition(ObjectDefinition):
         '''
         self.states.set_state(state_list, state_name, value)
 
+class CapabilityProfile():
+    '''
+    What the equipment of a BeingInstance in a Universe lets it do: the body parts that
+    hold weapons and shields (in body part order, as armed_with() and shielded_with()), 
+    the melee types and weapon types of its weapons, whether it has a free hand and the 
+    id of its armor.
+    '''
+    def __init__(self, being, universe):
+        self.universe = universe
+        # The body parts the profile was made from, to tell if they have been replaced
+        self.body_parts = being.get_body_parts()
+        self.armor_id = being.get_armor_id()
+        self.weapons = {}
+        self.shields = {}
+        self.melee_types = set()
+        self.weapon_types = set()
+        self.has_free_hand = False
+        # The names of the actions the profile makes eligible, once looked up
+        self.eligible = None
+        weapon_dict = universe.get_weapon_dictionary()
+        shield_types = set(weapon_dict.get_objects_in_category('Shields') or [])
+        for body_location, object_id in self.body_parts.items():
+            if object_id is None: # at least one hand unarmed
+                self.has_free_hand = True
+                continue
+            the_object = universe.get_object_by_id(object_id)
+            if the_object is None:
+                continue
+            if weapon_dict.get_object_definition(the_object.current.obj_type) is not None:
+                self.weapons[body_location] = object_id
+                self.melee_types.update(the_object.get_melee_types())
+                self.weapon_types.add(the_object.current.obj_type)
+            if the_object.current.obj_type in shield_types:
+                self.shields[body_location] = object_id
+
+    def loadout(self):
+        '''
+        Get what the ActionRules of an ActionDictionary can require of the profile, as a
+        key shared by all profiles with the same loadout.
+        '''
+        return (self.has_free_hand, len(self.weapons) > 0, frozenset(self.melee_types),
+                len(self.shields) > 0, frozenset(self.weapon_types))
+
 class BeingInstance(ObjectInstance):
     ''' 
     An ObjectInstance that is a Being based on a BeingDefinition.
     '''
     def __init__(self, being_definition, name=None):
         ObjectInstance.__init__(self, being_definition, name)
-        self.original = being_definition
-        self.current = being_definition.copy()
         self.possessions = []
         self.weapons = []
         self.strategy = Strategy()
+        # The CapabilityProfile of the equipment, made on first use after a change
+        self._capabilities = None
+        # The possible actions and the Skills and ActionDictionary versions they came from
+        self._possible_actions = None
+        self._possible_actions_key = None
 
     def reset(self):
         '''
         Set all of the current values of the BeingInstance to their original values.
         '''
-        self.current = self.original.copy()
+        self.current = overlay(self.original)
+        self._capabilities = None
+
+    def capabilities(self, universe):
+        '''
+        Get the CapabilityProfile of the BeingInstance in a Universe. It is kept until the 
+        equipment changes through set_body_part_holds_object(), body_part_remove_object(),
+        set_armor_id() or drop_weapon(), or the body parts are replaced. Changes to the 
+        weapons themselves call for invalidate_capabilities().
+        '''
+        profile = self._capabilities
+        if profile is None or profile.universe is not universe or \
+                profile.body_parts is not self.current.body_parts:
+            profile = CapabilityProfile(self, universe)
+            self._capabilities = profile
+        return profile
+
+    def invalidate_capabilities(self):
+        '''
+        Discard the CapabilityProfile, to be made again when next needed.
+        '''
+        self._capabilities = None
 
     def set_strategy(self, attack=0, defense=0, timing=0, extra_damage=0):
         '''
@@ -626,7 +699,7 @@ class BeingInstance(ObjectInstance):
         '''
         # TODO: Can't drop natural weapons. Dropping last non-natural weapon leaves Being armed with natural weapons.
         # TODO: Remove from weapons[] and remove from body_parts
-        pass
+        self._capabilities = None
         #self.weapons.remove(weapon_id)
 
     def get_body_parts(self):
@@ -640,6 +713,7 @@ class BeingInstance(ObjectInstance):
         Set the object "held" by a body part for this BeingInstance.
         '''
         self.current.body_parts[body_location] = object_id
+        self._capabilities = None
 
     def body_part_remove_object(self, body_location):
         '''
@@ -648,6 +722,7 @@ class BeingInstance(ObjectInstance):
         object_id = self.current.body_parts.get(body_location)
         if object_id is not None:
             del self.current.body_parts[body_location]
+            self._capabilities = None
         return object_id
 
     def get_armor_id(self):
@@ -661,6 +736,7 @@ class BeingInstance(ObjectInstance):
         Set the id of the armor for this BeingInstance.
         '''
         self.current.armor_id = armor_id
+        self._capabilities = None
 
     def get_states(self):
         '''
@@ -700,15 +776,15 @@ class BeingInstance(ObjectInstance):
         '''
         Assess whether this BeingInstance is helpless.
         '''
-        if self.is_paralyzed():
-            return True
-        if self.is_stunned():
+        current = self.current
+        if current.states.any_in_effect(HELPLESS_STATES):
             return True
-        if self.get_hit_points() <= 0:
+        if current.hit_points <= 0:
             return True
-        if self.get_fatigue_level() == 5:
+        if current.fatigue_level == 5:
             return True
-        if self.STR() == 0 or self.DEX() == 0 or self.CON() == 0:
+        abilities = current.abilities
+        if abilities.STR() == 0 or abilities.DEX() == 0 or abilities.CON() == 0:
             return True
         return False
 
@@ -716,11 +792,7 @@ class BeingInstance(ObjectInstance):
         '''
         Assess whether this BeingInstance is pinned.
         '''
-        if len(self.current.get_states()) == 0:
-            return False
-        if self.current.get_state('pinned') is None:
-            return False
-        return self.current.get_state('pinned')
+        return self.current.states.any_in_effect(PINNED)
 
     def pin(self, state_list):
         '''
@@ -740,11 +812,7 @@ class BeingInstance(ObjectInstance):
         '''
         Assess whether this BeingInstance is paralyzed.
         '''
-        if len(self.current.get_states()) == 0:
-            return False
-        if self.current.get_state('paralyzed') is None:
-            return False
-        return self.current.get_state('paralyzed')
+        return self.current.states.any_in_effect(PARALYZED)
 
     def paralyze(self, state_list):
         '''
@@ -764,11 +832,7 @@ class BeingInstance(ObjectInstance):
         '''
         Assess whether this BeingInstance is stunned.
         '''
-        if len(self.current.get_states()) == 0:
-            return False
-        if self.current.get_state('stunned') is None:
-            return False
-        return self.current.get_state('stunned')
+        return self.current.states.any_in_effect(STUNNED)
 
     def stun(self, state_list):
         '''
@@ -784,21 +848,26 @@ class BeingInstance(ObjectInstance):
             return
         self.current.set_state(state_list, 'stunned', False)
 
-    def makes_save(self, ability_score, difficulty_class):
+    def makes_save(self, ability_score, difficulty_class, rng=None):
         '''
         Assess whether a saving throw for this BeingInstance is successful.
         '''
-        roll = roll_dice('1d20')
+        roll = roll_dice('1d20', rng)
         if roll == 1:
             return False
         if roll == 20:
             return True
-        level = experience_level(self.current.experience)
-        if roll >= difficulty_class - saving_throw_experience_modifier(level):
+        if roll >= difficulty_class - self.save_modifier():
             return True
         return False
 
-    def choose_melee_action(self, universe):
+    def save_modifier(self):
+        '''
+        Get the saving throw modifier of the BeingInstance from its experience.
+        '''
+        return saving_throw_experience_modifier(experience_level(self.current.experience))
+
+    def choose_melee_action(self, universe, rng=None):
         '''
         Choose a melee action from among those currently possible for the BeingInstance.
         '''        
@@ -807,17 +876,18 @@ class BeingInstance(ObjectInstance):
 #        print(f"being.py: choose_melee_action() actions possible now: {actions_possible_now}")
         options = []
         action_dict = universe.get_action_dictionary()
+        melee_supported = self.melee_action_supported(universe)
         for action in actions_possible_now:
-            action_definition = action_dict.get_action_definition(action)
-#            print(f"being.py: choose_melee_action: action_definition: {action_definition}")
-            if action_definition.get("is_melee") == 'True':
-                if self.melee_action_supported(universe) == True:
-                    options.append(action)
+            compiled_action = action_dict.get_compiled_action(action)
+            if compiled_action.is_melee and melee_supported:
+                options.append(action)
         if len(options) == 0:
             return None
-        return random.choice(options)
+        if rng is None:
+            rng = random
+        return rng.choice(options)
 
-    def choose_action(self, universe):
+    def choose_action(self, universe, rng=None):
         '''
         Choose an action from among those currently possible for the BeingInstance.
         '''        
@@ -828,69 +898,62 @@ class BeingInstance(ObjectInstance):
             options.append(action)
         if len(options) == 0:
             return None
-        return random.choice(options)
+        if rng is None:
+            rng = random
+        return rng.choice(options)
 
     def has_swing_weapon(self, universe):
         '''
         Determine if the BeingInstance is armed with a weapon that can be used to swing.
         '''
         # TODO: Accommodate natural weapons
-        arms = self.armed_with(universe)
-#        print(f"arms: {arms}")
-        for body_part, weapon_id in arms.items():
-            weapon = universe.get_object_by_id(weapon_id)
-            if weapon is not None and "swing" in weapon.get_melee_types():
-                return True
-        return False
+        return "swing" in self.capabilities(universe).melee_types
 
     def has_thrust_weapon(self, universe):
         '''
         Determine if the BeingInstance is armed with a weapon that can be used to thrust.
         '''
         # TODO: Accommodate natural weapons
-        for body_part, weapon_id in self.armed_with(universe).items():
-            weapon = universe.get_object_by_id(weapon_id)
-            if weapon is not None and "thrust" in weapon.get_melee_types():
-                return True
-        return False
+        return "thrust" in self.capabilities(universe).melee_types
 
     def has_entangle_weapon(self, universe):
         '''
         Determine if the BeingInstance is armed with a weapon that can be used to entangle.
         '''
         # TODO: Accommodate natural weapons
-        for body_part, weapon_id in self.armed_with(universe).items():
-            weapon = universe.get_object_by_id(weapon_id)
-            if weapon is not None and "entangle" in weapon.get_melee_types():
-                return True
-        return False
+        return "entangle" in self.capabilities(universe).melee_types
 
     def melee_action_supported(self, universe):
         '''
         Determine if a melee action is possible given the weapons with which the the BeingInstance is armed.
         '''
-        if self.has_swing_weapon(universe):
-            return True
-        if self.has_thrust_weapon(universe):
-            return True
-        return False
+        melee_types = self.capabilities(universe).melee_types
+        return "swing" in melee_types or "thrust" in melee_types
 
     def possible_actions(self, universe):
         '''
         Make a list of actions that are possible based on the skills of the BeingInstance.
         '''
-        from universe import Universe
+        return dict(self._get_possible_actions(universe))
+
+    def _get_possible_actions(self, universe):
+        '''
+        Get the actions that are possible based on the skills of the BeingInstance, from
+        the index of actions by required skill of the ActionDictionary. They are kept 
+        until a skill level is set or the actions change, and must not be modified.
+        '''
         action_dict = universe.get_action_dictionary()
-        actions = {}
-        for action, properties in action_dict:
-#            print(f"being.py: possible_actions(): {action}: {properties}")
-            required_skill = properties.get('required_skill')
-            if required_skill == 'none':
-                actions[action] = properties
-            elif required_skill == 'advanced weapon' and self.get_max_weapon_skill_level() > 1:
-                actions[action] = properties
-            elif required_skill in self.current.get_skills():
-                actions[action] = properties
+        skills = self.current.skills
+        key = (skills, skills.get_version(), action_dict, action_dict.version)
+        if self._possible_actions_key == key:
+            return self._possible_actions
+        required_skills = ['none'] + list(skills.get_skills())
+        if skills.get_max_weapon_skill_level() > 1:
+            required_skills.append('advanced weapon')
+        actions = {action: action_dict.actions[action]
+                   for action in action_dict.actions_requiring(required_skills)}
+        self._possible_actions = actions
+        self._possible_actions_key = key
         return actions
 
     def armored_with(self):
@@ -903,327 +966,44 @@ class BeingInstance(ObjectInstance):
         '''
         Get a dictionary of body parts of the BeingInstance that have shields on them.
         '''
-        from universe import Universe
-
-        weapon_dict = universe.library.weapon_dictionary
-        shielded = {}
-        for body_location, object_id in self.get_body_parts().items():
-            an_object = universe.get_object_by_id(object_id)
-            if an_object is not None and an_object.current.obj_type in weapon_dict.get_objects_in_category('Shields'):
-                shielded[body_location]=object_id
-        return shielded
+        return dict(self.capabilities(universe).shields)
     
     def armed_with(self, universe):
         '''
         Get a dictionary of body parts of the BeingInstance that "hold" a weapon.
         '''
-        from universe import Universe
-
-        weapon_dict = universe.get_weapon_dictionary()
-        armed = {}
-        for body_location, object_id in self.get_body_parts().items():
-            the_object = universe.get_object_by_id(object_id)
-            if the_object is not None and weapon_dict.get_object_definition(the_object.current.obj_type) is not None:
-                armed[body_location]=object_id
-#        print(f"being.py: armed_with(): {armed}")
-        return armed
+        return dict(self.capabilities(universe).weapons)
 
-    def choose_weapon(self, armed):
+    def choose_weapon(self, armed, rng=None):
         '''
         Select a weapon from among those "held" by the BeingInstance.
         '''
 #        print(f"being.py choose_weapon() armed: {armed}")
         if armed is None or len(armed) == 0:
             return None
-        choice = random.choice(list(armed))
+        if rng is None:
+            rng = random
+        choice = rng.choice(list(armed))
 #        print(f"being.py choose_weapon() choice: {choice}")
         return armed[choice]
     
     def currently_possible_actions(self, universe, target=None):
         '''
         Make an dictionary of actions that are currently possible based on the current circumstances of the BeingInstance.
+        Those are the actions possible with the skills of the BeingInstance whose ActionRules 
+        (see action_rules.tsv) its CapabilityProfile meets.
         '''
         # TODO: implement multi-action. Could the same mechanism as an Encounter be nested?
-        from universe import Universe
-#        action_dict = universe.get_action_dictionary()
-        weapon_dict = universe.get_weapon_dictionary()
-        
-        possible_actions = self.possible_actions(universe)
-#        print(f"being.py: currently_possible_actions() possible_actions: {possible_actions}")
-
-#        print(f"\ncurrently_possible_actions(): possible_actions = {possible_actions}")
         if self.is_helpless():
             return {}
-        actions = {}
-        has_free_hand = False
-        shields = self.shielded_with(universe)
-        armed_with = self.armed_with(universe)
-        armored_with = self.armored_with()
-
-        for body_location, weapon in self.get_body_parts().items():
-            if weapon is None: # at least one hand unarmed
-                has_free_hand = True
-                break
-
-        for action, properties in possible_actions.items():
-            required_skill = properties.get('required_skill')
-            if required_skill == 'advanced weapon':
-                # Check to see if the Being is armed and has advanced skill with an 
-                # armed_with weapon
-                # Includes: disarm with weapon, feint with weapon, parry with weapon
-                for weapon in armed_with:
-                    if self.get_weapon_skill_level(weapon) > 1:
-                        actions[action] = properties
-            if required_skill == 'unarmed combat':
-                # Check to see if the Being has one unoccupied unarmed attack
-                # Includes: disarm unarmed, feint, unarmed, deflect unarmed, 
-                # parry unarmed
-                if has_free_hand == True:
-                    actions[action] = properties
-            if action == 'break hold':
-                # TODO: implement break hold
-                # Must be held
-                pass
-            elif action == 'break weapon (armed)':
-                # TODO: implement armed break weapon
-                # Must be armed with a weapon that allows a swing attack and target must 
-                # be armed
-                pass
-#                 if not isinstance(target, WeaponInstance):
-#                     pass
-#                 for body_part, weapon in armed_with.items():
-#                     attack_types = weapon_dict.objects[weapon].attacks XXX
-#                     
-#                     if attack_types.get('S') is not None:
-#                         actions[action] = properties
-#                         break            
-            elif action == 'break weapon (unarmed)':
-                # TODO: implement unarmed break weapon
-                # Must have an unarmed attack and target must be armed
-                pass
-            elif action == 'bull rush':
-                # TODO: implement bull rush
-                # Must be able to move 
-                pass
-            elif action == 'charge':
-                # TODO: implement charge
-                # Must not be engaged by target. Must be able to move <= 4 yps
-                pass
-            elif action == 'coup de grace':
-                # TODO: implement coup de grace
-                # Target must be helpless and undefended
-                pass
-            elif action == 'end run':
-                # TODO: implement end run
-                # Must have a target within moving distance
-                pass
-            elif action == 'grab object':
-                # TODO: implement grab
-                # Target must be within reach, success makes target held
-                pass
-            elif action == 'grab being':
-                # TODO: implement grab
-                # Target must be within reach, success makes target held
-                pass
-            elif action == 'hold object':
-                # TODO: implement hold
-                # Target must be held
-                pass
-            elif action == 'hold being':
-                # TODO: implement hold
-                # Target must be held
-                pass
-            elif action == 'takedown':
-                # TODO: implement takedown
-                # Target must be held
-                pass
-            elif action == 'reverse':
-                # TODO: implement reverse
-                # Self must be pinned or in disadvantaged takedown position
-                pass
-            elif action == 'pin from above':
-                # TODO: implement pin from above
-                # Self must be in advantaged takedown position over target
-                pass
-            elif action == 'pin from below':
-                # TODO: implement pin from below
-                # Self must be in advantaged takedown position over target
-                pass
-            elif action == 'escape':
-                # TODO: implement escape
-                # Self must be pinned or in disadvantaged takedown position
-                pass
-            elif action == 'dismount rider':
-                # TODO: implement dismount rider
-                # Target must be mounted
-                pass
-            elif action == 'overrun':
-                # TODO: implement overrun
-                # Must be able to move 
-                pass
-            elif action == 'ready':
-                # TODO: implement ready
-                # Must have object to ready
-                pass
-            elif action == 'shoot being':
-                # Must be armed with a weapon of the bows category
-                for body_location, weapon in self.get_body_parts().items():
-                    if weapon in weapon_dict.get_objects_in_category('Bows'):
-                        actions[action] = properties
-                        break
-            elif action == 'shoot object':
-                # Must be armed with a weapon of the bows category
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and weapon.obj_type in weapon_dict.get_objects_in_category('Bows'):
-                        actions[action] = properties
-                        break
-            elif action == 'launch at being':
-                # Must be armed with a weapon of the catapults category
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and weapon.obj_type in weapon_dict.get_objects_in_category('Catapults'):
-                        actions[action] = properties
-                        break
-            elif action == 'launch at object':
-                # Must be armed with a weapon of the catapults category
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and weapon.obj_type in weapon_dict.get_objects_in_category('Catapults'):
-                        actions[action] = properties
-                        break
-            elif action == 'stun':
-                if has_free_hand == True:
-                    actions[action] = properties
-            elif action == 'swing at being':
-                has_swing_weapon = False
-                # Could be armed or unarmed
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and "swing" in weapon.get_melee_types():
-                        has_swing_weapon = True
-                if has_swing_weapon == True:
-                    actions[action] = properties
-            elif action == 'swing at object':
-                has_swing_weapon = False
-                # Could be armed or unarmed
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and "swing" in weapon.get_melee_types():
-                        has_swing_weapon = True
-                if has_swing_weapon == True:
-                    actions[action] = properties
-            elif action == 'thrust at being':
-                has_thrust_weapon = False
-                # Could be armed or unarmed
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and "thrust" in weapon.get_melee_types():
-                        has_thrust_weapon = True
-                if has_thrust_weapon == True:
-                    actions[action] = properties
-            elif action == 'thrust at object':
-                has_thrust_weapon = False
-                # Could be armed or unarmed
-                for body_location, weapon_id in self.get_body_parts().items():
-                    weapon = universe.get_object_by_id(weapon_id)
-                    if weapon is not None and "thrust" in weapon.get_melee_types():
-                        has_thrust_weapon = True
-                if has_thrust_weapon == True:
-                    actions[action] = properties
-            elif action == 'subdue':
-                # TODO: implement subdue
-                # Must be armed with a weapon that can do bludgeon penetration type
-                # This includes unarmed
-                pass
-            elif action == 'throw':
-                # TODO: implement throw
-                # Must have object ready that can be thrown
-                pass
-            elif action == 'touch being':
-                # TODO: implement touch
-                # Target must be within reach
-                pass
-            elif action == 'touch object':
-                # TODO: implement touch
-                # Target must be within reach
-                pass
-            elif action == 'trip':
-                # TODO: implement trip
-                # Must first make a successful touch, grab, bull rush, or strike against 
-                pass
-            elif action == 'two-handed swing at being':
-                # Must be armed with one hand free
-                if len(armed_with) > 0 and has_free_hand == True:
-                    has_swing_weapon = False
-                    # Could be armed or unarmed
-                    for body_location, weapon_id in self.get_body_parts().items():
-                        weapon = universe.get_object_by_id(weapon_id)
-                        if weapon is not None and "swing" in weapon.get_melee_types():
-                            has_swing_weapon = True
-                    if has_swing_weapon == True:
-                        actions[action] = properties
-            elif action == 'two-handed swing at object':
-                # Must be armed with one hand free
-                if len(armed_with) > 0 and has_free_hand == True:
-                    has_swing_weapon = False
-                    # Could be armed or unarmed
-                    for body_location, weapon_id in self.get_body_parts().items():
-                        weapon = universe.get_object_by_id(weapon_id)
-                        if weapon is not None and "swing" in weapon.get_melee_types():
-                            has_swing_weapon = True
-                    if has_swing_weapon == True:
-                        actions[action] = properties
-            elif action == 'two-handed thrust at being':
-                # Must be armed with one hand free
-                if len(armed_with) > 0 and has_free_hand == True:
-                    has_thrust_weapon = False
-                    # Could be armed or unarmed
-                    for body_location, weapon_id in self.get_body_parts().items():
-                        weapon = universe.get_object_by_id(weapon_id)
-                        if weapon is not None and "thrust" in weapon.get_melee_types():
-                            has_thrust_weapon = True
-                    if has_thrust_weapon == True:
-                        actions[action] = properties
-            elif action == 'two-handed thrust at object':
-                # Must be armed with one hand free
-                if len(armed_with) > 0 and has_free_hand == True:
-                    has_thrust_weapon = False
-                    # Could be armed or unarmed
-                    for body_location, weapon_id in self.get_body_parts().items():
-                        weapon = universe.get_object_by_id(weapon_id)
-                        if weapon is not None and "thrust" in weapon.get_melee_types():
-                            has_thrust_weapon = True
-                    if has_thrust_weapon == True:
-                        actions[action] = properties
-            elif action == 'undefended attack':
-                # TODO: implement undefended attack
-                # This isn't an action, but rather a defender state for a chosen action
-                pass
-            elif action == 'wrest':
-                # TODO: implement wrest
-                # Target object must be held and held by opponent
-                pass
-            elif action == 'block':
-                # Must be armed with a shield
-                if shields is not None and len(shields) > 0:
-                    actions[action] = properties
-            elif action == 'disengage':
-                # TODO: implement disengage
-                # Must be able to move 
-                pass
-            elif action == 'dodge':
-                # TODO: implement dodge
-                # Cannot be part of multi-action except with other dodges
-                pass
-            elif action == 'yield':
-                # TODO: implement yield
-                # Must be able to move 
-                pass
-            else: # Every other kind of action isn't defined
-                pass
-#        print(f'currently possible actions: {actions}')
-        return actions
+        possible_actions = self._get_possible_actions(universe)
+        capabilities = self.capabilities(universe)
+        if capabilities.eligible is None:
+            action_dict = universe.get_action_dictionary()
+            capabilities.eligible = action_dict.eligible_actions(capabilities)
+        eligible = capabilities.eligible
+        return {action: properties for action, properties in possible_actions.items()
+                if action in eligible}
 
 class BeingDictionary(ObjectDictionary):
     '''
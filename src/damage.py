@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "damage.py 2026-10-18T20:20-03:00"
+
+# The damage of a hit goes through stages on its way to its victim: a shield the
+# victim holds, then the armor the victim wears, then the hit points of the victim.
+# apply_hit() takes one Hit through the stages. apply_hits() takes a batch of them through
+# with resolve_hit_arrays(), if NumPy is available, with the same results.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The fewest Hits that apply_hits() takes through the stages as arrays. Below this, the
+# cost of gathering the Hits of objects into arrays is more than the arrays save.
+MIN_ARRAY_HITS = 2000
+
+class Hit():
+    '''
+    The rolled damage of an Action on its way to its victim, not yet applied.
+    damage - the damage that shields and armor can stop
+    unstopped - damage that goes straight to the victim (e.g., that of a critical hit)
+    shield - the WeaponInstance the hit may strike first, None if none
+    shield_roll - the d10 roll that decides if the hit strikes the shield
+    armor - the ArmorInstance of the victim, None if none
+    penetration_types - the penetration types of the attack against the armor
+    fatal - True if the hit kills the victim outright and does no other damage
+    Once the Hit is applied, and None until then:
+    shield_stopped - the damage the shield stopped
+    armor_stopped - the damage the armor stopped
+    applied - the damage that got to the victim
+    '''
+    def __init__(self, victim, damage=0, unstopped=0, shield=None, shield_roll=None,
+                 armor=None, penetration_types=None, fatal=False):
+        self.victim = victim
+        self.damage = damage
+        self.unstopped = unstopped
+        self.shield = shield
+        self.shield_roll = shield_roll
+        self.armor = armor
+        self.penetration_types = penetration_types
+        self.fatal = fatal
+        self.shield_stopped = None
+        self.armor_stopped = None
+        self.applied = None
+
+def shield_stage(damage, shield, shield_roll):
+    '''
+    Apply damage to a shield and return the amount that gets through. If the shield roll
+    is less than or equal to the shield size+4, the attack hits the shield first and it
+    stops damage equal to the lesser of the damage and the shield size. The shield takes
+    all of the damage to its hit points.
+    '''
+    if shield is None:
+        return damage
+    shield_size = int(shield.get_weapon_size())
+    if shield_roll <= shield_size + 4:
+        shield.damage(damage)
+        return max(damage - shield_size, 0)
+    return damage
+
+def armor_stage(damage, armor, penetration_types):
+    '''
+    Apply damage to armor and return the amount that gets through. The armor takes the
+    damage in excess of its hardness and stops its damage stopped.
+    '''
+    if armor is None:
+        return damage
+    damage_stopped, hardness = armor.worst_defense_values(penetration_types)
+    armor.damage(max(damage - hardness, 0))
+    if damage_stopped <= damage:
+        return damage - damage_stopped
+    return 0
+
+def victim_stage(victim, damage, fatal=False):
+    '''
+    Apply damage to the victim of a hit, or kill it outright (-10 hit points) if fatal.
+    '''
+    if fatal:
+        if victim.hit_points() > -10:
+            victim.set_hit_points(-10)
+        return
+    victim.damage(damage)
+
+def apply_hit(hit):
+    '''
+    Take a Hit through the shield, armor and victim stages and record on the Hit the
+    damage each stage stopped and the damage that got to the victim.
+    '''
+    if hit.fatal:
+        victim_stage(hit.victim, 0, True)
+        hit.shield_stopped = 0
+        hit.armor_stopped = 0
+        hit.applied = 0
+        return
+    after_shield = shield_stage(hit.damage, hit.shield, hit.shield_roll)
+    damage = armor_stage(after_shield, hit.armor, hit.penetration_types)
+    hit.shield_stopped = hit.damage - after_shield
+    hit.armor_stopped = after_shield - damage
+    hit.applied = damage + hit.unstopped
+    victim_stage(hit.victim, hit.applied)
+
+def apply_hits(hits, min_array_hits=MIN_ARRAY_HITS):
+    '''
+    Apply a sequence of Hits as if apply_hit() were called on each in order, and return
+    a list with, for each Hit, True if it took the hit points of its victim from positive
+    to zero or less. With NumPy and at least min_array_hits Hits, the Hits go through the
+    stages at once with resolve_hit_arrays().
+    '''
+    if np is None or len(hits) == 0 or len(hits) < min_array_hits:
+        kills = []
+        for hit in hits:
+            alive = hit.victim.hit_points() > 0
+            apply_hit(hit)
+            kills.append(alive and hit.victim.hit_points() <= 0)
+        return kills
+
+    # The distinct victims, shields and armors, and the columns of the Hits
+    objects = ([], [], [])
+    positions = ({}, {}, {})
+    columns = tuple([] for i in range(10))
+    (victim, fatal, damage, unstopped, shield, shield_size, shield_roll, armor,
+     damage_stopped, hardness) = columns
+    for hit in hits:
+        victim.append(_position(hit.victim, objects[0], positions[0]))
+        fatal.append(hit.fatal)
+        damage.append(hit.damage)
+        unstopped.append(hit.unstopped)
+        if hit.shield is None or hit.fatal:
+            shield.append(-1)
+            shield_size.append(0)
+            shield_roll.append(0)
+        else:
+            shield.append(_position(hit.shield, objects[1], positions[1]))
+            shield_size.append(int(hit.shield.get_weapon_size()))
+            shield_roll.append(hit.shield_roll)
+        if hit.armor is None or hit.fatal:
+            armor.append(-1)
+            damage_stopped.append(0)
+            hardness.append(0)
+        else:
+            armor.append(_position(hit.armor, objects[2], positions[2]))
+            values = hit.armor.worst_defense_values(hit.penetration_types)
+            damage_stopped.append(values[0])
+            hardness.append(values[1])
+    arrays = [np.array(column, dtype=bool if column is fatal else np.int64)
+              for column in columns]
+    hit_points = [np.array([obj.current.hit_points for obj in distinct], dtype=np.int64)
+                  for distinct in objects]
+    result = resolve_hit_arrays(*arrays, *hit_points)
+    final = (result["victim_hit_points"], result["shield_hit_points"],
+             result["armor_hit_points"])
+    for distinct, before, after in zip(objects, hit_points, final):
+        for k in np.flatnonzero(before != after):
+            distinct[k].current.hit_points = int(after[k])
+    for hit, shield_stopped, armor_stopped, applied in zip(hits,
+            result["shield_stopped"].tolist(), result["armor_stopped"].tolist(),
+            result["applied"].tolist()):
+        hit.shield_stopped = shield_stopped
+        hit.armor_stopped = armor_stopped
+        hit.applied = applied
+    return result["kills"].tolist()
+
+def resolve_hit_arrays(victim, fatal, damage, unstopped, shield, shield_size, shield_roll,
+                       armor, damage_stopped, hardness, victim_hit_points,
+                       shield_hit_points, armor_hit_points):
+    '''
+    Take a batch of hits in order through the shield, armor and victim stages with
+    arrays. Each hit has the position of its victim, shield and armor (-1 if none) in the
+    arrays of their hit points, and the size and roll of its shield and the damage
+    stopped and hardness of its armor against it. Return a dictionary of arrays:
+    victim_hit_points, shield_hit_points, armor_hit_points - after the hits
+    shield_stopped, armor_stopped - the damage of each hit that each stopped
+    applied - the damage of each hit that got to its victim
+    kills - whether each hit took the hit points of its victim from positive to zero or
+        less
+    '''
+    n = victim.size
+    # Shield stage
+    hits_shield = (shield >= 0) & (shield_roll <= shield_size + 4)
+    shield_hit_points = _damaged(shield_hit_points, shield[hits_shield], damage[hits_shield])
+    after_shield = np.where(fatal, 0,
+        np.where(hits_shield, np.maximum(damage - shield_size, 0), damage))
+    shield_stopped = np.where(fatal, 0, damage - after_shield)
+    damage = after_shield
+
+    # Armor stage
+    with_armor = armor >= 0
+    armor_hit_points = _damaged(armor_hit_points, armor[with_armor],
+                                np.maximum(damage - hardness, 0)[with_armor])
+    damage = np.where(with_armor,
+                      np.where(damage_stopped <= damage, damage - damage_stopped, 0), damage)
+    armor_stopped = after_shield - damage
+
+    # Victim stage, in which the order of fatal hits and damage matters
+    damage = np.where(fatal, 0, damage + unstopped)
+    order = np.argsort(victim, kind='stable')
+    sorted_victim = victim[order]
+    sorted_fatal = fatal[order]
+    sorted_damage = damage[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_victim[1:] != sorted_victim[:-1]])
+    group = np.repeat(np.arange(group_start.size), np.diff(np.r_[group_start, n]))
+    # The damage each victim has taken by the end of each of its hits
+    taken = np.cumsum(sorted_damage)
+    taken = taken - (taken[group_start] - sorted_damage[group_start])[group]
+    # Until its first fatal hit, a victim loses hit points as it takes damage, so the
+    # hit that kills it is its first that is fatal or brings the damage taken to its
+    # hit points
+    before = victim_hit_points[sorted_victim]
+    killing = (before > 0) & (sorted_fatal | (taken >= before))
+    killed, first = np.unique(sorted_victim[killing], return_index=True)
+    kills = np.zeros(n, dtype=bool)
+    kills[order[np.flatnonzero(killing)[first]]] = True
+
+    # After its last fatal hit a victim has -10 hit points, or 0 if it takes any damage
+    # after that, even none
+    reversed_victim = sorted_victim[::-1]
+    reversed_fatal = sorted_fatal[::-1]
+    fatal_victims, last = np.unique(reversed_victim[reversed_fatal], return_index=True)
+    last_fatal = np.full(victim_hit_points.size, -1)
+    last_fatal[fatal_victims] = n - 1 - np.flatnonzero(reversed_fatal)[last]
+    damaged_after = np.zeros(victim_hit_points.size, dtype=bool)
+    damaged_after[sorted_victim[~sorted_fatal & (np.arange(n) > last_fatal[sorted_victim])]] = True
+    total = np.bincount(victim, weights=damage, minlength=victim_hit_points.size)
+    victim_hit_points = np.where(last_fatal >= 0, np.where(damaged_after, 0, -10),
+        np.maximum(victim_hit_points - total.astype(np.int64), 0))
+    return {"victim_hit_points": victim_hit_points, "shield_hit_points": shield_hit_points,
+            "armor_hit_points": armor_hit_points, "shield_stopped": shield_stopped,
+            "armor_stopped": armor_stopped, "applied": damage, "kills": kills}
+
+def _position(obj, distinct, positions):
+    '''
+    Get the position of an object among the distinct objects, adding it if it is new.
+    '''
+    position = positions.get(id(obj))
+    if position is None:
+        position = len(distinct)
+        positions[id(obj)] = position
+        distinct.append(obj)
+    return position
+
+def _damaged(hit_points, index, damage):
+    '''
+    Get the hit points after the objects at the positions in index take the damage in an
+    array, as if each took its damage with ObjectInstance.damage() in turn.
+    '''
+    if index.size == 0:
+        return hit_points
+    total = np.bincount(index, weights=damage, minlength=hit_points.size).astype(np.int64)
+    hit = np.bincount(index, minlength=hit_points.size) > 0
+    return np.where(hit, np.maximum(hit_points - total, 0), hit_points)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "duelist.py 2026-10-18T20:45-03:00"
+
+from matchup import make_contestant
+from utils import experience_level, saving_throw_experience_modifier
+
+class Duelist():
+    '''
+    The characteristics of a Being that matter in a one-on-one melee duel, as resolved by
+    an Encounter: hit points, defense, saving throw modifier, the attacks it can choose
+    from, the sizes of its shields and its armor.
+    Each attack is a dictionary with the attack_type ('swing' or 'thrust'), timing,
+    damage (the die to roll, 0 for none), penetration_types and attack_level.
+    '''
+    def __init__(self, name, hit_points, defense_level, save_modifier, attacks,
+                 shield_sizes=None, armor=None):
+        self.name = name
+        self.hit_points = hit_points
+        self.defense_level = defense_level
+        self.save_modifier = save_modifier
+        self.attacks = attacks
+        self.shield_sizes = shield_sizes or []
+        self.armor = armor
+
+    def damage_stopped(self, penetration_types):
+        '''
+        Get the damage stopped by the armor of the Duelist for an attack with the given
+        penetration types.
+        '''
+        if self.armor is None:
+            return 0
+        return self.armor.worst_defense_damage_stopped(penetration_types)
+
+def make_duelist(universe, being_id):
+    '''
+    Make a Duelist from an armed BeingInstance in a Universe. Attacks are listed once
+    for each pair of melee action and weapon the Being can choose, so that choosing an
+    attack uniformly at random is the same as Encounter.choose_fight_actions.
+    '''
+    being = universe.get_object_by_id(being_id)
+    action_dict = universe.get_action_dictionary()
+    attack_types = []
+    for action in being.currently_possible_actions(universe):
+        compiled_action = action_dict.get_compiled_action(action)
+        if not compiled_action.is_melee:
+            continue
+        if compiled_action.event_type is not None:
+            attack_types.append(compiled_action.event_type)
+        else:
+            raise ValueError(f"{being.name} can choose {action}, which a duel does not resolve")
+    armed = being.armed_with(universe)
+    if len(attack_types) == 0 or len(armed) == 0 or not being.melee_action_supported(universe):
+        raise ValueError(f"{being.name} has no melee attack")
+
+    attacks = []
+    for attack_type in attack_types:
+        for body_location, weapon_id in armed.items():
+            weapon = universe.get_object_by_id(weapon_id)
+            if attack_type == "swing":
+                timing, damage = weapon.St(), weapon.Sd()
+            else:
+                timing, damage = weapon.Tt(), weapon.Td()
+            # As in Action.calculate_end_time() with no timing adjustment
+            if timing is None or timing <= 0:
+                timing = 1
+            attacks.append({
+                "attack_type": attack_type,
+                "timing": timing,
+                "damage": damage or 0,
+                "penetration_types": weapon.get_penetration_types(attack_type),
+                "attack_level": being.get_weapon_skill_level(weapon_id) + being.strategy.attack
+            })
+
+    shield_sizes = []
+    for body_location, shield_id in being.shielded_with(universe).items():
+        shield_sizes.append(int(universe.get_object_by_id(shield_id).get_weapon_size()))
+    armor = universe.get_object_by_id(being.get_armor_id())
+    save_modifier = saving_throw_experience_modifier(experience_level(being.get_experience()))
+    return Duelist(being.name, being.hit_points(), being.strategy.defense, save_modifier,
+                   attacks, shield_sizes, armor)
+
+def make_duelists(universe, matchup):
+    '''
+    Make the pair of Duelists described by a Matchup in a Universe.
+    '''
+    duelists = []
+    for side in ("a", "b"):
+        object_ids = make_contestant(universe, getattr(matchup, f"being_type_{side}"),
+            side.upper(), getattr(matchup, f"weapon_{side}"), getattr(matchup, f"armor_{side}"),
+            getattr(matchup, f"shield_{side}"), getattr(matchup, f"strategy_{side}"))
+        if object_ids is None:
+            raise ValueError(f"Unable to make melee contestants for {matchup.name()}")
+        duelists.append(make_duelist(universe, object_ids[0]))
+    return duelists
@@ -3,16 +3,18 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "encounter.py 2024-03-09T22:00-03:00"
+__version__ = "encounter.py 2026-10-18T21:40-03:00"
 
 # TODO: Make ''' comments on classes and methods
 
 import json
-import random
 
 from utils import convert_to_dc
-from action import Action
-from event import Event
+from action import Action, action_name
+from actiondictionary import ACTION_KIND_SWING, ACTION_KIND_THRUST, TARGET_BEING, \
+    TARGET_OBJECT, TARGET_WEAPON
+from damage import apply_hits
+from event import Event, EventQueue
 from library import Library
 from being import BeingInstance
 from object import ObjectInstance
@@ -30,7 +32,8 @@ class Encounter(Event):
                  event_type=None, location=None, name="", parent_event_id=None, id=None, 
                  time=None, being_list=None, non_being_object_list=None, 
                  pending_action_list=None, finished_action_list=None, initiated=False, 
-                 map=None):
+                 map=None, rng=None, large_battle=False, use_hit_table=False, 
+                 bind_actions=False, pool_actions=False):
         Event.__init__(self, universe, start_time, end_time, 
                  event_type, location, name, parent_event_id, id)
         self.difficulty_class = convert_to_dc(difficulty_class)
@@ -56,6 +59,31 @@ class Encounter(Event):
             self.finished_action_list = []
         else:
             self.finished_action_list = finished_action_list
+        # Pending Actions ordered by end time, built from pending_action_list on first use
+        self._action_queue = None
+        # The random number generator for the Encounter, that of the Universe if None
+        self._rng = rng
+        # With large_battle, targets are chosen among the Beings still alive, which are 
+        # kept track of as Actions resolve rather than looked up every tick
+        self.large_battle = large_battle
+        # With use_hit_table, Actions draw their hit results from precomputed tables
+        self.use_hit_table = use_hit_table
+        # With bind_actions, Actions resolve their objects once, when they are scheduled
+        self.bind_actions = bind_actions
+        # With pool_actions, Actions come from the ActionPool of the Universe and go back 
+        # to it once resolved and recorded
+        self.pool_actions = pool_actions
+        # Sets of the ids in being_list and non_being_object_list in a large battle, built
+        # on first use
+        self._being_set = None
+        self._object_set = None
+        # The pending Actions of each actor, built with the Action queue
+        self._pending_by_actor = None
+        # The OutcomeStats given to run(), to which resolved Actions are added, if any
+        self._outcome_stats = None
+        # The ids of the Beings alive in a large battle, and the index of each in the list
+        self._alive_list = []
+        self._alive_index = {}
 
     def to_json(self):
         def handle_circular_refs(obj):
@@ -88,6 +116,14 @@ class Encounter(Event):
 #            self.map = EncounterMap(location)
             pass
 	
+    def get_rng(self):
+        '''
+        Get the random number generator used to resolve the Encounter.
+        '''
+        if self._rng is None:
+            return self.universe.rng
+        return self._rng
+
     def make_being(self, being_type, name):
         new_being_id = self.universe.make_being(being_type, name)
         self.add_being(new_being_id)
@@ -110,14 +146,14 @@ class Encounter(Event):
         new_object_id = self.universe.make_object_for_being(being_id, object_type, name)
         if new_object_id is None:
             return None
-        self.non_being_object_list.append(new_object_id)
+        self.add_object(new_object_id)
         return new_object_id
 
     def make_weapon_for_being(self, being_id, weapon_type, name):
         new_weapon_id = self.universe.make_weapon_for_being(being_id, weapon_type, name)
         if new_weapon_id is None:
             return None
-        self.non_being_object_list.append(new_weapon_id)
+        self.add_object(new_weapon_id)
         return new_weapon_id
 
     def arm_being(self, being_id, weapon_id, body_location):
@@ -127,18 +163,30 @@ class Encounter(Event):
         new_armor_id = self.universe.make_armor_for_being(being_id, armor_type, name)
         if new_armor_id is None:
             return None
-        self.non_being_object_list.append(new_armor_id)
+        self.add_object(new_armor_id)
         return new_armor_id
 
     def armor_being(self, being_id, armor_id):
         return self.universe.armor_being(being_id, armor_id)
 
     def add_object(self, object_id):
-        if object_id not in self.non_being_object_list:
+        if self.large_battle:
+            if self._object_set is None:
+                self._object_set = set(self.non_being_object_list)
+            if object_id not in self._object_set:
+                self._object_set.add(object_id)
+                self.non_being_object_list.append(object_id)
+        elif object_id not in self.non_being_object_list:
             self.non_being_object_list.append(object_id)
 
     def add_being(self, being_id):
-        if being_id not in self.being_list:
+        if self.large_battle:
+            if self._being_set is None:
+                self._being_set = set(self.being_list)
+            if being_id not in self._being_set:
+                self._being_set.add(being_id)
+                self.being_list.append(being_id)
+        elif being_id not in self.being_list:
             self.being_list.append(being_id)
 
     # Load an Encounter from storage.
@@ -152,9 +200,26 @@ class Encounter(Event):
     # 5. make action decisions (continue, change) based on currently knowable state and map actions on timeline
     # 6. save state
     # 7. prompt to continue playing: if continue, go to 1 else exit
-    def run(self, run_children=True):
+    # With skip_idle_ticks, the clock jumps from one tick to the next time an Action 
+    # ends. Every Being that can act has a pending Action after step 5, so nothing can 
+    # happen in the ticks in between and the results are the same as stepping by 1.
+    # With stats, an EncounterStats, the loop is timed by phase and counted by tick. 
+    # Without it the loop has no instrumentation at all.
+    # With outcomes, an OutcomeStats, the outcome of each Action is added as it resolves.
+    def run(self, run_children=True, skip_idle_ticks=False, stats=None, outcomes=None):
+        self._outcome_stats = outcomes
         if not self.initiated:
             self.generate()
+        if self.large_battle:
+            self.find_alive_beings()
+
+        if stats is not None:
+            stats.count_lookups(self.universe)
+            try:
+                self.run_instrumented(stats, skip_idle_ticks)
+            finally:
+                stats.stop_counting_lookups(self.universe)
+            return
 
         continue_turns = True
         while continue_turns:
@@ -180,6 +245,40 @@ class Encounter(Event):
 #                     print(f"{action.get_actor().name} targets {action.get_target().name} with {action.name} starting: {action.start_time} ending: {action.end_time}")
             self.time += 1
             continue_turns = self.keep_going()
+            if continue_turns and skip_idle_ticks:
+                self.skip_to_next_action()
+
+    def run_instrumented(self, stats, skip_idle_ticks=False):
+        '''
+        Run the same loop as run(), timing each phase and counting the Actions created 
+        and resolved and the registry lookups of each tick in an EncounterStats.
+        '''
+        continue_turns = True
+        while continue_turns:
+            tick = self.time
+            lookups = stats.registry_lookups
+            finished = len(self.finished_action_list)
+            scheduled = finished + len(self.pending_action_list)
+            stats.time_phase("choose_movement", self.choose_movement)
+            stats.time_phase("move", self.move)
+            stats.time_phase("resolve_actions", self.resolve_actions)
+            stats.time_phase("update_environment", self.update_environment)
+            stats.time_phase("choose_fight_actions", self.choose_fight_actions)
+            self.time += 1
+            continue_turns = stats.time_phase("keep_going", self.keep_going)
+            resolved = len(self.finished_action_list) - finished
+            created = len(self.finished_action_list) + len(self.pending_action_list) - scheduled
+            stats.add_tick(tick, created, resolved, stats.registry_lookups - lookups)
+            if continue_turns and skip_idle_ticks:
+                self.skip_to_next_action()
+
+    def skip_to_next_action(self):
+        '''
+        Move the clock forward to the next time at which a pending Action ends.
+        '''
+        next_time = self.get_action_queue().next_time()
+        if next_time is not None and next_time > self.time:
+            self.time = next_time
 
     def keep_going(self):
         # Do one round
@@ -196,6 +295,8 @@ class Encounter(Event):
 
     def last_one_standing(self):
         # Go until one or no one has positive hit points
+        if self.large_battle:
+            return len(self._alive_list) > 1
         being_count = len(self.being_list)
         beings_alive = 0
         for being_id in self.being_list:
@@ -214,38 +315,158 @@ class Encounter(Event):
         # If not immobile
         pass
 
+    def get_action_queue(self):
+        '''
+        Get the queue of pending Actions, scheduling any pending Actions that are not in 
+        it yet (e.g., those of an Encounter loaded from a file).
+        '''
+        if self._action_queue is None:
+            self._action_queue = EventQueue()
+            self._pending_by_actor = {}
+            for action_id in self.pending_action_list:
+                action = self.universe.get_event_by_id(action_id)
+                if action is not None:
+                    self._action_queue.push(action)
+                    self._pending_by_actor.setdefault(action.actor_id, []).append(action)
+        return self._action_queue
+
+    def schedule_action(self, action):
+        '''
+        Add an Action to the pending Actions of the Encounter and to the Event history.
+        '''
+        if self.bind_actions:
+            action.bind()
+        self.get_action_queue().push(action)
+        self._pending_by_actor.setdefault(action.actor_id, []).append(action)
+        self.pending_action_list.append(action.id)
+        self.universe.add_event(action)
+
     def resolve_actions(self):
-        finish = []
-        for action in self.pending_action_list:
-            action = self.universe.get_event_by_id(action)
-            if action is not None:
-                if action.end_time == self.time:
-                    action.resolve(self.difficulty_class)
-                    self.finished_action_list.append(action.id)
-                    finish.append(action.id)
-        for action_id in finish:
-            self.pending_action_list.remove(action_id)
+        # Only the Actions that end by now come off of the queue
+        due = self.get_action_queue().pop_due(self.time)
+        if self.large_battle:
+            self.resolve_actions_batched(due)
+        else:
+            for action in due:
+                action.resolve(self.difficulty_class, self.get_rng(), self.use_hit_table)
+        resolved = set()
+        for action in due:
+            self.finished_action_list.append(action.id)
+            self._pending_by_actor[action.actor_id].remove(action)
+            resolved.add(action.id)
+            # The finished Action is kept as a compact ActionRecord
+            record = action.record()
+            self.universe.event_history[action.id] = record
+            if self._outcome_stats is not None:
+                self._outcome_stats.add(record)
+            if self.pool_actions:
+                self.universe.get_action_pool().release(action)
+        # Remove the resolved Actions in one pass rather than one search each
+        if len(resolved) > 0:
+            self.pending_action_list[:] = [action_id for action_id in 
+                self.pending_action_list if action_id not in resolved]
+
+    def resolve_actions_batched(self, actions):
+        '''
+        Resolve the given Actions, in order, in one pass: roll the hit of each, then take
+        all of the Hits through the damage stages at once with apply_hits(). No roll
+        depends on hit points, so the results are those of resolving the Actions one at a
+        time. The Beings that die leave the alive list in the order they would have.
+        Record the outcome of each Action and return its hit result and Hit, as 
+        Action.resolve() does.
+        '''
+        rng = self.get_rng()
+        results = []
+        hits = []
+        hit_actions = []
+        for k, action in enumerate(actions):
+            hit_type, hit = action.roll_hit(self.difficulty_class, rng, self.use_hit_table)
+            results.append((hit_type, hit))
+            if hit is not None:
+                hits.append(hit)
+                hit_actions.append(k)
+        # The position among the Actions of the hit that killed each Being
+        died_at = {}
+        for k, hit, killed in zip(hit_actions, hits, apply_hits(hits)):
+            if killed:
+                died_at.setdefault(hit.victim.id, k)
+        for action, (hit_type, hit) in zip(actions, results):
+            action.set_outcome(hit_type, hit)
+        for k, action in enumerate(actions):
+            for being_id in (action.actor_id, action.target_id):
+                if died_at.get(being_id, -1) <= k:
+                    self.update_alive(being_id)
+        return results
+
+    def find_alive_beings(self):
+        '''
+        Make the list of the Beings in the Encounter that have positive hit points.
+        '''
+        self._alive_list = []
+        self._alive_index = {}
+        for being_id in self.being_list:
+            being = self.universe.get_object_by_id(being_id)
+            if being is not None and being.current.hit_points > 0:
+                self._alive_index[being_id] = len(self._alive_list)
+                self._alive_list.append(being_id)
+
+    def update_alive(self, object_id):
+        '''
+        Take a Being out of the alive list once its hit points are no longer positive.
+        The last Being in the list takes its place, so the removal takes constant time.
+        '''
+        index = self._alive_index.get(object_id)
+        if index is None:
+            return
+        if self.universe.get_object_by_id(object_id).current.hit_points > 0:
+            return
+        last_id = self._alive_list.pop()
+        del self._alive_index[object_id]
+        if last_id != object_id:
+            self._alive_list[index] = last_id
+            self._alive_index[last_id] = index
+
+    def choose_alive_opponent(self, subject_being_id):
+        '''
+        Choose a Being other than the subject uniformly from those alive in a large 
+        battle, with a single draw.
+        '''
+        alive_count = len(self._alive_list)
+        if alive_count == 0:
+            return None
+        rng = self.get_rng()
+        index = self._alive_index.get(subject_being_id)
+        if index is None:
+            return self._alive_list[rng.randrange(alive_count)]
+        if alive_count == 1:
+            return subject_being_id
+        choice = rng.randrange(alive_count - 1)
+        if choice >= index:
+            choice += 1
+        return self._alive_list[choice]
     
     def update_environment(self):
         pass
 
     def is_being_occupied(self, being_id):
-        for action_id in self.pending_action_list:
-            action = self.universe.get_event_by_id(action_id)
-            if action.actor_id == being_id:
-                if action.event_type == "delay":
-                    return False
-                if action.end_time > self.time:
-                    return True
+        self.get_action_queue()
+        for action in self._pending_by_actor.get(being_id, []):
+            if action.event_type == "delay":
+                return False
+            if action.end_time > self.time:
+                return True
         return False
 
     def choose_target_being(self, subject_being_id):
+        if self.large_battle:
+            return self.choose_alive_opponent(subject_being_id)
         if len(self.being_list) == 0:
             return None
         if len(self.being_list) == 1:
             return subject_being_id
+        rng = self.get_rng()
         while True:
-            choice = random.choice(self.being_list)
+            choice = rng.choice(self.being_list)
             if choice != subject_being_id:
                 return choice
 
@@ -254,24 +475,28 @@ class Encounter(Event):
         # TODO: Could implement logic about whose Object
         if len(self.non_being_object_list) == 0:
             return None
-        choice = random.choice(self.non_being_object_list)
+        choice = self.get_rng().choice(self.non_being_object_list)
         return choice
 
     def choose_target_attack(self, subject_being_id):
         # Make a list of attacks that aren't mine to try to target
         attack_list = None
-        return random.choice(self.attack_list)
+        return self.get_rng().choice(self.attack_list)
 
     def choose_target_weapon(self, subject_being_id):
         # Make a list of possible target weapons
         weapon_list = None
-        return random.choice(self.weapon_list)
+        return self.get_rng().choice(self.weapon_list)
 
     def choose_fight_actions(self):
         action_dict = self.universe.get_action_dictionary()
         object_registry = self.universe.object_registry
+        rng = self.get_rng()
 
-        for subject_being_id in self.being_list:
+        being_list = self.being_list
+        if self.large_battle:
+            being_list = list(self._alive_list)
+        for subject_being_id in being_list:
             subject_being = self.universe.get_object_by_id(subject_being_id)
 #            print(f"Choosing fight action for {subject_being.name}")
 
@@ -291,57 +516,55 @@ class Encounter(Event):
             new_action = None
             if isinstance(subject_being, (BeingInstance)):
                 # Randomly decide an melee action among those available
-                chosen_action = subject_being.choose_melee_action(self.universe)
+                chosen_action = subject_being.choose_melee_action(self.universe, rng)
                 # At this point the chosen action should already be one the Being has
                 # the required skills to do.
 #                print(f"chosen action: {chosen_action}")
-                action_definition = action_dict.get_action_definition(chosen_action)
+                compiled_action = action_dict.get_compiled_action(chosen_action)
                 target_id = None
                 target = None
                 # If the Action requires a target Being, choose the target
-                if action_definition["target_type"] == 'being':
+                if compiled_action.target_type == TARGET_BEING:
                     target_id = self.choose_target_being(subject_being_id)
                     target = self.universe.get_object_by_id(target_id)
                 # Otherwise if the Action requires a target Object, choose the target
-                elif action_definition["target_type"] == 'object':
+                elif compiled_action.target_type == TARGET_OBJECT:
                     target_id = self.choose_target_object(subject_being_id)
                     target = self.universe.get_object_by_id(target_id)
                 # Otherwise if the Action requires a target Attack, choose the target
-#                 elif action_definition["target_type"] == 'attack':
+#                 elif compiled_action.target_type == TARGET_ATTACK:
 #                     target_id = self.choose_target_attack(subject_being_id)
 #                     #target = self.universe.get_object_by_id(target_id)
                 # Otherwise if the Action requires a target Attack, choose the target
-                elif action_definition["target_type"] == 'weapon':
+                elif compiled_action.target_type == TARGET_WEAPON:
                     target_id = self.choose_target_weapon(subject_being_id)
                     target = self.universe.get_object_by_id(target_id)
                 # Otherwise no target is necessary
 
                 # Create an Action Event with the Encounter as its parent
-                armed = subject_being.armed_with(self.universe)
+                armed = subject_being.capabilities(self.universe).weapons
 #                print(f"armed: {armed}")
-                weapon_id = subject_being.choose_weapon(armed)
+                weapon_id = subject_being.choose_weapon(armed, rng)
                 weapon = self.universe.get_object_by_id(weapon_id)
 #                print(f"weapon_id: {weapon_id} weapon_type: {weapon.obj_type}, weapon_name: {weapon.name}")
-                if "swing" in chosen_action:
-                    name = f"{subject_being.name} swing t={self.time}"
-                    new_action = Action(self.universe, start_time=self.time, 
-                        end_time=None, event_type="swing", actor_id=subject_being_id, 
-                        target_id=target_id, instrument_id=weapon_id, strategy=None, 
-                        location=None, name=name, parent_event_id=self.id)
-                elif "thrust" in chosen_action:
-                    name = f"{subject_being.name} thrust at t={self.time}"
-                    new_action = Action(self.universe, start_time=self.time, 
-                        end_time=None, event_type="thrust", actor_id=subject_being_id, 
-                        target_id=target_id, instrument_id=weapon_id, strategy=None, 
-                        location=None, name=name, parent_event_id=self.id)
+                if compiled_action.kind in (ACTION_KIND_SWING, ACTION_KIND_THRUST):
+                    event_type = compiled_action.event_type
+                    if self.pool_actions:
+                        new_action = self.universe.get_action_pool().acquire(self.time, 
+                            event_type, subject_being_id, target_id, weapon_id, self.id)
+                    else:
+                        name = action_name(subject_being.name, event_type, self.time)
+                        new_action = Action(self.universe, start_time=self.time, 
+                            end_time=None, event_type=event_type, actor_id=subject_being_id, 
+                            target_id=target_id, instrument_id=weapon_id, strategy=None, 
+                            location=None, name=name, parent_event_id=self.id)
                 else:
                     pass
 
 #                print(f"{subject_being.name} targets {target.name} with {chosen_action} using {weapon.name}")
 #                print(f"{subject_being.name} targets {target.name} with {chosen_action} using {weapon.name} ending at t={new_action.end_time}")
                 # Add Action to the Event History
-                self.pending_action_list.append(new_action.id)
-                self.universe.add_event(new_action)
+                self.schedule_action(new_action)
 
     def choose_actions(self):
         for subject_being_id in self.being_list:
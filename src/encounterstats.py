@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "encounterstats.py 2026-10-18T14:50-03:00"
+
+from time import perf_counter
+
+class EncounterStats():
+    '''
+    Timing and counts collected by Encounter.run() when it is given an EncounterStats:
+    the cumulative time and number of calls of each phase of the loop, and for each
+    tick the number of Actions created and resolved and of registry lookups (calls to
+    Universe.get_object_by_id() and get_event_by_id()). An EncounterStats may be passed
+    to the run() of several Encounters to add them up.
+    '''
+    phases = ("choose_movement", "move", "resolve_actions", "update_environment",
+              "choose_fight_actions", "keep_going")
+
+    def __init__(self):
+        self.phase_times = {phase: 0.0 for phase in self.phases}
+        self.phase_calls = {phase: 0 for phase in self.phases}
+        # One (time, actions created, actions resolved, registry lookups) per tick
+        self.ticks = []
+        self.registry_lookups = 0
+
+    def time_phase(self, phase, method):
+        '''
+        Call a phase method and add the time it took to the phase.
+        '''
+        start = perf_counter()
+        result = method()
+        self.phase_times[phase] += perf_counter() - start
+        self.phase_calls[phase] += 1
+        return result
+
+    def add_tick(self, time, actions_created, actions_resolved, registry_lookups):
+        '''
+        Record the counts of a tick.
+        '''
+        self.ticks.append((time, actions_created, actions_resolved, registry_lookups))
+
+    def count_lookups(self, universe):
+        '''
+        Count the registry lookups in a Universe until stop_counting_lookups() is called.
+        The lookup methods are wrapped on the Universe instance only, so nothing is
+        counted, nor costs anything, when no EncounterStats is in use.
+        '''
+        def counted(lookup):
+            def wrapper(the_id):
+                self.registry_lookups += 1
+                return lookup(the_id)
+            return wrapper
+        universe.get_object_by_id = counted(universe.get_object_by_id)
+        universe.get_event_by_id = counted(universe.get_event_by_id)
+
+    def stop_counting_lookups(self, universe):
+        '''
+        Restore the lookup methods of a Universe.
+        '''
+        del universe.get_object_by_id
+        del universe.get_event_by_id
+
+    def total_time(self):
+        '''
+        Get the time spent in all phases.
+        '''
+        return sum(self.phase_times.values())
+
+    def actions_created(self):
+        '''
+        Get the number of Actions created in all ticks.
+        '''
+        return sum(tick[1] for tick in self.ticks)
+
+    def actions_resolved(self):
+        '''
+        Get the number of Actions resolved in all ticks.
+        '''
+        return sum(tick[2] for tick in self.ticks)
+
+    def to_dict(self):
+        '''
+        Get the totals as a dictionary.
+        '''
+        return {"phase times": dict(self.phase_times),
+                "phase calls": dict(self.phase_calls),
+                "ticks": len(self.ticks),
+                "actions created": self.actions_created(),
+                "actions resolved": self.actions_resolved(),
+                "registry lookups": self.registry_lookups}
+
+    def summary(self):
+        '''
+        Get a table of the time spent in each phase.
+        '''
+        total = self.total_time()
+        lines = [f"{'phase':<22}{'calls':>8}{'seconds':>12}{'share':>8}"]
+        for phase in self.phases:
+            seconds = self.phase_times[phase]
+            share = seconds / total if total > 0 else 0
+            lines.append(f"{phase:<22}{self.phase_calls[phase]:>8}{seconds:>12.6f}{share:>8.1%}")
+        ticks = max(len(self.ticks), 1)
+        lines.append(f"{len(self.ticks)} ticks, "
+                     f"{self.actions_created() / ticks:.2f} actions created, "
+                     f"{self.actions_resolved() / ticks:.2f} resolved and "
+                     f"{self.registry_lookups / ticks:.1f} registry lookups per tick")
+        return "\n".join(lines)
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "event.py 2024-02-28T04:10-03:00"
+__version__ = "event.py 2026-10-18T09:12-03:00"
 
 # TODO: Redo unit tests for library parent
 
@@ -126,3 +126,39 @@ class Event(Identifiable):
         if self.parent_event_id != other.parent_event_id:
             return False
         return True
+
+class EventQueue():
+    '''
+    A priority queue of Events keyed on end time. Events that end at the same time come
+    out in the order in which they were scheduled.
+    '''
+    def __init__(self):
+        self.heap = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, event):
+        '''
+        Schedule an Event to come out of the queue at its end time.
+        '''
+        heapq.heappush(self.heap, (event.end_time, self.sequence, event))
+        self.sequence += 1
+
+    def next_time(self):
+        '''
+        Get the earliest end time in the queue, or None if the queue is empty.
+        '''
+        if len(self.heap) == 0:
+            return None
+        return self.heap[0][0]
+
+    def pop_due(self, time):
+        '''
+        Remove and return, in schedule order, the Events that end at or before a time.
+        '''
+        due = []
+        while len(self.heap) > 0 and self.heap[0][0] <= time:
+            due.append(heapq.heappop(self.heap)[2])
+        return due
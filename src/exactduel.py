@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "exactduel.py 2026-10-18T17:20-03:00"
+
+# Requires NumPy, which nothing else in the Universe depends on.
+
+from fractions import Fraction
+
+import numpy as np
+
+from action import hit_result_probabilities
+from vectorduel import NORMAL, CRITICAL, FATAL, HIT_SELF
+
+class ExactDuelResult():
+    '''
+    The exact outcome of a duel from the point of view of the first Duelist:
+    probabilities of a win, loss and draw as a MatchupResult counts them, expected hit
+    points given and taken, expected turns, and the probability of each final pair of
+    hit points (hp_a, hp_b).
+    '''
+    def __init__(self, final, hit_points_a, hit_points_b, turns):
+        self.final = final
+        self.turns = turns
+        self.wins = 0.0
+        self.losses = 0.0
+        self.draws = 0.0
+        self.hp_given = 0.0
+        self.hp_taken = 0.0
+        for (hp_a, hp_b), p in final.items():
+            hp_given = hit_points_b - hp_b
+            hp_taken = hit_points_a - hp_a
+            self.hp_given += p * hp_given
+            self.hp_taken += p * hp_taken
+            if hp_given > hp_taken:
+                self.wins += p
+            elif hp_given < hp_taken:
+                self.losses += p
+            else:
+                self.draws += p
+
+    def to_dict(self):
+        '''
+        Get the probabilities and expectations as a dictionary with the keys of
+        MatchupResult.to_dict(), per trial.
+        '''
+        return {"wins": self.wins, "losses": self.losses, "draws": self.draws,
+                "hp given": self.hp_given, "hp taken": self.hp_taken,
+                "turns": self.turns}
+
+class ExactDuel():
+    '''
+    Computes the exact outcome of a one-on-one melee duel between two Duelists with a
+    Markov chain whose states are the hit points of both Duelists and the attacks each
+    has under way with the time left to complete them. The rules are those of
+    VectorDuel, which follow Action.hit_result(), do_normal_hit(), do_critical_hit(),
+    do_fatal_hit() and the shield and armor reductions of Action.
+    '''
+    def __init__(self, duelist_a, duelist_b, difficulty_class=15):
+        self.duelists = (duelist_a, duelist_b)
+        self.difficulty_class = difficulty_class
+        self.timings = [[a["timing"] for a in d.attacks] for d in self.duelists]
+        # effects[s][i] is a dictionary of (kind, amount) to probability for attack i
+        # of side s, where kind is 'target', 'fatal' or 'self'. No effect is left out.
+        self.effects = [[self.attack_effects(s, i) for i in range(len(d.attacks))]
+                        for s, d in enumerate(self.duelists)]
+
+    def hit_result_probabilities(self, s, i):
+        '''
+        Get the probability of each hit result code for attack i of side s.
+        '''
+        attacker, defender = self.duelists[s], self.duelists[1 - s]
+        level = attacker.attacks[i]["attack_level"] - defender.defense_level
+        probabilities = hit_result_probabilities(level, self.difficulty_class,
+                                                 attacker.save_modifier)
+        # The results without an effect on hit points are left out
+        return {NORMAL: probabilities["normal"], CRITICAL: probabilities["critical"],
+                FATAL: probabilities["fatal"], HIT_SELF: probabilities["hit self"]}
+
+    def damage_distribution(self, s, i, target):
+        '''
+        Get the distribution of the damage that gets through the shields and armor of
+        the target (or of the attacker if target is False) for attack i of side s, as a
+        dictionary of damage to probability.
+        '''
+        attack = self.duelists[s].attacks[i]
+        wearer = self.duelists[1 - s] if target else self.duelists[s]
+        stopped = wearer.damage_stopped(attack["penetration_types"])
+        distribution = {}
+        for roll, p_roll in _die(attack["damage"]).items():
+            through = {roll: Fraction(1)}
+            if len(wearer.shield_sizes) > 0:
+                through = {}
+                p_shield = Fraction(1, len(wearer.shield_sizes))
+                for size in wearer.shield_sizes:
+                    p_hit = Fraction(min(max(size + 4, 0), 10), 10)
+                    for damage, p in ((max(roll - size, 0), p_hit), (roll, 1 - p_hit)):
+                        through[damage] = through.get(damage, 0) + p_shield * p
+            for damage, p in through.items():
+                damage = max(damage - stopped, 0)
+                distribution[damage] = distribution.get(damage, 0) + p_roll * p
+        return distribution
+
+    def attack_effects(self, s, i):
+        '''
+        Get the effects on hit points of attack i of side s with their probabilities.
+        '''
+        effects = {}
+        def add(effect, p):
+            if p != 0 and effect[1] != 0:
+                effects[effect] = effects.get(effect, 0) + p
+        codes = self.hit_result_probabilities(s, i)
+        to_target = self.damage_distribution(s, i, True)
+        critical_roll = _die(self.duelists[s].attacks[i]["damage"])
+        for damage, p in to_target.items():
+            add(("target", damage), codes.get(NORMAL, 0) * p)
+            for extra, p_extra in critical_roll.items():
+                add(("target", damage + extra), codes.get(CRITICAL, 0) * p * p_extra)
+        add(("fatal", None), codes.get(FATAL, 0))
+        for damage, p in self.damage_distribution(s, i, False).items():
+            add(("self", damage), codes.get(HIT_SELF, 0) * p)
+        return {effect: float(p) for effect, p in effects.items()}
+
+    def phases(self):
+        '''
+        Get the reachable phases of the duel as (attack_a, left_a, attack_b, left_b),
+        the attack each Duelist has under way and the time left until it resolves.
+        '''
+        start = [(a, ta, b, tb) for a, ta in enumerate(self.timings[0])
+                 for b, tb in enumerate(self.timings[1])]
+        found = set(start)
+        todo = list(start)
+        while todo:
+            for phase in self.next_phases(todo.pop()):
+                if phase not in found:
+                    found.add(phase)
+                    todo.append(phase)
+        return sorted(found)
+
+    def next_phases(self, phase):
+        '''
+        Get the phases that can follow a phase once the due attacks resolve and those
+        Duelists choose their next attack.
+        '''
+        a, left_a, b, left_b = phase
+        dt = min(left_a, left_b)
+        choices_a = [(a, left_a - dt)]
+        if left_a == dt:
+            choices_a = list(enumerate(self.timings[0]))
+        choices_b = [(b, left_b - dt)]
+        if left_b == dt:
+            choices_b = list(enumerate(self.timings[1]))
+        return [(na, la, nb, lb) for na, la in choices_a for nb, lb in choices_b]
+
+    def solve(self):
+        '''
+        Compute the exact outcome of the duel and return it as an ExactDuelResult.
+        '''
+        hit_points = (self.duelists[0].hit_points, self.duelists[1].hit_points)
+        if hit_points[0] <= 0 or hit_points[1] <= 0:
+            return ExactDuelResult({hit_points: 1.0}, hit_points[0], hit_points[1], 1.0)
+
+        phases = self.phases()
+        index = {phase: k for k, phase in enumerate(phases)}
+        count = len(phases)
+        # following[k] is the distribution of the phase after phase k
+        following = np.zeros((count, count))
+        # The attacks that resolve in each phase, in order, grouped by phase
+        groups = {}
+        dts = np.empty(count)
+        for k, (a, left_a, b, left_b) in enumerate(phases):
+            nexts = self.next_phases(phases[k])
+            for phase in nexts:
+                following[k, index[phase]] += 1.0 / len(nexts)
+            dt = min(left_a, left_b)
+            dts[k] = dt
+            due = []
+            if left_a == dt:
+                due.append((0, a))
+            if left_b == dt:
+                due.append((1, b))
+            # When both attacks end together, the one started first resolves first, and
+            # the first Duelist's if they started together
+            if len(due) == 2 and self.timings[0][a] - left_a < self.timings[1][b] - left_b:
+                due.reverse()
+            groups.setdefault(tuple(due), []).append(k)
+
+        # Within a pair of hit points, phases follow each other until an attack changes
+        # hit points. Those steps do not depend on the hit points, so the expected visits
+        # to each phase from each entering phase are the same for every pair.
+        staying = np.zeros((count, count))
+        for due, members in groups.items():
+            p_none = 1.0
+            for s, i in due:
+                p_none *= 1.0 - sum(self.effects[s][i].values())
+            staying[members] = p_none * following[members]
+        visits = np.linalg.inv(np.eye(count) - staying)
+
+        entering = {hit_points: np.zeros(count)}
+        for a, ta in enumerate(self.timings[0]):
+            for b, tb in enumerate(self.timings[1]):
+                entering[hit_points][index[(a, ta, b, tb)]] = 1.0 / (
+                    len(self.timings[0]) * len(self.timings[1]))
+        final = {}
+        time = 0.0
+        # Hit points never go up, so pairs are done in decreasing order of their sum
+        while entering:
+            pair = max(entering, key=lambda p: (p[0] + p[1], p))
+            v = entering.pop(pair) @ visits
+            time += v @ dts
+            for due, members in groups.items():
+                mass = v[members]
+                total = mass.sum()
+                if total == 0:
+                    continue
+                onward = mass @ following[members]
+                for outcome, p in self.outcomes(pair, due).items():
+                    if outcome == pair:
+                        continue
+                    if outcome[0] <= 0 or outcome[1] <= 0:
+                        final[outcome] = final.get(outcome, 0.0) + p * total
+                    elif outcome in entering:
+                        entering[outcome] += p * onward
+                    else:
+                        entering[outcome] = p * onward
+        return ExactDuelResult(final, hit_points[0], hit_points[1], time + 1.0)
+
+    def outcomes(self, pair, due):
+        '''
+        Get the distribution of the hit points that follow the given pair once the due
+        attacks, a sequence of (side, attack), resolve in order.
+        '''
+        outcomes = {pair: 1.0}
+        for s, i in due:
+            effects = self.effects[s][i]
+            p_none = 1.0 - sum(effects.values())
+            following = {}
+            for hp, p in outcomes.items():
+                following[hp] = following.get(hp, 0.0) + p * p_none
+                for effect, p_effect in effects.items():
+                    after = _apply(hp, s, effect)
+                    following[after] = following.get(after, 0.0) + p * p_effect
+            outcomes = following
+        return outcomes
+
+def _die(sides):
+    '''
+    Get the distribution of a roll of 1dY as a dictionary, 0 for sure if Y is 0.
+    '''
+    if sides <= 0:
+        return {0: Fraction(1)}
+    return {roll: Fraction(1, sides) for roll in range(1, sides + 1)}
+
+def _apply(hp, s, effect):
+    '''
+    Apply an effect of an attack by side s to a pair of hit points.
+    '''
+    hp = list(hp)
+    kind, amount = effect
+    if kind == "fatal":
+        if hp[1 - s] > -10:
+            hp[1 - s] = -10
+    else:
+        t = 1 - s if kind == "target" else s
+        # As ObjectInstance.damage()
+        hp[t] = 0 if amount > hp[t] else hp[t] - amount
+    return tuple(hp)
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "identifiable.py 2023-12-27T13:12-03:00"
+__version__ = "identifiable.py 2026-10-19T00:30-03:00"
 
 # TODO:
 
@@ -38,7 +38,8 @@ class Identifiable:
             "name": self.name,
             "id": self.id,
         }
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=2)
+        return json.dumps(self, default=lambda o: o.to_dict() if hasattr(o, 'to_dict') 
+                          else o.__dict__, sort_keys=True, indent=2)
 
     def set_name(self, new_name):
         '''
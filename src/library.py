@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "universe.py 2023-12-28T07:34-03:00"
+__version__ = "library.py 2026-10-18T22:10-03:00"
 
 # TODO: Write unit tests
 
@@ -12,6 +12,7 @@ from armor import ArmorDictionary
 from being import BeingDictionary
 from identifiable import Identifiable
 from object import ObjectDictionary
+from penetration import PenetrationMatrix
 from skill import SkillDictionary
 from weapon import WeaponDictionary
 
@@ -27,6 +28,7 @@ class Library(Identifiable):
         self.object_dictionary = None
         self.skill_dictionary = None
         self.weapon_dictionary = None
+        self.penetration_matrix = None
 
         self.load_library(config_dir)
 
@@ -83,6 +85,17 @@ class Library(Identifiable):
         except Exception as e:
             print(f"Error adding dictionary {dictionary_filename}: {e}")
 
+        # Without its rules no action would ever be possible, so a missing or bad rules 
+        # file is an error
+        rules_filename = f'{config_dir}/action_rules.tsv'
+        self.action_dictionary.load_rules(rules_filename, self.weapon_dictionary)
+
+        try:
+            self.penetration_matrix = PenetrationMatrix(self.weapon_dictionary,
+                                                        self.armor_dictionary)
+        except Exception as e:
+            print(f"Error making penetration matrix: {e}")
+
     def get_action_definition(self, action_name):
         return self.action_dictionary.get_action_definition(action_name)
 
@@ -2,22 +2,24 @@
 # -*- coding: utf-8 -*-
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "main.py 2024-03-15T22:50-03:00"
+__version__ = "main.py 2026-10-18T14:20-03:00"
 
 # TODO: Make a clear method for populating Universe and Encounter with Beings and their possessions.
 # TODO: run weapons x vs weapon y, with each participant wearing armor z where z is each of leather,.chain, plate. that will swing wepping results greatly i bet. dagger more crappy, halberd more deadly.       
 
 import argparse
 import os
-import csv
 import cProfile
-from itertools import combinations
 import pstats
 #import tracemalloc
 
 from universe import Universe
 from library import Library
 from encounter import Encounter
+from matchup import Matchup, MatchupRunner
+from duelist import make_duelists
+from exactduel import ExactDuel
+from tournament import Tournament
 
 #tracemalloc.start()
 
@@ -67,20 +69,8 @@ def test1(library, universe_output_file):
   print(f"Tobe's Universe saved to {universe_output_file}")
 
 def test2(library, universe_output_file):
-  # Make the universe
-  the_arena = Universe(name="The Arena", library=library)
-
-  # Make equal contestants
-  tobe_id = the_arena.make_being("Human", "Tobe")
-  nottobe_id = the_arena.make_being("Human", "NotTobe")
-  tobe = the_arena.get_object_by_id(tobe_id)
-  nottobe = the_arena.get_object_by_id(nottobe_id)
-  
-  # Set up to capture results
-  results = {}
-
-  # Set up distinct combinations of weapons
-#  weapon_combinations = combinations(the_arena.get_weapon_dictionary().objects, 2)
+  # Run equal contestants against each other over a pool of worker processes
+  runner = MatchupRunner(config_dir="./config")
 
   weapon_a_name = 'Spear'
   weapon_b_name = 'Quarterstaff'
@@ -91,183 +81,29 @@ def test2(library, universe_output_file):
     print("{weapon_b_name} supports only the Entangle penetration type")
     exit()
 
-  # Make the first weapon
-  tobe_weapon_id = the_arena.make_weapon(weapon_a_name, f"{weapon_a_name}")
-  tobe_weapon = the_arena.get_object_by_id(tobe_weapon_id)
-
-  # Arm the first contestant
-  the_arena.arm_being(tobe_id, tobe_weapon.id, "right hand")
-
-  # Continue if the first weapon does not support melee actions
-  if tobe.melee_action_supported(the_arena) == False:
-    print(f"{weapon_a_name} does not support melee actions")
-    exit()
-
-  # Make the second weapon
-  nottobe_weapon_id = the_arena.make_weapon(weapon_b_name, f"{weapon_b_name}")
-  nottobe_weapon = the_arena.get_object_by_id(nottobe_weapon_id)
-      
-  # Arm the second contestant
-  the_arena.arm_being(nottobe_id, nottobe_weapon.id, "right hand")
-
-  # Break if the second weapon does not support melee actions
-  if nottobe.melee_action_supported(the_arena) == False:
-    print(f"{weapon_b_name} does not support melee actions")
-    exit()
-
-  matchup = f"{tobe_weapon.name} vs. {nottobe_weapon.name}"
-  print(f'{matchup}')
-  results[matchup] = { "wins":0, "losses":0, "draws":0, "hp given":0, "hp taken":0, "turns":0}
-
-  i = 0
-  for trial in range(1000):
-    # Make an Encounter to play in
-    encounter = Encounter(the_arena, difficulty_class=15, start_time=0, end_time=None, 
-    event_type="Encounter", location=None, 
-    name=f"The Big Matchup {i}-{trial+1} {matchup}")
-
-    # Add the contestants to the match
-    encounter.add_being(tobe_id)
-    encounter.add_being(nottobe_id)
-
-    # Add the match to the arena
-    the_arena.add_event(encounter)
-
-    # Run the match
-    encounter.run()
-
-    # Log the outcome
-    hp_given = nottobe.original.hit_points - nottobe.hit_points()
-    hp_taken = tobe.original.hit_points - tobe.hit_points()
-    turns = encounter.time
-    results[matchup]["hp given"] += hp_given
-    results[matchup]["hp taken"] += hp_taken
-    results[matchup]["turns"] += turns
-
-    if hp_given > hp_taken:
-      results[matchup]["wins"] +=1
-    elif hp_given < hp_taken:
-      results[matchup]["losses"] +=1
-    else:
-      results[matchup]["draws"] +=1
-
-    tobe.set_hit_points(tobe.original.hit_points)
-    nottobe.set_hit_points(nottobe.original.hit_points)
-    tobe_weapon.hit_points = tobe_weapon.original.hit_points
-    nottobe_weapon.hit_points = nottobe_weapon.original.hit_points
+  matchup = Matchup("Human", weapon_a_name, "Human", weapon_b_name, trials=1000)
+  print(f'{weapon_a_name} vs. {weapon_b_name}')
 
+  # The runner raises a ValueError if either weapon does not support melee actions
+  results = {f'{weapon_a_name} vs. {weapon_b_name}': runner.run(matchup).to_dict()}
   print(f"Results:\n {results}")
 
-def test3(library, universe_output_file):
-  # Make the universe
-  the_arena = Universe(name="The Arena", library=library)
-
-  # Set up to capture results
-  results = {}
-
-  # Set up distinct combinations of weapons
-  weapon_combinations = combinations(the_arena.get_weapon_dictionary().objects, 2)
-  i=0
-  for combination in weapon_combinations:
-    i+=1
-    weapon_a_name, weapon_b_name = combination
-    if weapon_a_name == "Lasso" or weapon_a_name == "Net" or weapon_b_name == "Lasso" or weapon_b_name == "Net":
-      continue
-  
-    # Make equal contestants
-    tobe_id = the_arena.make_being("Human", "Tobe")
-    nottobe_id = the_arena.make_being("Human", "NotTobe")
-    tobe = the_arena.get_object_by_id(tobe_id)
-    nottobe = the_arena.get_object_by_id(nottobe_id)
-
-    # Make the first weapon
-    tobe_weapon_id = the_arena.make_weapon(weapon_a_name, f"{weapon_a_name}")
-    tobe_weapon = the_arena.get_object_by_id(tobe_weapon_id)
-
-    # Arm the first contestant
-    the_arena.arm_being(tobe_id, tobe_weapon.id, "right hand")
-
-    # Continue if the first weapon does not support melee actions
-    if tobe.melee_action_supported(the_arena) == False:
-#      print(f"{weapon_a_name} does not support melee actions")
-      continue
-
-    # Make the second weapon
-    nottobe_weapon_id = the_arena.make_weapon(weapon_b_name, f"{weapon_b_name}")
-    nottobe_weapon = the_arena.get_object_by_id(nottobe_weapon_id)
-      
-    # Arm the second contestant
-    the_arena.arm_being(nottobe_id, nottobe_weapon.id, "right hand")
-
-    # Break if the second weapon does not support melee actions
-    if nottobe.melee_action_supported(the_arena) == False:
-#      print(f"{weapon_b_name} does not support melee actions")
-      continue
-
-    # Armor the first contestant
-    todays_armor = "Full plate armor"
-    tobe_armor = the_arena.make_armor_for_being(tobe_id, f"{todays_armor}", f"Tobe's {todays_armor}")
-    nottobe_armor = the_arena.make_armor_for_being(nottobe_id, f"{todays_armor}", f"NotTobe's {todays_armor}")
-        
-    matchup = f"{todays_armor},{tobe_weapon.name} vs. {todays_armor},{nottobe_weapon.name}"
-    print(f'{i} {matchup}')
-
-    results[matchup] = {"armor1":f"{todays_armor}", "weapon1":f"{tobe_weapon.name}", "armor2":f"{todays_armor}", "weapon2":f"{nottobe_weapon.name}", "wins":0, "losses":0, "draws":0, "hp given":0, "hp taken":0, "turns":0}
-
-    for trial in range(10):
-      # Make an Encounter to play in
-      encounter = Encounter(the_arena, difficulty_class=15, start_time=0, end_time=None, 
-        event_type="Encounter", location=None, 
-        name=f"The Big Matchup {i}-{trial+1} {matchup}", 
-        parent_event_id="0", id=None, initiated=False, map=None)
-
-      # Add the contestants to the match
-      encounter.add_being(tobe_id)
-      encounter.add_being(nottobe_id)
-
-      # Add the match to the arena
-      the_arena.add_event(encounter)
-
-      # Run the match
-      encounter.run()
-
-      # Log the outcome
-      hp_given = nottobe.original.hit_points - nottobe.hit_points()
-      hp_taken = tobe.original.hit_points - tobe.hit_points()
-      turns = encounter.time
-      results[matchup]["hp given"] += hp_given
-      results[matchup]["hp taken"] += hp_taken
-      results[matchup]["turns"] += turns
-
-      if hp_given > hp_taken:
-        results[matchup]["wins"] +=1
-      elif hp_given < hp_taken:
-        results[matchup]["losses"] +=1
-      else:
-        results[matchup]["draws"] +=1
-
-      tobe.set_hit_points(tobe.original.hit_points)
-      nottobe.set_hit_points(nottobe.original.hit_points)
-      tobe_weapon.hit_points = tobe_weapon.original.hit_points
-      nottobe_weapon.hit_points = nottobe_weapon.original.hit_points
-
-  # Open a CSV file for writing
-  with open(f'../workspace/weapon_results_in_{todays_armor}.csv', 'w', newline='') as csvfile:
-    # Define the header row
-    fieldnames = ['Matchup'] + list(next(iter(results.values())).keys())  # Extract the keys from the first inner dictionary
-
-    # Create a CSV writer object
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-    # Write the header row
-    writer.writeheader()
-
-    # Iterate over the entries in dictionary D
-    for entry, inner_dict in results.items():
-        # Write a row for each entry, with the entry name as the first column
-        row = {'Matchup': entry}
-        row.update(inner_dict)  # Update the row with the values from the inner dictionary
-        writer.writerow(row)
+  # The exact outcome per trial, for comparison
+  duelist_a, duelist_b = make_duelists(Universe(name="Duel", library=library), matchup)
+  exact = ExactDuel(duelist_a, duelist_b, matchup.difficulty_class).solve()
+  print(f"Exact:\n {exact.to_dict()}")
+
+def test3(library, workspace):
+  # Weapon against weapon in each armor, stopping when the win rate is known to within
+  # 0.1, or at 2000 trials. Rerun to resume after an interruption.
+  weapons = [name for name in library.weapon_dictionary.objects if name not in ("Lasso", "Net")]
+  armors = ["Full plate armor"]
+  tournament = Tournament(weapons, armors, ["Human"],
+    output_file=f"{workspace}/weapon_results.csv", config_dir="./config",
+    trials=2000, ci_width=0.1)
+  print(f"{len(tournament.pending_matchups())} matchups to run")
+  rows = tournament.run()
+  print(f"{rows} results written to {tournament.output_file}")
 
 def _getoptions():
   ''' Parse command line options and return them.'''
@@ -310,7 +146,7 @@ def main():
 
 #  test1(library, f'{options.workspace}/{options.outputfile}')
 #  test2(library, f'{options.workspace}/{options.outputfile}')
-  test3(library, f'{options.workspace}/{options.outputfile}')
+  test3(library, options.workspace)
 
 if __name__ == '__main__':
   main()
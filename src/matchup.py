@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "matchup.py 2026-10-18T21:15-03:00"
+
+import math
+import multiprocessing
+from statistics import NormalDist
+
+from encounter import Encounter
+from library import Library
+from strategy import Strategy
+from universe import Universe
+from utils import spawn_rng, RollBuffer
+
+class NoMeleeActionError(ValueError):
+    '''
+    Raised when a Being of a Matchup has no melee action with its weapon, so the 
+    Matchup cannot be run.
+    '''
+
+class Matchup():
+    '''
+    A specification of a series of one-on-one melee trials between two Beings, each
+    armed with a weapon and optionally wearing armor and holding a shield.
+    If ci_width is given, trials is the most that will be run. Trials are run in
+    batches of batch_size until the confidence interval of the win rate is no wider
+    than ci_width. With buffered_rolls, each trial draws its rolls from a RollBuffer
+    (requires NumPy) rather than from a random.Random. With use_hit_table, hit results
+    come from precomputed tables (see Action.fast_hit_result()). With pool_actions, the
+    trials reuse their Actions from the ActionPool of the worker Universe.
+    '''
+    def __init__(self, being_type_a, weapon_a, being_type_b, weapon_b, armor_a=None,
+                 armor_b=None, shield_a=None, shield_b=None, strategy_a=None,
+                 strategy_b=None, trials=1000, seed=None, difficulty_class=15,
+                 ci_width=None, confidence=0.95, batch_size=50, buffered_rolls=False,
+                 use_hit_table=False, pool_actions=False):
+        self.being_type_a = being_type_a
+        self.weapon_a = weapon_a
+        self.armor_a = armor_a
+        self.shield_a = shield_a
+        self.strategy_a = strategy_a or Strategy()
+        self.being_type_b = being_type_b
+        self.weapon_b = weapon_b
+        self.armor_b = armor_b
+        self.shield_b = shield_b
+        self.strategy_b = strategy_b or Strategy()
+        self.trials = trials
+        self.seed = seed
+        self.difficulty_class = difficulty_class
+        self.ci_width = ci_width
+        self.confidence = confidence
+        self.batch_size = batch_size
+        self.buffered_rolls = buffered_rolls
+        self.use_hit_table = use_hit_table
+        self.pool_actions = pool_actions
+
+    def name(self):
+        '''
+        Get a name for the Matchup in the form "armor,weapon vs. armor,weapon".
+        '''
+        return f"{self.armor_a},{self.weapon_a} vs. {self.armor_b},{self.weapon_b}"
+
+    def check_names(self, library):
+        '''
+        Raise a ValueError if a Being type, weapon, shield or armor of the Matchup is not
+        in the Library.
+        '''
+        names = ((library.being_dictionary, (self.being_type_a, self.being_type_b)),
+                 (library.weapon_dictionary, (self.weapon_a, self.weapon_b, 
+                                              self.shield_a, self.shield_b)),
+                 (library.armor_dictionary, (self.armor_a, self.armor_b)))
+        for dictionary, dictionary_names in names:
+            for name in dictionary_names:
+                if name is not None and name not in dictionary.objects:
+                    raise ValueError(f"{name} of {self.name()} is not in the Library")
+
+class MatchupResult():
+    '''
+    Aggregate outcomes of the trials of a Matchup from the point of view of the first
+    Being. A trial is a win if the first Being gave more hit points than it took.
+    '''
+    def __init__(self, wins=0, losses=0, draws=0, hp_given=0, hp_taken=0, turns=0):
+        self.wins = wins
+        self.losses = losses
+        self.draws = draws
+        self.hp_given = hp_given
+        self.hp_taken = hp_taken
+        self.turns = turns
+
+    def trials(self):
+        '''
+        Get the number of trials in the MatchupResult.
+        '''
+        return self.wins + self.losses + self.draws
+
+    def win_rate(self):
+        '''
+        Get the fraction of the trials that were wins.
+        '''
+        if self.trials() == 0:
+            return 0
+        return self.wins / self.trials()
+
+    def win_rate_interval(self, confidence=0.95):
+        '''
+        Get the Wilson score interval (low, high) of the win rate at the given
+        confidence level.
+        '''
+        n = self.trials()
+        if n == 0:
+            return (0.0, 1.0)
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        p = self.win_rate()
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return (max(center - half_width, 0.0), min(center + half_width, 1.0))
+
+    def win_rate_ci_width(self, confidence=0.95):
+        '''
+        Get the width of the confidence interval of the win rate.
+        '''
+        low, high = self.win_rate_interval(confidence)
+        return high - low
+
+    def add_trial(self, hp_given, hp_taken, turns):
+        '''
+        Add the outcome of one trial to the MatchupResult.
+        '''
+        self.hp_given += hp_given
+        self.hp_taken += hp_taken
+        self.turns += turns
+        if hp_given > hp_taken:
+            self.wins += 1
+        elif hp_given < hp_taken:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def merge(self, other):
+        '''
+        Add the aggregates of another MatchupResult to this one.
+        '''
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.hp_given += other.hp_given
+        self.hp_taken += other.hp_taken
+        self.turns += other.turns
+
+    def to_dict(self):
+        '''
+        Get the aggregates as a dictionary.
+        '''
+        return {"wins": self.wins, "losses": self.losses, "draws": self.draws,
+                "hp given": self.hp_given, "hp taken": self.hp_taken,
+                "turns": self.turns}
+
+class MatchupRunner():
+    '''
+    Runs the trials of Matchups, fanned out over a pool of worker processes. Each worker
+    has its own Library and Universe.
+    '''
+    def __init__(self, config_dir="./config", processes=None, chunk_size=None):
+        '''
+        processes - number of worker processes, all available CPUs if None, no pool if 1
+        chunk_size - number of trials given to a worker at a time
+        '''
+        self.config_dir = config_dir
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+
+    def chunks(self, trials, start=0):
+        '''
+        Split the trial numbers from start to trials-1 into (first, end) ranges.
+        '''
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, (trials - start) // (self.processes * 4))
+        return [(first, min(first + chunk_size, trials))
+                for first in range(start, trials, chunk_size)]
+
+    def batches(self, matchup):
+        '''
+        Split the trials of a Matchup into the (start, end) ranges run between checks
+        of whether to stop, a single range unless the Matchup has a ci_width.
+        '''
+        if matchup.ci_width is None:
+            return [(0, matchup.trials)]
+        return [(start, min(start + matchup.batch_size, matchup.trials))
+                for start in range(0, matchup.trials, matchup.batch_size)]
+
+    def run(self, matchup):
+        '''
+        Run the trials of a Matchup and return the merged MatchupResult. With a
+        ci_width, stop after the first batch of trials that narrows the confidence
+        interval of the win rate to ci_width. Batches do not depend on the number of
+        processes, so a seeded Matchup gives the same result however it is run.
+        '''
+        result = MatchupResult()
+        if self.processes == 1:
+            _init_worker(self.config_dir)
+            for start, end in self.batches(matchup):
+                for first, last in self.chunks(end, start):
+                    result.merge(_run_trials((matchup, first, last)))
+                if self.is_precise(matchup, result):
+                    break
+            return result
+        with multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(self.config_dir,)) as pool:
+            for start, end in self.batches(matchup):
+                tasks = [(matchup, first, last) for first, last in self.chunks(end, start)]
+                for chunk_result in pool.imap_unordered(_run_trials, tasks):
+                    result.merge(chunk_result)
+                if self.is_precise(matchup, result):
+                    break
+        return result
+
+    def is_precise(self, matchup, result):
+        '''
+        Determine if a MatchupResult is precise enough to stop running the Matchup.
+        '''
+        if matchup.ci_width is None:
+            return False
+        return result.win_rate_ci_width(matchup.confidence) <= matchup.ci_width
+
+def make_contestant(universe, being_type, name, weapon, armor, shield, strategy):
+    '''
+    Make an armed Being and return its id and the ids of its equipment, or None if the
+    Being cannot make melee attacks with its weapon.
+    '''
+    being_id = universe.make_being(being_type, name)
+    if being_id is None:
+        return None
+    being = universe.get_object_by_id(being_id)
+    being.strategy = strategy.copy()
+    object_ids = [being_id]
+    weapon_id = universe.make_weapon(weapon, weapon)
+    if weapon_id is None or not universe.arm_being(being_id, weapon_id, "right hand"):
+        return None
+    if not being.melee_action_supported(universe):
+        return None
+    object_ids.append(weapon_id)
+    if shield is not None:
+        shield_id = universe.make_weapon(shield, shield)
+        if shield_id is None or not universe.arm_being(being_id, shield_id, "left hand"):
+            return None
+        object_ids.append(shield_id)
+    if armor is not None:
+        armor_id = universe.make_armor_for_being(being_id, armor, armor)
+        if armor_id is None:
+            return None
+        object_ids.append(armor_id)
+    return object_ids
+
+# The Library and Universe of a worker process
+_worker_config_dir = None
+_worker_library = None
+_worker_universe = None
+
+def _init_worker(config_dir):
+    '''
+    Give the worker process its own Library and Universe.
+    '''
+    global _worker_config_dir, _worker_library, _worker_universe
+    if _worker_library is None or _worker_config_dir != config_dir:
+        _worker_config_dir = config_dir
+        _worker_library = Library(config_dir)
+    _worker_universe = Universe(name="Matchup worker", library=_worker_library)
+
+def _reset_contestant(universe, object_ids, shield, armor):
+    '''
+    Set all of the current values of a contestant made by make_contestant() and of its
+    equipment back to their original values, and arm the contestant again.
+    '''
+    for object_id in object_ids:
+        universe.get_object_by_id(object_id).reset()
+    being_id, weapon_id, *equipment_ids = object_ids
+    universe.arm_being(being_id, weapon_id, "right hand")
+    if shield is not None:
+        universe.arm_being(being_id, equipment_ids.pop(0), "left hand")
+    if armor is not None:
+        universe.armor_being(being_id, equipment_ids.pop(0))
+
+def _run_trials(task):
+    '''
+    Run the trials first through end-1 of a Matchup in the worker Universe.
+    '''
+    matchup, first, end = task
+    universe = _worker_universe
+    matchup.check_names(universe.get_library())
+    objects_a = make_contestant(universe, matchup.being_type_a, "A", matchup.weapon_a,
+        matchup.armor_a, matchup.shield_a, matchup.strategy_a)
+    objects_b = make_contestant(universe, matchup.being_type_b, "B", matchup.weapon_b,
+        matchup.armor_b, matchup.shield_b, matchup.strategy_b)
+    if objects_a is None or objects_b is None:
+        raise NoMeleeActionError(f"Unable to make melee contestants for {matchup.name()}")
+    try:
+        return _run_contestants(matchup, first, end, universe, objects_a, objects_b)
+    finally:
+        # The contestants are made again for each chunk, so they go once it is done
+        for object_id in objects_a + objects_b:
+            universe.remove_object(object_id)
+
+def _run_contestants(matchup, first, end, universe, objects_a, objects_b):
+    '''
+    Run the trials first through end-1 of a Matchup between contestants made by 
+    make_contestant(), resetting them after each trial.
+    '''
+    being_a = universe.get_object_by_id(objects_a[0])
+    being_b = universe.get_object_by_id(objects_b[0])
+    result = MatchupResult()
+    for trial in range(first, end):
+        # Each trial has its own stream derived from the seed, wherever it runs
+        rng = None
+        if matchup.seed is not None:
+            rng = spawn_rng(matchup.seed, trial)
+        if matchup.buffered_rolls:
+            rng = RollBuffer(None if rng is None else rng.getrandbits(64))
+        encounter = Encounter(universe, matchup.difficulty_class, start_time=0,
+            event_type="Encounter", name=f"{matchup.name()} {trial}", rng=rng,
+            use_hit_table=matchup.use_hit_table, bind_actions=True,
+            pool_actions=matchup.pool_actions)
+        encounter.add_being(being_a.id)
+        encounter.add_being(being_b.id)
+        encounter.run(skip_idle_ticks=True)
+        hp_given = being_b.original.hit_points - being_b.hit_points()
+        hp_taken = being_a.original.hit_points - being_a.hit_points()
+        result.add_trial(hp_given, hp_taken, encounter.time)
+
+        # Leave nothing of the trial behind in the worker Universe
+        for action_id in encounter.finished_action_list:
+            universe.event_history.pop(action_id, None)
+        for action_id in encounter.pending_action_list:
+            action = universe.event_history.pop(action_id, None)
+            # Pooled Actions left pending are reused by the next trial
+            if matchup.pool_actions and action is not None:
+                universe.get_action_pool().release(action)
+        _reset_contestant(universe, objects_a, matchup.shield_a, matchup.armor_a)
+        _reset_contestant(universe, objects_b, matchup.shield_b, matchup.armor_b)
+    return result
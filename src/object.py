@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "object.py 2024-03-15T22:50-03:00"
+__version__ = "object.py 2026-10-19T00:30-03:00"
 
 # TODO: Make size category function from largest of length, width, height
 # TODO: Make ''' comments on classes and methods
@@ -92,19 +92,104 @@ class ObjectDefinition:
         if added_weapon_category not in self.weapon_categories:
             self.weapon_categories.append(added_weapon_category)
 
+class CopyOnWrite():
+    '''
+    The current values of an ObjectInstance as an overlay on its definition, instead of a
+    copy of the definition. A value is taken from the definition the first time it is 
+    read and kept in the overlay, copied if it could be changed in place (a dict, a list 
+    or an object with a copy(), such as Skills), so the definition is never changed 
+    through the overlay. Values that are set are kept in the overlay. An overlay is an 
+    instance of a subclass of the class of its definition, made by overlay(), so the 
+    methods of the definition work on the current values.
+    '''
+    def __getattr__(self, name):
+        # Only called for values that are not in the overlay yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+        value = copy_value(getattr(self._definition, name))
+        self.__dict__[name] = value
+        return value
+
+    def __reduce__(self):
+        return (_restore_overlay, (self._definition, self.get_changed_values()))
+
+    def get_definition(self):
+        '''
+        Get the definition under the overlay.
+        '''
+        return self._definition
+
+    def get_changed_values(self):
+        '''
+        Get a dictionary of the values kept in the overlay, which may differ from those 
+        of the definition.
+        '''
+        return {k: v for k, v in self.__dict__.items() if k != '_definition'}
+
+    def get_values(self):
+        '''
+        Get a dictionary of all of the current values, in the order of those of the 
+        definition, as a copy of the definition would have them.
+        '''
+        values = {k: v for k, v in vars(self._definition).items() if not k.startswith('_')}
+        values.update(self.get_changed_values())
+        return values
+
+# The overlay class for each definition class
+_overlay_classes = {}
+
+def overlay(definition):
+    '''
+    Make a CopyOnWrite overlay on a definition, which costs the same whatever the size of 
+    the definition.
+    '''
+    definition_class = type(definition)
+    overlay_class = _overlay_classes.get(definition_class)
+    if overlay_class is None:
+        overlay_class = type(f'{definition_class.__name__}Overlay', 
+                             (CopyOnWrite, definition_class), {})
+        _overlay_classes[definition_class] = overlay_class
+    current = overlay_class.__new__(overlay_class)
+    current.__dict__['_definition'] = definition
+    return current
+
+def _restore_overlay(definition, changed_values):
+    '''
+    Make an overlay on a definition again with the values it had kept, for pickle.
+    '''
+    current = overlay(definition)
+    current.__dict__.update(changed_values)
+    return current
+
+def copy_value(value):
+    '''
+    Get a copy of a value that can be changed without changing the original, the value 
+    itself if it cannot be changed in place.
+    '''
+    if value is None or isinstance(value, (str, int, float, tuple, frozenset)):
+        return value
+    if isinstance(value, dict):
+        return {k: copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_value(v) for v in value]
+    if callable(getattr(value, 'copy', None)):
+        return value.copy()
+    return value
+
 class ObjectInstance(Identifiable):
     ''' 
     An ObjectInstance is an Identifiable that has a Size and occupies space for a period 
     of time. It is not necessarily stationary or permanent. It has normal properties that 
     indicate its original state and current values that are in effect at the time they are 
-    accessed. Instances have unique identifiers.
+    accessed. The current values are a CopyOnWrite overlay on the original definition. 
+    Instances have unique identifiers.
     '''
     def __init__(self, object_definition, name=None, id=None):
         Identifiable.__init__(self, name, id)
         self.top_facing = 0 # up 
         self.front_facing = 1 # whichever horizontal orientation (1-6 on hex) 1 refers to
         self.original = object_definition
-        self.current = object_definition.copy() or None
+        self.current = overlay(object_definition)
         self.parent_container_id = None
 
     def to_json(self):
@@ -113,6 +198,10 @@ class ObjectInstance(Identifiable):
             from universe import Universe
             if isinstance(obj, (Library, Universe)):
                 return obj.id  # Return only the ID for Universe and Event instances
+            if isinstance(obj, CopyOnWrite):
+                return obj.get_values()
+            if hasattr(obj, 'to_dict'):
+                return obj.to_dict()
             return obj.__dict__
 
         data = {
@@ -245,7 +334,8 @@ class ObjectDictionary:
         '''
         Get a representation of an ObjectDictionary as JSON.
         '''
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=2)
+        return json.dumps(self, default=lambda o: o.to_dict() if hasattr(o, 'to_dict') 
+                          else o.__dict__, sort_keys=True, indent=2)
 
     def get_object_definition(self, object_name):
         '''
@@ -320,6 +410,9 @@ class ObjectRegistry:
     def get_object_by_id(self, obj_id):
         return self.object_instances.get(obj_id)
 
+    def remove_object(self, obj_id):
+        return self.object_instances.pop(obj_id, None)
+
     def get_object_contents(self, container_object_id):
         contents = []
         for object_id, object in self.object_instances:
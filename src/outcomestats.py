@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "outcomestats.py 2026-10-18T20:20-03:00"
+
+from action import HIT_RESULT_CODES
+
+class OutcomeStats():
+    '''
+    Running totals of the outcomes of resolved Actions by Being, collected by
+    Encounter.run() when it is given an OutcomeStats. Each resolved Action (or its
+    ActionRecord) is added as it resolves, so nothing needs to be kept of it afterwards.
+    The attacker of each Action is credited with the attack, its hit result and the
+    damage it rolled and dealt. The victim, the target or, on a hit self, the attacker
+    itself, is credited with the damage stopped by its shield and armor and the damage
+    it took. An OutcomeStats may be passed to the run() of several Encounters to add
+    them up.
+    '''
+    counters = ("attacks", "hits", "criticals", "fatal hits", "self hits", "misses",
+                "damage rolled", "shield stopped", "armor stopped", "damage dealt",
+                "damage taken")
+    # The outcome codes of the hit results that count as hits on the target
+    hit_codes = {HIT_RESULT_CODES["normal"], HIT_RESULT_CODES["critical"],
+                 HIT_RESULT_CODES["fatal"]}
+    critical_codes = {HIT_RESULT_CODES["critical"], HIT_RESULT_CODES["fatal"]}
+    fatal_code = HIT_RESULT_CODES["fatal"]
+    hit_self_code = HIT_RESULT_CODES["hit self"]
+
+    def __init__(self):
+        # A dictionary of counters for each Being id
+        self.beings = {}
+
+    def get(self, being_id):
+        '''
+        Get the counters of a Being, starting them at 0 if it has none yet.
+        '''
+        counts = self.beings.get(being_id)
+        if counts is None:
+            counts = dict.fromkeys(self.counters, 0)
+            self.beings[being_id] = counts
+        return counts
+
+    def add(self, record):
+        '''
+        Add the outcome of a resolved Action or of an ActionRecord. Actions that did not
+        attempt a hit (outcome None) are not counted.
+        '''
+        outcome = record.outcome
+        if outcome is None:
+            return
+        attacker = self.get(record.actor_id)
+        attacker["attacks"] += 1
+        if outcome == self.hit_self_code:
+            victim = attacker
+            attacker["self hits"] += 1
+        elif outcome in self.hit_codes:
+            victim = self.get(record.target_id)
+            attacker["hits"] += 1
+            if outcome in self.critical_codes:
+                attacker["criticals"] += 1
+            if outcome == self.fatal_code:
+                attacker["fatal hits"] += 1
+        else:
+            attacker["misses"] += 1
+            return
+        attacker["damage rolled"] += record.rolled_damage or 0
+        attacker["damage dealt"] += record.applied_damage or 0
+        victim["shield stopped"] += record.shield_stopped or 0
+        victim["armor stopped"] += record.armor_stopped or 0
+        victim["damage taken"] += record.applied_damage or 0
+
+    def hit_rate(self, being_id):
+        '''
+        Get the fraction of the attacks of a Being that hit their target.
+        '''
+        counts = self.beings.get(being_id)
+        if counts is None or counts["attacks"] == 0:
+            return 0
+        return counts["hits"] / counts["attacks"]
+
+    def critical_rate(self, being_id):
+        '''
+        Get the fraction of the attacks of a Being that were critical or fatal hits.
+        '''
+        counts = self.beings.get(being_id)
+        if counts is None or counts["attacks"] == 0:
+            return 0
+        return counts["criticals"] / counts["attacks"]
+
+    def merge(self, other):
+        '''
+        Add the totals of another OutcomeStats to this one.
+        '''
+        for being_id, other_counts in other.beings.items():
+            counts = self.get(being_id)
+            for counter in self.counters:
+                counts[counter] += other_counts[counter]
+
+    def to_dict(self):
+        '''
+        Get the counters of each Being, with its hit and critical rates, as a dictionary.
+        '''
+        return {being_id: {**counts, "hit rate": self.hit_rate(being_id),
+                           "critical rate": self.critical_rate(being_id)}
+                for being_id, counts in self.beings.items()}
+
+    def summary(self, names=None):
+        '''
+        Get a table of the attacks, rates and damage of each Being. names is an optional
+        dictionary of display names by Being id.
+        '''
+        names = names or {}
+        lines = [f"{'being':<24}{'attacks':>8}{'hit':>8}{'crit':>8}{'dealt':>8}"
+                 f"{'taken':>8}{'stopped':>9}"]
+        for being_id, counts in self.beings.items():
+            name = str(names.get(being_id, being_id))[:23]
+            stopped = counts["shield stopped"] + counts["armor stopped"]
+            lines.append(f"{name:<24}{counts['attacks']:>8}"
+                         f"{self.hit_rate(being_id):>8.1%}"
+                         f"{self.critical_rate(being_id):>8.1%}"
+                         f"{counts['damage dealt']:>8}{counts['damage taken']:>8}"
+                         f"{stopped:>9}")
+        return "\n".join(lines)
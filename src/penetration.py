@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "penetration.py 2026-10-18T18:30-03:00"
+
+from armor import worst_defense_values
+
+class PenetrationMatrix():
+    '''
+    The damage stopped and hardness of every ArmorDefinition against every attack of
+    every WeaponDefinition, indexed by (weapon type, attack type) and armor type. The
+    values only depend on the penetration types of the attack, so each armor type has one
+    table of (damage stopped, hardness) by penetration types, which the ArmorInstances of
+    that type made by a Universe share until their own defenses are set.
+    '''
+    # Attack types by the key of their timing, damage and penetration types in the
+    # attacks of a WeaponDefinition
+    attack_types = (("swing", 'S'), ("thrust", 'T'), ("throw", 'R'))
+
+    def __init__(self, weapon_dictionary, armor_dictionary):
+        # The penetration types of each (weapon type, attack type)
+        self.penetration_types = {}
+        for weapon_type, weapon in weapon_dictionary.objects.items():
+            for attack_type, key in self.attack_types:
+                attack = weapon.attacks[key]
+                if attack['t'] is not None and attack['p'] is not None:
+                    self.penetration_types[(weapon_type, attack_type)] = attack['p']
+        # A table of (damage stopped, hardness) by penetration types for each armor type
+        self.armor_tables = {}
+        for armor_type, armor in armor_dictionary.objects.items():
+            self.armor_tables[armor_type] = {
+                p: worst_defense_values(armor.defenses, p)
+                for p in set(self.penetration_types.values())}
+
+    def armor_table(self, armor_type):
+        '''
+        Get the table of (damage stopped, hardness) by penetration types of an armor
+        type, or None if the armor type is not in the PenetrationMatrix.
+        '''
+        return self.armor_tables.get(armor_type)
+
+    def get(self, weapon_type, attack_type, armor_type):
+        '''
+        Get the (damage stopped, hardness) of an armor type against an attack of a
+        weapon type, or None if either is not in the PenetrationMatrix.
+        '''
+        penetration_types = self.penetration_types.get((weapon_type, attack_type))
+        table = self.armor_tables.get(armor_type)
+        if penetration_types is None or table is None:
+            return None
+        return table[penetration_types]
+
+    def damage_stopped(self, weapon_type, attack_type, armor_type):
+        '''
+        Get the damage stopped by an armor type against an attack of a weapon type.
+        '''
+        return self.get(weapon_type, attack_type, armor_type)[0]
+
+    def hardness(self, weapon_type, attack_type, armor_type):
+        '''
+        Get the hardness of an armor type against an attack of a weapon type.
+        '''
+        return self.get(weapon_type, attack_type, armor_type)[1]
+
+    def effectiveness(self, weapon_type, attack_type):
+        '''
+        Get the damage stopped by each armor type against an attack of a weapon type as
+        a dictionary, the armor types that stop the least first.
+        '''
+        stopped = {armor_type: self.damage_stopped(weapon_type, attack_type, armor_type)
+                   for armor_type in self.armor_tables}
+        return dict(sorted(stopped.items(), key=lambda item: item[1]))
+
+    def rows(self):
+        '''
+        Get the PenetrationMatrix as a list of dictionaries, one per weapon type, attack
+        type and armor type, suitable for a csv.DictWriter.
+        '''
+        rows = []
+        for (weapon_type, attack_type), p in self.penetration_types.items():
+            for armor_type, table in self.armor_tables.items():
+                stopped, hardness = table[p]
+                rows.append({"weapon": weapon_type, "attack type": attack_type,
+                             "penetration types": p, "armor": armor_type,
+                             "damage stopped": stopped, "hardness": hardness})
+        return rows
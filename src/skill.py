@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "skill.py 2023-12-27T13:14-03:00"
+__version__ = "skill.py 2026-10-19T00:30-03:00"
 
 # TODO: Make skill categories and populate the config/skill_categories.tsv
 
@@ -118,9 +118,19 @@ class Skills():
     A simple dictionary of skill names and levels. All other information for the skills 
     can be found from the SkillDictionary by looking up the name.
     '''
+    __slots__ = ('skills', 'weapon_skills', '_version')
+
     def __init__(self):
         self.skills = {}
         self.weapon_skills = {}
+        # Changed whenever a level is set, to tell when results based on the levels are stale
+        self._version = 0
+
+    def to_dict(self):
+        '''
+        Get the skill and weapon skill levels for JSON, without the version.
+        '''
+        return {'skills': self.skills, 'weapon_skills': self.weapon_skills}
 
     def get_skills(self):
         '''
@@ -149,6 +159,7 @@ class Skills():
             skill_definition = skill_dictionary.get_skill_definition(skill_name)
             if skill_definition is not None:
                 self.skills[skill_name] = n
+                self._version += 1
 
     def get_weapon_skills(self):
         '''
@@ -193,6 +204,7 @@ class Skills():
             return
 #        print(f'weapon name: {weapon_name} set to {level} converted to {n}')
         self.weapon_skills[weapon_name] = n
+        self._version += 1
 #        print(f'weapon_skills: {self.weapon_skills}')
         categories = []
         for category, weapons in weapon_dict.object_categories.items():
@@ -221,6 +233,12 @@ class Skills():
             new_skills.weapon_skills[skill] = level
         return new_skills
 
+    def get_version(self):
+        '''
+        Get the number that changes whenever a level in the Skills is set.
+        '''
+        return self._version
+
     def to_json(self):
         '''
         Get a representation of a SkillDictionary as JSON.
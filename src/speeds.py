@@ -3,27 +3,44 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "speed.py 2023-12-27T13:14:08-03:00"
+__version__ = "speed.py 2026-10-19T00:30-03:00"
 
 # TODO: Incorporate methods for actual speed.
 # TODO: Make ''' comments on classes and methods
 
 from utils import convert_to_numeric, convert_to_speed
        
+# The types of speed, in the order of their slots in Speed
+SPEED_TYPES = ('ambulate', 'burrow', 'climb', 'fly', 'swim')
+
 class Speed():
+    '''
+    The maximum speeds of a Being of each type, kept as five ints in slots.
+    '''
+    __slots__ = ('_ambulate', '_burrow', '_climb', '_fly', '_swim')
+
     def __init__(self, ambulate=0, burrow=0, climb=0, fly=0, swim=0):
-        self.speeds = {}
-        self.speeds['ambulate'] = convert_to_speed(ambulate)
-        self.speeds['burrow'] = convert_to_speed(burrow)
-        self.speeds['climb'] = convert_to_speed(climb)
-        self.speeds['fly'] = convert_to_speed(fly)
-        self.speeds['swim'] = convert_to_speed(swim)
+        self._ambulate = convert_to_speed(ambulate)
+        self._burrow = convert_to_speed(burrow)
+        self._climb = convert_to_speed(climb)
+        self._fly = convert_to_speed(fly)
+        self._swim = convert_to_speed(swim)
+
+    def to_dict(self):
+        '''
+        Get a dictionary of the speeds by type, as in the JSON of a Being.
+        '''
+        return {'speeds': {speed_type: getattr(self, slot) 
+                           for speed_type, slot in zip(SPEED_TYPES, self.__slots__)}}
 
     def copy(self):
         '''
         Get an independent copy of the Speed instance.
         '''
-        return Speed(self.sprint(), self.burrow(), self.climb(), self.fly(), self.swim())
+        new_speed = Speed.__new__(Speed)
+        for slot in self.__slots__:
+            setattr(new_speed, slot, getattr(self, slot))
+        return new_speed
 
 #     def to_json(self):
 #         '''
@@ -39,23 +56,23 @@ class Speed():
 #         return json.dumps(data)
 
     def sprint(self):
-        return self.speeds.get('ambulate')
+        return self._ambulate
 
     def burrow(self):
-        return self.speeds.get('burrow')
+        return self._burrow
 
     def climb(self):
-        return self.speeds.get('climb')
+        return self._climb
 
     def fly(self):
-        return self.speeds.get('fly')
+        return self._fly
 
     def swim(self):
-        return self.speeds.get('swim')
+        return self._swim
 
     def set_max_speed(self, speed_type, new_value):
         if convert_to_numeric(new_value) is None:
             return
         v = convert_to_speed(new_value)
-        if v >= 0 and speed_type in ['ambulate', 'burrow', 'climb', 'fly', 'swim']:
-            self.speeds[speed_type] = v
+        if v >= 0 and speed_type in SPEED_TYPES:
+            setattr(self, '_' + speed_type, v)
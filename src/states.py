@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "states.py 2023-12-27T13:15-03:00"
+__version__ = "states.py 2026-10-19T00:30-03:00"
 
 # TODO: Make ''' comments on classes and methods
 
@@ -23,24 +23,72 @@ class StatesList():
                 state_name = row[0]
                 self.states.append(state_name)
 
+# The bit of each state name in the bitsets of States, given to names as they are first
+# set, so that any state in a StatesList can be held. The bits are only meaningful within a
+# process, so States keep their own order of names and are pickled by name.
+_state_bits = {}
+
+def state_bit(state_name):
+    '''
+    Get the bit of a state name in the bitsets of States, giving it the next bit if it 
+    has none yet.
+    '''
+    bit = _state_bits.get(state_name)
+    if bit is None:
+        bit = 1 << len(_state_bits)
+        _state_bits[state_name] = bit
+    return bit
+
 class States():
     '''
-    A dictionary of physical and mental states and whether or not they are in effect.
+    A dictionary of physical and mental states and whether or not they are in effect, 
+    kept as two bitsets: the states that have a value and those of them in effect. The 
+    names of the states that have a value are kept in the order in which they were set.
     '''
+    __slots__ = ('_has_value', '_in_effect', '_order')
+
     def __init__(self):
-        self.states = {}
+        self._has_value = 0
+        self._in_effect = 0
+        self._order = ()
+
+    def to_dict(self):
+        '''
+        Get the States for JSON, with the states that have a value in the order they 
+        were set.
+        '''
+        return {'states': self.get_states()}
+
+    def __getstate__(self):
+        return self.get_states()
+
+    def __setstate__(self, states):
+        self.__init__()
+        for state_name, state in states.items():
+            self._set_bit(state_name, state)
 
     def get_states(self):
         '''
-        Get the states dictionary.
+        Get the states dictionary. Changing the dictionary does not change the States.
         '''
-        return self.states
+        return {state_name: bool(self._in_effect & _state_bits[state_name])
+                for state_name in self._order}
 
     def get_state(self, state_name):
         '''
         Get the the value of a state.
         '''
-        return self.states.get(state_name)
+        bit = _state_bits.get(state_name)
+        if bit is None or not self._has_value & bit:
+            return None
+        return bool(self._in_effect & bit)
+
+    def any_in_effect(self, bits):
+        '''
+        Determine if any of the states with the given bits (see state_bit()) are in 
+        effect.
+        '''
+        return self._in_effect & bits != 0
 
     def set_state(self, state_list, state_name, state):
         '''
@@ -51,11 +99,24 @@ class States():
             return
         if isinstance(state_list, StatesList):
             if state_name in state_list.states:
-                self.states[state_name] = b
+                self._set_bit(state_name, b)
+
+    def _set_bit(self, state_name, state):
+        bit = state_bit(state_name)
+        if not self._has_value & bit:
+            self._has_value |= bit
+            self._order += (state_name,)
+        if state:
+            self._in_effect |= bit
+        else:
+            self._in_effect &= ~bit
 
     def remove_state(self, state_name):
-        if state_name in self.states:
-            del self.states[state_name]
+        bit = _state_bits.get(state_name)
+        if bit is not None and self._has_value & bit:
+            self._has_value &= ~bit
+            self._in_effect &= ~bit
+            self._order = tuple(name for name in self._order if name != state_name)
         else:
             raise ValueError(f"State {state_name} not found")
 
@@ -64,6 +125,7 @@ class States():
         Get an independent copy of the States instance.
         '''
         new_states = States()
-        for state, value in self.states.items():
-            new_states.states[state] = value
+        new_states._has_value = self._has_value
+        new_states._in_effect = self._in_effect
+        new_states._order = self._order
         return new_states
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "strategy.py 2024-01-17T09:24-08:00"
+__version__ = "strategy.py 2026-10-19T00:30-03:00"
 
 # TODO:
 
@@ -13,6 +13,8 @@ import json
 from utils import convert_to_numeric, convert_to_speed
        
 class Strategy():
+    __slots__ = ('attack', 'defense', 'timing', 'extra_damage')
+
     def __init__(self, attack=0, defense=0, timing=0, extra_damage=0):
         ''' 
         Make an instance of a combat strategy:
@@ -26,6 +28,12 @@ class Strategy():
         self.timing = timing
         self.extra_damage = extra_damage
 
+    def to_dict(self):
+        '''
+        Get the efforts of the Strategy as a dictionary.
+        '''
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
     def copy(self):
         '''
         Get an independent copy of the Strategy instance.
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "tournament.py 2026-10-18T14:20-03:00"
+
+import csv
+import io
+import multiprocessing
+import os
+from itertools import combinations
+
+from library import Library
+from matchup import Matchup, MatchupRunner, NoMeleeActionError
+
+class Tournament():
+    '''
+    A round robin of one-on-one melee Matchups between every pair of weapons, for each
+    armor and Being type, both contestants being of the same type in the same armor.
+    Each finished Matchup is written to the output CSV file as soon as it completes and
+    its key is added to the checkpoint file, so that a Tournament that is run again
+    skips the Matchups it has already done.
+    '''
+    fieldnames = ["Matchup", "being", "armor1", "weapon1", "armor2", "weapon2",
+                  "wins", "losses", "draws", "hp given", "hp taken", "turns", "trials",
+                  "win rate ci width"]
+
+    def __init__(self, weapons, armors, being_types, output_file, checkpoint_file=None,
+                 config_dir="./config", processes=None, trials=1000, ci_width=None,
+                 batch_size=50, seed=None, difficulty_class=15):
+        '''
+        armors - armor names, None for no armor
+        checkpoint_file - output_file with the extension .checkpoint if None
+        processes - number of worker processes, all available CPUs if None, no pool if 1
+        trials, ci_width, batch_size - as for a Matchup
+        seed - seed from which each Matchup gets its own, unseeded if None
+        '''
+        self.weapons = weapons
+        self.armors = armors
+        self.being_types = being_types
+        self.output_file = output_file
+        self.checkpoint_file = checkpoint_file
+        if checkpoint_file is None:
+            self.checkpoint_file = f"{os.path.splitext(output_file)[0]}.checkpoint"
+        self.config_dir = config_dir
+        self.processes = processes or multiprocessing.cpu_count()
+        self.trials = trials
+        self.ci_width = ci_width
+        self.batch_size = batch_size
+        self.seed = seed
+        self.difficulty_class = difficulty_class
+
+    def key(self, matchup):
+        '''
+        Get the key by which a Matchup is recorded in the checkpoint file, with no armor
+        as an empty string, as in the output file.
+        '''
+        parts = (matchup.being_type_a, matchup.armor_a, matchup.weapon_a, matchup.weapon_b)
+        return "|".join("" if part is None else str(part) for part in parts)
+
+    def matchups(self):
+        '''
+        Get every Matchup of the Tournament, in order.
+        '''
+        matchups = []
+        for being_type in self.being_types:
+            for armor in self.armors:
+                for weapon_a, weapon_b in combinations(self.weapons, 2):
+                    matchup = Matchup(being_type, weapon_a, being_type, weapon_b,
+                        armor_a=armor, armor_b=armor, trials=self.trials,
+                        difficulty_class=self.difficulty_class, ci_width=self.ci_width,
+                        batch_size=self.batch_size)
+                    # A seed of its own, so results do not depend on the order of work
+                    if self.seed is not None:
+                        matchup.seed = f"{self.seed}:{self.key(matchup)}"
+                    matchups.append(matchup)
+        return matchups
+
+    def completed_keys(self):
+        '''
+        Get the keys of the Matchups already done, from the checkpoint file and from the
+        complete rows of the output file, in case a row was written but not its key.
+        '''
+        keys = set()
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, 'r') as checkpoint:
+                keys.update(line.rstrip('\n') for line in checkpoint if line.strip())
+        for row in self.complete_rows():
+            keys.add("|".join((row["being"], row["armor1"], row["weapon1"], row["weapon2"])))
+        return keys
+
+    def complete_rows(self):
+        '''
+        Get the rows of the output file that were written in full, ended by a newline 
+        and with every field, leaving out one cut short by an interruption.
+        '''
+        if not os.path.exists(self.output_file):
+            return []
+        with open(self.output_file, 'r', newline='') as csvfile:
+            text = csvfile.read()
+        text = text[:text.rfind('\n') + 1]
+        return [row for row in csv.DictReader(io.StringIO(text))
+                if row.get(self.fieldnames[-1]) is not None]
+
+    def drop_partial_row(self):
+        '''
+        Remove a last line of the output file that has no newline, left by an 
+        interruption, so that the next row does not run on from it.
+        '''
+        if not os.path.exists(self.output_file):
+            return
+        with open(self.output_file, 'rb+') as csvfile:
+            data = csvfile.read()
+            if data and not data.endswith(b'\n'):
+                csvfile.truncate(data.rfind(b'\n') + 1)
+
+    def check_names(self):
+        '''
+        Raise a ValueError if a Being type, weapon or armor of the Tournament is not in 
+        the Library of its config_dir, before any Matchup is run or checkpointed.
+        '''
+        library = Library(self.config_dir)
+        for matchup in self.matchups():
+            matchup.check_names(library)
+
+    def pending_matchups(self):
+        '''
+        Get the Matchups that are not done yet.
+        '''
+        completed = self.completed_keys()
+        return [m for m in self.matchups() if self.key(m) not in completed]
+
+    def row(self, matchup, result):
+        '''
+        Get the CSV row for the MatchupResult of a Matchup.
+        '''
+        row = {"Matchup": matchup.name(), "being": matchup.being_type_a,
+               "armor1": matchup.armor_a, "weapon1": matchup.weapon_a,
+               "armor2": matchup.armor_b, "weapon2": matchup.weapon_b}
+        row.update(result.to_dict())
+        row["trials"] = result.trials()
+        row["win rate ci width"] = result.win_rate_ci_width(matchup.confidence)
+        return row
+
+    def run(self):
+        '''
+        Run the Matchups that are not done yet and return the number of rows written.
+        Matchups in which either weapon cannot be used in melee are checkpointed
+        without a row. Names that are not in the Library raise a ValueError.
+        '''
+        self.check_names()
+        matchups = self.pending_matchups()
+        directory = os.path.dirname(self.output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.drop_partial_row()
+        write_header = not os.path.exists(self.output_file) or \
+            os.path.getsize(self.output_file) == 0
+        rows = 0
+        with open(self.output_file, 'a', newline='') as csvfile, \
+             open(self.checkpoint_file, 'a') as checkpoint:
+            writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames)
+            if write_header:
+                writer.writeheader()
+                csvfile.flush()
+            for matchup, result in self.results(matchups):
+                if result is not None:
+                    writer.writerow(self.row(matchup, result))
+                    csvfile.flush()
+                    os.fsync(csvfile.fileno())
+                    rows += 1
+                checkpoint.write(f"{self.key(matchup)}\n")
+                checkpoint.flush()
+        return rows
+
+    def results(self, matchups):
+        '''
+        Generate (Matchup, MatchupResult) pairs as the Matchups finish, with None as the
+        MatchupResult of a Matchup in which a Being has no melee action.
+        '''
+        tasks = [(self.config_dir, matchup) for matchup in matchups]
+        if self.processes == 1:
+            for task in tasks:
+                yield _run_matchup(task)
+            return
+        with multiprocessing.Pool(self.processes) as pool:
+            for outcome in pool.imap_unordered(_run_matchup, tasks):
+                yield outcome
+
+def _run_matchup(task):
+    '''
+    Run all the trials of a Matchup in the worker process.
+    '''
+    config_dir, matchup = task
+    try:
+        return matchup, MatchupRunner(config_dir=config_dir, processes=1).run(matchup)
+    except NoMeleeActionError:
+        return matchup, None
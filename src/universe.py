@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "universe.py 2024-03-15T22:51-03:00"
+__version__ = "universe.py 2026-10-19T00:30-03:00"
 
 # TODO: redo unit tests
 # TODO: Make ''' comments on classes and methods
@@ -11,7 +11,8 @@ __version__ = "universe.py 2024-03-15T22:51-03:00"
 # TODO: Have save_to_file save object registry separately.
 # TODO: Create exceptions for make and arm methods if expectations aren't met.
 
-import json, sys
+import json, random, sys
+from action import ActionPool, ActionRecord
 
 from armor import ArmorInstance
 from being import BeingInstance
@@ -19,15 +20,20 @@ from encounter import Encounter
 from event import Event
 from identifiable import Identifiable
 from library import Library
-from object import ObjectInstance, ObjectRegistry
+from object import CopyOnWrite, ObjectInstance, ObjectRegistry
 from weapon import WeaponInstance
 
 class Universe(Identifiable):
     '''
     A container for a "world" and the Objects and Events that populate it.
     '''
-    def __init__(self, name="", library=None, config_path="./config"):
+    def __init__(self, name="", library=None, config_path="./config", seed=None):
         Identifiable.__init__(self, name, id="0")
+        # The random number generator for everything that happens in the Universe. 
+        # Without a seed it is the random module itself.
+        self.rng = random
+        if seed is not None:
+            self.rng = random.Random(seed)
         self.library = None
         if isinstance(library, Library):
             self.library = library
@@ -38,12 +44,20 @@ class Universe(Identifiable):
         self.event_history = {}
         first_event = Event(self, 0, name="Origin of the Universe", id="0")
         self.event_history["0"]=first_event
+        # The ActionPool of the Universe, made on first use
+        self._action_pool = None
 
     def to_json(self):
         def handle_circular_refs(obj):
             if isinstance(obj, (Library, Universe)):
                 return obj.id  # Return only the ID for Universe and Event instances
-            return obj.__dict__
+            if isinstance(obj, CopyOnWrite):
+                return obj.get_values()
+            if hasattr(obj, 'to_dict'):
+                # ActionRecords and the slotted parts of Beings give their own dictionaries
+                return obj.to_dict()
+            # Leave out private working state, such as queues and caches
+            return {k: v for k, v in obj.__dict__.items() if not k.startswith('_')}
 
         data = {
             "type": self.type,
@@ -55,6 +69,14 @@ class Universe(Identifiable):
         }
         return json.dumps(data, default=handle_circular_refs, sort_keys=False, indent=2)
 
+    def get_action_pool(self):
+        '''
+        Get the ActionPool from which Encounters with pool_actions get their Actions.
+        '''
+        if self._action_pool is None:
+            self._action_pool = ActionPool(self)
+        return self._action_pool
+
     def get_event_history(self):
         return self.event_history
 
@@ -68,8 +90,11 @@ class Universe(Identifiable):
     def get_object_by_id(self, obj_id):
         return self.object_registry.get_object_by_id(obj_id)
 
+    def remove_object(self, obj_id):
+        return self.object_registry.remove_object(obj_id)
+
     def add_event(self, event):
-        if isinstance(event, Event):
+        if isinstance(event, (Event, ActionRecord)):
             self.event_history[event.id]=event
 
     def save_to_file(self, filename):
@@ -91,6 +116,8 @@ class Universe(Identifiable):
                 event = Event(**{k: v for k, v in event_data.items() if k != 'type'})
             elif event_type == "Encounter":
                 event = Encounter(**{k: v for k, v in event_data.items() if k != 'type'})
+            elif event_type == "ActionRecord":
+                event = ActionRecord(**{k: v for k, v in event_data.items() if k != 'type'})
             else:
                 raise ValueError(f"Unexpected event type: {event_type}")
             self.add_event(event)
@@ -207,6 +234,9 @@ class Universe(Identifiable):
             print(f"Unable to make armor {name} with armor_type {armor_type}.")        
             return None
         armor = ArmorInstance(armor_def, name)
+        if self.library.penetration_matrix is not None:
+            armor.share_defense_table(
+                self.library.penetration_matrix.armor_table(armor_type))
         self.add_object(armor)
         return armor.id
 
@@ -3,49 +3,246 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "utils.py 2024-01-19T07:14-03:00"
+__version__ = "utils.py 2026-10-18T16:40-03:00"
 
 # TODO: Write test for experience_level()
 
 import random
 import re
+from fractions import Fraction
 
+# NumPy is needed only for the batched rolls
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def get_random_key(the_dict):
+
+def spawn_rng(seed, *keys):
+    """
+    Get a random.Random stream derived from a master seed and any number of keys (e.g., a 
+    trial number). The same seed and keys give the same stream in any process.
+    """
+    return random.Random(":".join(str(part) for part in (seed,) + keys))
+
+
+def get_random_key(the_dict, rng=None):
     """
-    Get a random item from a dictionary.
+    Get a random item from a dictionary. rng is a random.Random or compatible generator, 
+    the random module if None.
     """
     if not isinstance(the_dict, dict):
         return None
     if len(the_dict) == 0:
         return None
-    random_key = random.choice(list(the_dict.keys()))
+    if rng is None:
+        rng = random
+    random_key = rng.choice(list(the_dict.keys()))
     random_value = the_dict[random_key]
     return random_key
 
 
-def roll_dice(dice_string):
+class Dice():
+    """
+    A dice expression of the form "XdY+Z" or "XdY-Z", parsed once. Get one with 
+    get_dice(), which returns the same Dice for the same expression every time.
+    """
+    def __init__(self, num_dice, num_sides, modifier=0, expression=None):
+        self.num_dice = num_dice
+        self.num_sides = num_sides
+        self.modifier = modifier
+        if expression is None:
+            expression = f"{num_dice}d{num_sides}"
+            if modifier != 0:
+                expression += f"{modifier:+d}"
+        self.expression = expression
+
+    @classmethod
+    def parse(cls, dice_string):
+        """
+        Make a Dice from an expression, raising a ValueError if it is not valid.
+        """
+        match = re.match(r"^(\d+)d(\d+)(([-+]?\d+)?)$", dice_string)
+        if not match:
+            raise ValueError(f"Invalid dice string: {dice_string}")
+        modifier = 0
+        if match.group(3) != "":
+            modifier = int(match.group(3))
+        return cls(int(match.group(1)), int(match.group(2)), modifier, dice_string)
+
+    def __repr__(self):
+        return f"Dice({self.expression!r})"
+
+    def roll(self, rng=None):
+        """
+        Roll the dice and add the modifier. rng is a random.Random or compatible 
+        generator, the random module if None.
+        """
+        if rng is None:
+            rng = random
+        if self.num_dice == 1:
+            return rng.randint(1, self.num_sides) + self.modifier
+        return sum(rng.randint(1, self.num_sides) for _ in range(self.num_dice)) + self.modifier
+
+    def roll_many(self, n, rng=None):
+        """
+        Get a list of n independent rolls.
+        """
+        if rng is None:
+            rng = random
+        return [self.roll(rng) for _ in range(n)]
+
+    def min(self):
+        """
+        Get the lowest possible total.
+        """
+        return self.num_dice + self.modifier
+
+    def max(self):
+        """
+        Get the highest possible total.
+        """
+        return self.num_dice * self.num_sides + self.modifier
+
+    def mean(self):
+        """
+        Get the expected total.
+        """
+        return self.num_dice * (self.num_sides + 1) / 2 + self.modifier
+
+    def roll_batch(self, shape, rng=None):
+        """
+        Get a NumPy array of the given shape (or length) of independent rolls. rng is a
+        numpy.random.Generator, or anything numpy.random.default_rng() accepts.
+        """
+        rng = _numpy_rng(rng)
+        if isinstance(shape, int):
+            shape = (shape,)
+        rolls = rng.integers(1, self.num_sides + 1, tuple(shape) + (self.num_dice,))
+        return rolls.sum(axis=-1) + self.modifier
+
+    def distribution(self):
+        """
+        Get the exact distribution of the total as a dictionary of total to Fraction.
+        """
+        counts = {0: 1}
+        for _ in range(self.num_dice):
+            following = {}
+            for total, count in counts.items():
+                for side in range(1, self.num_sides + 1):
+                    following[total + side] = following.get(total + side, 0) + count
+            counts = following
+        outcomes = self.num_sides ** self.num_dice
+        return {total + self.modifier: Fraction(count, outcomes)
+                for total, count in sorted(counts.items())}
+
+
+# Dice by expression, so that each expression is parsed only once
+_dice_cache = {}
+
+
+def get_dice(dice_string):
+    """
+    Get the Dice for an expression, parsing it only the first time it is seen.
+    """
+    dice = _dice_cache.get(dice_string)
+    if dice is None:
+        dice = Dice.parse(dice_string)
+        _dice_cache[dice_string] = dice
+    return dice
+
+
+def _numpy_rng(rng):
+    """
+    Get a numpy.random.Generator from a Generator, a seed or None.
+    """
+    if np is None:
+        raise ImportError("Batched dice rolls require NumPy")
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def roll_dice_batch(dice_string, n, rng=None):
+    """
+    Roll the dice of an expression n times at once and return a NumPy array of the 
+    totals. n may also be a shape, such as (trials, rounds), to get a matrix of rolls.
+    rng is a numpy.random.Generator, or anything numpy.random.default_rng() accepts.
+    """
+    return get_dice(dice_string).roll_batch(n, rng)
+
+
+def roll_dice_matrix(dice_strings, n, rng=None):
+    """
+    Roll each of a sequence of dice expressions n times and return a NumPy array with a
+    row of n totals for each expression.
+    """
+    rng = _numpy_rng(rng)
+    matrix = np.empty((len(dice_strings), n), dtype=np.int64)
+    for row, dice_string in enumerate(dice_strings):
+        matrix[row] = get_dice(dice_string).roll_batch(n, rng)
+    return matrix
+
+
+class RollBuffer():
+    """
+    A random number generator that can be used wherever a random.Random is expected 
+    (e.g., Encounter, Action.resolve(), BeingInstance.makes_save()), and that hands out
+    values drawn in blocks with NumPy rather than one call at a time. All draws share 
+    one block of block_size uniform floats, which randint() scales to its range, so 
+    the buffer does not grow with the number of different ranges asked for.
+    """
+    def __init__(self, seed=None, block_size=256):
+        """
+        seed - anything numpy.random.default_rng() accepts
+        """
+        self.generator = _numpy_rng(seed)
+        self.block_size = block_size
+        self._buffer = iter(())
+
+    def randint(self, a, b):
+        """
+        Get a random integer N such that a <= N <= b.
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def randrange(self, start, stop=None):
+        """
+        Get a random integer from range(start, stop), or range(start) if stop is None.
+        """
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f"Empty range for randrange({start}, {stop})")
+        return self.randint(start, stop - 1)
+
+    def choice(self, seq):
+        """
+        Get a random element of a non-empty sequence.
+        """
+        if len(seq) == 0:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def random(self):
+        """
+        Get a random float in [0.0, 1.0).
+        """
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            self._buffer = iter(self.generator.random(self.block_size).tolist())
+            return next(self._buffer)
+
+
+def roll_dice(dice_string, rng=None):
     """
     Simulate the roll of dice with modifiers as specified by the input string which
     the format "XdY+Z" or "XdY-Z", where X is the number of dice to roll, Y is the number of
     sides on each die, and Z is an optional modifier to add to/subtract from the total.
+    rng is a random.Random or compatible generator, the random module if None.
     """
-    #    match = re.match(r'^(\d+)d(\d+)([+-]\d+)$', dice_string)
-    modifier = 0
-    num_dice = 1
-    match = re.match(r"^(\d+)d(\d+)(([-+]?\d+)?)$", dice_string)
-    if not match:
-        raise ValueError(f"Invalid dice string: {dice_string}")
-    if match.group(1) != "":
-        num_dice = int(match.group(1))
-    num_sides = int(match.group(2))
-    if match.group(3) != "":
-        modifier = int(match.group(3))
-
-    # Roll the dice and compute the total
-    rolls = [random.randint(1, num_sides) for _ in range(num_dice)]
-    total = sum(rolls) + modifier
-    return total
+    return get_dice(dice_string).roll(rng)
 
 
 def convert_to_numeric(value):
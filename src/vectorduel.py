@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "vectorduel.py 2026-10-18T11:45-03:00"
+
+# Requires NumPy, which nothing else in the Universe depends on.
+
+import numpy as np
+
+from matchup import MatchupResult
+
+# Hit result codes, in the order of the hit types of Action.hit_result()
+NORMAL = 0
+CRITICAL = 1
+FATAL = 2
+HIT_SELF = 3
+DROP_WEAPON = 4
+MISS = 5
+SPECTACULAR_MISS = 6
+
+class VectorDuel():
+    '''
+    Simulates many one-on-one melee duels between two Duelists at once with NumPy
+    arrays, following the rules an Encounter uses to choose and resolve swings and
+    thrusts: timing by attack, 1d20 hit rolls with critical, fatal and fumble branches,
+    shield rolls and damage stopped by armor.
+    '''
+    def __init__(self, duelist_a, duelist_b, difficulty_class=15):
+        self.duelists = (duelist_a, duelist_b)
+        self.difficulty_class = difficulty_class
+        self.sides = []
+        for attacker, defender in ((duelist_a, duelist_b), (duelist_b, duelist_a)):
+            attacks = attacker.attacks
+            self.sides.append({
+                "timing": np.array([a["timing"] for a in attacks]),
+                "damage": np.array([a["damage"] for a in attacks]),
+                "attack_level": np.array([a["attack_level"] for a in attacks]),
+                "stopped_by_target": np.array(
+                    [defender.damage_stopped(a["penetration_types"]) for a in attacks]),
+                "stopped_by_self": np.array(
+                    [attacker.damage_stopped(a["penetration_types"]) for a in attacks]),
+                "target_shields": np.array(defender.shield_sizes, dtype=np.int64),
+                "self_shields": np.array(attacker.shield_sizes, dtype=np.int64),
+                "defense_level": defender.defense_level,
+                "save_modifier": attacker.save_modifier
+            })
+
+    def run(self, n, seed=None):
+        '''
+        Run n duels and return a dictionary with arrays of the final hit points of each
+        Duelist ('hp_a', 'hp_b') and the number of turns as an Encounter counts them.
+        seed is anything numpy.random.default_rng() accepts.
+        '''
+        rng = np.random.default_rng(seed)
+        hp = np.empty((2, n), dtype=np.int64)
+        hp[0] = self.duelists[0].hit_points
+        hp[1] = self.duelists[1].hit_points
+        turns = np.ones(n, dtype=np.int64)
+        if hp[0, 0] <= 0 or hp[1, 0] <= 0:
+            return {"hp_a": hp[0], "hp_b": hp[1], "turns": turns}
+
+        # Both Duelists choose an attack at time 0
+        attack = np.empty((2, n), dtype=np.int64)
+        end_time = np.empty((2, n), dtype=np.int64)
+        start_time = np.zeros((2, n), dtype=np.int64)
+        for s in (0, 1):
+            attack[s] = rng.integers(0, len(self.sides[s]["timing"]), n)
+            end_time[s] = self.sides[s]["timing"][attack[s]]
+
+        active = np.arange(n)
+        while active.size > 0:
+            time = np.minimum(end_time[0, active], end_time[1, active])
+            due = [end_time[s, active] == time for s in (0, 1)]
+            # When both attacks end together, the one started first resolves first, and
+            # the first Duelist's if they started together
+            a_first = start_time[0, active] <= start_time[1, active]
+            effects = [self._resolve(rng, s, attack[s, active], due[s]) for s in (0, 1)]
+            h = hp[:, active]
+            for s, first in ((0, a_first), (1, ~a_first), (0, ~a_first), (1, a_first)):
+                self._apply(h, s, effects[s], due[s] & first)
+            hp[:, active] = h
+
+            over = (h > 0).sum(axis=0) <= 1
+            turns[active[over]] = time[over] + 1
+            for s in (0, 1):
+                chooses = due[s] & ~over
+                rows = active[chooses]
+                attack[s, rows] = rng.integers(0, len(self.sides[s]["timing"]), rows.size)
+                end_time[s, rows] = time[chooses] + self.sides[s]["timing"][attack[s, rows]]
+                start_time[s, rows] = time[chooses]
+            active = active[~over]
+        return {"hp_a": hp[0], "hp_b": hp[1], "turns": turns}
+
+    def result(self, n, seed=None):
+        '''
+        Run n duels and return the aggregate outcome as a MatchupResult.
+        '''
+        outcome = self.run(n, seed)
+        hp_given = self.duelists[1].hit_points - outcome["hp_b"]
+        hp_taken = self.duelists[0].hit_points - outcome["hp_a"]
+        return MatchupResult(
+            wins=int(np.count_nonzero(hp_given > hp_taken)),
+            losses=int(np.count_nonzero(hp_given < hp_taken)),
+            draws=int(np.count_nonzero(hp_given == hp_taken)),
+            hp_given=int(hp_given.sum()),
+            hp_taken=int(hp_taken.sum()),
+            turns=int(outcome["turns"].sum()))
+
+    def hit_results(self, rng, s, attack):
+        '''
+        Get hit result codes for the given attacks of side s as in Action.hit_result().
+        '''
+        side = self.sides[s]
+        dc = self.difficulty_class
+        bonus = side["attack_level"][attack] - side["defense_level"]
+        roll, threat, save = rng.integers(1, 21, (3, attack.size))
+        saved = (save == 20) | ((save != 1) & (save >= dc - side["save_modifier"]))
+        natural_20 = np.where(threat == 20, np.where(saved, CRITICAL, FATAL),
+                              np.where(threat + bonus >= dc, CRITICAL, NORMAL))
+        natural_1 = np.where(threat == 1, HIT_SELF,
+                             np.where(1 + bonus < dc,
+                                      np.where(saved, SPECTACULAR_MISS, DROP_WEAPON), MISS))
+        return np.where(roll == 20, natural_20,
+                        np.where(roll == 1, natural_1,
+                                 np.where(roll + bonus >= dc, NORMAL, MISS)))
+
+    def _resolve(self, rng, s, attack, due):
+        '''
+        Resolve the due attacks of side s. Return the damage to the target and to the
+        attacker, and masks of which rows damage each or kill the target outright.
+        '''
+        side = self.sides[s]
+        n = attack.size
+        rows = np.flatnonzero(due)
+        code = np.full(n, MISS)
+        to_target = np.zeros(n, dtype=np.int64)
+        to_self = np.zeros(n, dtype=np.int64)
+        if rows.size > 0:
+            a = attack[rows]
+            code[rows] = self.hit_results(rng, s, a)
+            damage = side["damage"][a]
+            roll = _roll_damage(rng, damage)
+            critical_roll = _roll_damage(rng, damage)
+            through = _through_shield(rng, roll, side["target_shields"])
+            through = np.maximum(through - side["stopped_by_target"][a], 0)
+            to_target[rows] = through + np.where(code[rows] == CRITICAL, critical_roll, 0)
+            through = _through_shield(rng, roll, side["self_shields"])
+            to_self[rows] = np.maximum(through - side["stopped_by_self"][a], 0)
+        return {"hits_target": (code == NORMAL) | (code == CRITICAL),
+                "to_target": to_target,
+                "fatal": code == FATAL,
+                "hits_self": code == HIT_SELF,
+                "to_self": to_self}
+
+    def _apply(self, hp, s, effects, rows):
+        '''
+        Apply the effects of the attacks of side s to the hit points in the given rows.
+        '''
+        t = 1 - s
+        hp[t] = np.where(rows & effects["hits_target"],
+                         _damage(hp[t], effects["to_target"]), hp[t])
+        hp[t] = np.where(rows & effects["fatal"] & (hp[t] > -10), -10, hp[t])
+        hp[s] = np.where(rows & effects["hits_self"], _damage(hp[s], effects["to_self"]), hp[s])
+
+def _roll_damage(rng, damage):
+    '''
+    Roll 1dY for each die size Y in an array, 0 where Y is 0.
+    '''
+    return np.where(damage > 0, (rng.random(damage.size) * damage).astype(np.int64) + 1, 0)
+
+def _through_shield(rng, damage, shield_sizes):
+    '''
+    Get the damage that gets through a shield chosen at random from the given sizes. The
+    shield is hit when a d10 is at most its size + 4, and stops up to its size.
+    '''
+    if shield_sizes.size == 0:
+        return damage
+    size = shield_sizes[rng.integers(0, shield_sizes.size, damage.size)]
+    shield_roll = rng.integers(1, 11, damage.size)
+    return np.where(shield_roll <= size + 4, np.maximum(damage - size, 0), damage)
+
+def _damage(hp, damage):
+    '''
+    Apply damage to hit points as ObjectInstance.damage() does.
+    '''
+    return np.where(damage > hp, 0, hp - damage)
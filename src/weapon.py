@@ -3,14 +3,14 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "weapon.py 2024-03-15T22:52-03:00"
+__version__ = "weapon.py 2026-10-18T23:40-03:00"
 
 # TODO: WeaponDefinitions from file will need widths and heights eventually
 # TODO: Deprecate weapon_size in favor of a function based on actual size and size of wielder
 # TODO: Make ''' comments on classes and methods
 
 import json
-from object import ObjectInstance, ObjectDefinition, ObjectDictionary
+from object import ObjectInstance, ObjectDefinition, ObjectDictionary, overlay
 from utils import convert_to_numeric
 
 class WeaponDefinition(ObjectDefinition):
@@ -105,11 +105,9 @@ class WeaponInstance(ObjectInstance):
     '''
     def __init__(self, weapon_definition, name=None):
         ObjectInstance.__init__(self, weapon_definition, name)
-        self.original = weapon_definition
-        self.current = weapon_definition.copy()
 
     def reset(self):
-        self.current = self.original.copy()
+        self.current = overlay(self.original)
 
     def get_weapon_size(self):
         return self.current.weapon_size
@@ -3,10 +3,11 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_ability.py 2023-03-30T02:10-03:00"
+__version__ = "test_ability.py 2026-10-19T00:30-03:00"
 
 # TODO: Check comprehensiveness
 
+import json
 import unittest
 import sys
 import os
@@ -59,5 +60,16 @@ class TestSpeeds(unittest.TestCase):
         abilities.set_ability('charisma', "12")
         self.assertEqual(abilities.CHA(), 12)
 
+    def test_get_abilities(self):
+        abilities = Abilities(10, 12, 9, 11, 13, 8)
+        self.assertEqual(abilities.get_abilities(), 
+                         {'STR': 10, 'DEX': 12, 'CON': 9, 'INT': 11, 'WIS': 13, 'CHA': 8})
+        # The abilities serialize as they did as a dictionary
+        self.assertEqual(json.loads(json.dumps(abilities, default=lambda o: o.to_dict())),
+                         {'abilities': abilities.get_abilities()})
+        copy = abilities.copy()
+        copy.set_ability('STR', 3)
+        self.assertEqual((abilities.STR(), copy.STR(), copy.CHA()), (10, 3, 8))
+
 if __name__ == '__main__':
     unittest.main()
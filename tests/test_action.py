@@ -3,19 +3,25 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_action.py 2024-02-14T01:23-08:00"
+__version__ = "test_action.py 2026-10-18T21:15-03:00"
 
+import json
+import random
 import unittest
+from fractions import Fraction
 import sys
 import os
 #from unittest.mock import Mock
 
 sys.path.insert(0, os.path.abspath('../src'))
 
-from action import Action
+from action import Action, ActionRecord, HIT_RESULTS, HIT_RESULT_CODES, \
+    hit_result_probabilities, hit_result_table
 from armor import ArmorInstance
 from being import BeingDefinition, BeingInstance
+from damage import Hit, apply_hit
 from encounter import Encounter
+from encounterstats import EncounterStats
 from library import Library
 from object import ObjectInstance
 from strategy import Strategy
@@ -386,11 +392,159 @@ class TestAction(unittest.TestCase):
             self.assertTrue(result in ["fatal", "critical", "normal", "hit self", "miss", "spectacular miss", "drop weapon"])
 #            print(f"{i} {result}")
 
+    def test_hit_result_probabilities(self):
+        probabilities = hit_result_probabilities(0, 15, 0)
+        self.assertEqual(sum(probabilities.values()), 1)
+        self.assertEqual(probabilities["hit self"], Fraction(1, 400))
+        # A fatal hit takes two 20s and a failed saving throw of 1 through 14
+        self.assertEqual(probabilities["fatal"], Fraction(1, 400) * Fraction(14, 20))
+        self.assertEqual(probabilities["miss"], Fraction(13, 20))
+        # With a level high enough, a 1 and another roll above 1 is a plain miss
+        probabilities = hit_result_probabilities(15, 15, 0)
+        self.assertEqual(probabilities["drop weapon"], 0)
+        self.assertEqual(probabilities["miss"], Fraction(19, 400))
+
+    def test_hit_result_table(self):
+        cumulative, results = hit_result_table(2, 15, 1)
+        self.assertIs(hit_result_table(2, 15, 1)[0], cumulative)
+        self.assertEqual(cumulative[-1], 1.0)
+        self.assertEqual(cumulative, sorted(cumulative))
+        self.assertTrue(set(results) <= set(HIT_RESULTS))
+
+    def test_attack_level(self):
+        self.assertEqual(self.action.attack_level(), 0)
+        self.universe.get_object_by_id(self.actor_id).set_strategy(attack=3)
+        self.universe.get_object_by_id(self.target_id).set_strategy(defense=1)
+        self.assertEqual(self.action.attack_level(), 2)
+        self.assertTrue(self.action.roll_hits(8, 10))
+
+    def test_fast_hit_result(self):
+        # Draws from the table have the distribution of hit_result()
+        rng = random.Random(4)
+        n = 20000
+        counts = {}
+        for i in range(n):
+            result = self.action.fast_hit_result(12, rng)
+            counts[result] = counts.get(result, 0) + 1
+        actor = self.universe.get_object_by_id(self.actor_id)
+        probabilities = hit_result_probabilities(0, 12, actor.save_modifier())
+        for result, p in probabilities.items():
+            self.assertAlmostEqual(counts.get(result, 0) / n, float(p), delta=0.01)
+
+    def test_hit_table(self):
+        actor = self.universe.get_object_by_id(self.actor_id)
+        table = self.action.hit_table(12)
+        self.assertIs(table, hit_result_table(0, 12, actor.save_modifier()))
+        # The Action keeps the table worked out from its actor and target
+        actor.set_strategy(attack=3)
+        self.action.fast_hit_result(12, random.Random(1))
+        self.assertIs(self.action._hit_table, table)
+        self.assertIs(self.action.hit_table(15), hit_result_table(3, 15, actor.save_modifier()))
+        # bind() works the table out again from the actor and target as they are then
+        actor.set_strategy(attack=1)
+        self.action.bind()
+        self.assertIsNone(self.action._hit_table)
+        self.assertIs(self.action.hit_table(12), hit_result_table(1, 12, actor.save_modifier()))
+        actor.set_strategy(attack=2)
+        self.assertIs(self.action.hit_table(12), hit_result_table(1, 12, actor.save_modifier()))
+
+    def test_bind(self):
+        self.assertFalse(self.swing.is_bound())
+        self.swing.bind()
+        self.assertTrue(self.swing.is_bound())
+        self.assertIs(self.swing.get_actor(), self.universe.get_object_by_id(self.actor_id))
+        self.assertIs(self.swing.get_target(), self.universe.get_object_by_id(self.target_id))
+        self.assertIs(self.swing.get_instrument(), self.universe.get_object_by_id(self.instrument_id))
+        self.assertIs(self.swing._target_armor, self.universe.get_object_by_id(self.target_armor_id))
+        self.assertEqual(list(self.swing._target_shields.values()), [self.target_shield_id])
+        # Only ids are serialized
+        self.assertNotIn("_actor", self.swing.to_json())
+
+        # A bound Action resolves without registry lookups, leaving only the two of 
+        # each reset of hit points
+        stats = EncounterStats()
+        stats.count_lookups(self.universe)
+        rng = random.Random(3)
+        for i in range(200):
+            self.swing.resolve(10, rng)
+            self.universe.get_object_by_id(self.target_id).set_hit_points(100)
+            self.universe.get_object_by_id(self.actor_id).set_hit_points(100)
+        stats.stop_counting_lookups(self.universe)
+        self.assertEqual(stats.registry_lookups, 400)
+
+    def test_resolve_bound(self):
+        # Bound and unbound Actions resolve the same way
+        outcomes = []
+        for bound in (False, True):
+            self.setUp()
+            if bound:
+                self.thrust.bind()
+            rng = random.Random(8)
+            target = self.universe.get_object_by_id(self.target_id)
+            actor = self.universe.get_object_by_id(self.actor_id)
+            hit_points = []
+            for i in range(100):
+                self.thrust.resolve(12, rng)
+                hit_points.append((actor.hit_points(), target.hit_points()))
+                target.set_hit_points(target.original.hit_points)
+                actor.set_hit_points(actor.original.hit_points)
+            outcomes.append(hit_points)
+        self.assertEqual(outcomes[0], outcomes[1])
+
     def test_resolve(self):
-        # Test resolve
-        # No necessary test
-        pass
-        
+        rng = random.Random(3)
+        target = self.universe.get_object_by_id(self.target_id)
+        for i in range(50):
+            hit_points = target.hit_points()
+            hit_type, hit = self.thrust.resolve(12, rng)
+            self.assertIn(hit_type, HIT_RESULTS)
+            if hit_type in ("normal", "critical"):
+                self.assertIs(hit.victim, target)
+                self.assertEqual(target.hit_points(), max(hit_points - hit.applied, 0))
+            elif hit_type in ("miss", "spectacular miss", "drop weapon"):
+                self.assertIsNone(hit)
+            target.set_hit_points(target.original.hit_points)
+
+    def test_record(self):
+        self.assertIsNone(self.thrust.record().hit_result())
+        hit_type, hit = self.thrust.resolve(12, random.Random(3))
+        record = self.thrust.record()
+        self.assertEqual(record.id, self.thrust.id)
+        self.assertEqual(record.event_type, "thrust")
+        self.assertEqual(record.outcome, HIT_RESULT_CODES[hit_type])
+        self.assertEqual(record.hit_result(), hit_type)
+        self.assertEqual(record.applied_damage, 0 if hit is None else hit.applied)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(ActionRecord(**{k: v for k, v in record.to_dict().items()
+                                         if k != 'type'}).to_dict(), record.to_dict())
+
+    def test_set_outcome(self):
+        self.assertIsNone(self.thrust.outcome)
+        target = self.thrust.get_target()
+        target.set_hit_points(30)
+        hit = Hit(target, 6, 2)
+        apply_hit(hit)
+        self.thrust.set_outcome("critical", hit)
+        self.assertEqual(self.thrust.outcome, HIT_RESULT_CODES["critical"])
+        self.assertEqual((self.thrust.rolled_damage, self.thrust.shield_stopped,
+                          self.thrust.armor_stopped, self.thrust.applied_damage),
+                         (8, 0, 0, 8))
+        self.thrust.set_outcome("miss")
+        self.assertEqual(self.thrust.outcome, HIT_RESULT_CODES["miss"])
+        self.assertEqual((self.thrust.rolled_damage, self.thrust.shield_stopped,
+                          self.thrust.armor_stopped, self.thrust.applied_damage),
+                         (0, 0, 0, 0))
+        # resolve() records the outcome of the Hit it applies
+        for seed in range(20):
+            target.set_hit_points(target.original.hit_points)
+            hit_type, hit = self.thrust.resolve(12, random.Random(seed))
+            self.assertEqual(self.thrust.outcome, HIT_RESULT_CODES[hit_type])
+            if hit is not None:
+                self.assertEqual(self.thrust.rolled_damage,
+                                 self.thrust.shield_stopped + self.thrust.armor_stopped
+                                 + self.thrust.applied_damage)
+        self.assertEqual(json.loads(self.thrust.to_json())["outcome"], self.thrust.outcome)
+
     def test_roll_hits(self):
         # Test roll_hits method with various scenarios
         self.assertFalse(self.action.roll_hits(9,10))
@@ -409,6 +563,34 @@ class TestAction(unittest.TestCase):
         self.assertEqual(self.action.calculate_end_time(5,1), 4)
         self.assertEqual(self.action.calculate_end_time(5,0), 5)
 
+    def test_action_pool(self):
+        pool = self.universe.get_action_pool()
+        self.assertIs(self.universe.get_action_pool(), pool)
+        first = pool.acquire(3, "swing", self.actor_id, self.target_id, self.instrument_id)
+        second = pool.acquire(3, "thrust", self.actor_id, self.target_id, self.instrument_id)
+        self.assertEqual((first.id, second.id), (f"{pool.prefix}1", f"{pool.prefix}2"))
+        self.assertEqual(first.end_time, self.swing.end_time + 3)
+        # The name is made when first read
+        self.assertNotIn("name", first.__dict__)
+        self.assertEqual(first.name, "Tobez swing t=3")
+        self.assertEqual(second.name, "Tobez thrust at t=3")
+        first.bind()
+        first.resolve(12, random.Random(1))
+        pool.release(first)
+        # A released Action is recycled as a new one
+        again = pool.acquire(7, "thrust", self.target_id, self.actor_id, 
+                             self.target_weapon_id)
+        self.assertIs(again, first)
+        self.assertEqual(again.id, f"{pool.prefix}3")
+        self.assertEqual(again.name, "Gordo thrust at t=7")
+        self.assertFalse(again.is_bound())
+        self.assertIsNone(again.outcome)
+        self.assertIs(again.get_instrument(), 
+                      self.universe.get_object_by_id(self.target_weapon_id))
+        self.assertEqual(pool.made, 2)
+        with self.assertRaises(AttributeError):
+            again.not_an_attribute
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "test_actiondictionary.py 2024-02-28T02:27-03:00"
+__version__ = "test_actiondictionary.py 2026-10-18T23:05-03:00"
 
 # TODO: Check comprehensiveness
 
@@ -18,7 +18,11 @@ from io import StringIO
 sys.path.insert(0, os.path.abspath('../src'))
 #print(f'{__version__}:{sys.path}')
 
-from actiondictionary import ActionDefinition, ActionDictionary
+from weapon import WeaponDictionary
+
+from actiondictionary import ActionDefinition, ActionDictionary, ActionRule, CompiledAction, \
+    action_kind, ACTION_KIND_OTHER, ACTION_KIND_SWING, ACTION_KIND_THRUST, TARGET_BEING, \
+    TARGET_NONE, TARGET_OBJECT
 	
 class TestActionDefinition(unittest.TestCase):
     def setUp(self):
@@ -84,6 +88,123 @@ class TestActionDictionary(unittest.TestCase):
         self.action_dict.load_from_dict(action_dict)
         self.assertIn("punch", self.action_dict.actions)
         self.assertEqual(self.action_dict.actions["punch"], "unarmed combat")
+        self.assertIsNone(self.action_dict.get_compiled_action("punch"))
+        action_dict = {"actions": {"punch": {'target_type': 'being', 
+            'required_skill': 'unarmed combat', 'is_melee': 'True'}}}
+        self.action_dict.load_from_dict(action_dict)
+        self.assertTrue(self.action_dict.get_compiled_action("punch").is_melee)
+
+    def test_action_kind(self):
+        self.assertEqual(action_kind("two-handed swing at being"), ACTION_KIND_SWING)
+        self.assertEqual(action_kind("thrust at object"), ACTION_KIND_THRUST)
+        self.assertEqual(action_kind("throw"), ACTION_KIND_OTHER)
+
+    def test_compiled_action(self):
+        compiled = CompiledAction("swing at being", 'being', 'none', 'True')
+        self.assertEqual((compiled.kind, compiled.target_type, compiled.is_melee, 
+                          compiled.event_type), (ACTION_KIND_SWING, TARGET_BEING, True, "swing"))
+        compiled = CompiledAction("grab object", 'object', 'none', 'False')
+        self.assertEqual((compiled.kind, compiled.target_type, compiled.is_melee, 
+                          compiled.event_type), (ACTION_KIND_OTHER, TARGET_OBJECT, False, None))
+        self.assertEqual(CompiledAction("delay", 'none').target_type, TARGET_NONE)
+        self.assertTrue(CompiledAction("punch", is_melee=True).is_melee)
+
+    def test_get_compiled_action(self):
+        self.action_dict.load_actions(self.actions_file)
+        self.assertEqual(len(self.action_dict.compiled_actions), 53)
+        for name, action in self.action_dict:
+            compiled = self.action_dict.get_compiled_action(name)
+            self.assertEqual(compiled.is_melee, action['is_melee'] == 'True')
+            self.assertEqual(compiled.required_skill, action['required_skill'])
+        compiled = self.action_dict.get_compiled_action("thrust at being")
+        self.assertEqual((compiled.kind, compiled.target_type, compiled.is_melee),
+                         (ACTION_KIND_THRUST, TARGET_BEING, True))
+        self.assertIsNone(self.action_dict.get_compiled_action("kick"))
+
+    def test_actions_by_skill(self):
+        self.action_dict.load_actions(self.actions_file)
+        self.assertEqual(self.action_dict.actions_by_skill['stun'], ['stun'])
+        self.assertEqual(self.action_dict.actions_by_skill['advanced weapon'],
+                         ['disarm (armed)', 'feint (armed)', 'parry (armed)'])
+        names = self.action_dict.actions_requiring(['unarmed combat', 'stun', 'none'])
+        self.assertEqual(names, [name for name, action in self.action_dict 
+            if action['required_skill'] in ('unarmed combat', 'stun', 'none')])
+        # Changing the required skill of an action moves it in the index
+        version = self.action_dict.version
+        self.action_dict.add_action(ActionDefinition("stun", 'being', 'none', 'True'))
+        self.assertGreater(self.action_dict.version, version)
+        self.assertEqual(self.action_dict.actions_requiring(['stun']), [])
+        self.assertEqual(self.action_dict.actions_requiring(['none']), 
+                         self.action_dict.actions_requiring(['none', 'stun']))
+        self.assertIn('stun', self.action_dict.actions_requiring(['none']))
+
+class Capabilities():
+    def __init__(self, weapons=None, shields=None, melee_types=(), weapon_types=(),
+                 has_free_hand=False):
+        self.weapons = weapons or {}
+        self.shields = shields or {}
+        self.melee_types = set(melee_types)
+        self.weapon_types = set(weapon_types)
+        self.has_free_hand = has_free_hand
+
+    def loadout(self):
+        return (self.has_free_hand, len(self.weapons) > 0, frozenset(self.melee_types),
+                len(self.shields) > 0, frozenset(self.weapon_types))
+
+class TestActionRule(unittest.TestCase):
+    def setUp(self):
+        self.weapon_dict = WeaponDictionary('../src/config/weapons.tsv')
+        self.weapon_dict.load_object_categories('../src/config/weapon_categories.json')
+        self.armed = Capabilities({"right hand": "w"}, melee_types=["swing"], 
+                                  weapon_types=["Longbow"], has_free_hand=True)
+
+    def test_is_met(self):
+        self.assertTrue(ActionRule('').is_met(Capabilities()))
+        self.assertFalse(ActionRule('not implemented').is_met(self.armed))
+        self.assertTrue(ActionRule('armed, free hand, swing weapon').is_met(self.armed))
+        self.assertFalse(ActionRule('armed, thrust weapon').is_met(self.armed))
+        self.assertFalse(ActionRule('shield').is_met(self.armed))
+        self.assertTrue(ActionRule('shield').is_met(Capabilities(shields={"left hand": "s"})))
+        self.assertTrue(ActionRule('category Bows', self.weapon_dict).is_met(self.armed))
+        self.assertFalse(ActionRule('category Swords', self.weapon_dict).is_met(self.armed))
+
+    def test_unknown_requirement(self):
+        with self.assertRaises(ValueError):
+            ActionRule('three hands')
+        with self.assertRaises(ValueError):
+            ActionRule('category Lasers', self.weapon_dict)
+
+    def test_load_rules(self):
+        action_dict = ActionDictionary('../src/config/actions.tsv')
+        action_dict.load_rules('../src/config/action_rules.tsv', self.weapon_dict)
+        # Every action has a rule
+        self.assertEqual(set(action_dict.rules), set(action_dict.actions))
+        eligible = action_dict.eligible_actions(self.armed)
+        self.assertEqual(eligible, {'swing at being', 'swing at object', 'stun',
+            'two-handed swing at being', 'two-handed swing at object', 'break weapon (unarmed)',
+            'deflect (unarmed)', 'disarm (unarmed)', 'feint (unarmed)', 'parry (unarmed)'})
+        # The same loadout gets the same set
+        self.assertIs(action_dict.eligible_actions(Capabilities({"left hand": "x"}, 
+            melee_types=["swing"], weapon_types=["Longbow"], has_free_hand=True)), eligible)
+
+    def test_missing_rules(self):
+        action_dict = ActionDictionary('../src/config/actions.tsv')
+        # No rules loaded
+        with self.assertRaises(ValueError):
+            action_dict.eligible_actions(self.armed)
+        with self.assertRaises(FileNotFoundError):
+            action_dict.load_rules('../src/config/no_such_rules.tsv')
+        action_dict.load_rules('../src/config/action_rules.tsv', self.weapon_dict)
+        action_dict.eligible_actions(self.armed)
+        # An action added without a rule
+        action_dict.add_action(ActionDefinition("juggle"))
+        with self.assertRaises(ValueError) as context:
+            action_dict.eligible_actions(self.armed)
+        self.assertIn("juggle", str(context.exception))
+        rules_file = StringIO('name\trequires\tnotes\nswing at being\tarmed\t\n')
+        with patch("builtins.open", return_value=rules_file):
+            with self.assertRaises(ValueError):
+                action_dict.load_rules("rules.tsv")
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_armor.py 2024-03-15T22:52-08:00"
+__version__ = "test_armor.py 2026-10-18T18:30-03:00"
 
 # TODO: Check comprehensiveness
 
@@ -14,7 +14,7 @@ import os
 
 sys.path.insert(0, os.path.abspath('../src'))
 
-from armor import ArmorInstance, ArmorDefinition, ArmorDictionary
+from armor import ArmorInstance, ArmorDefinition, ArmorDictionary, worst_defense_values
 from weapon import WeaponInstance, WeaponDefinition
 
 class TestArmorDefinition(unittest.TestCase):
@@ -272,6 +272,48 @@ class TestArmorInstance(unittest.TestCase):
         test_damage_through = self.chain_mail.damage_through(damage, weapon, attack_type)
         self.assertEqual(test_damage_through, 8)
 
+    def test_worst_defense_values(self):
+        self.assertEqual(worst_defense_values(self.chain_mail.current.defenses, 'B,S'), (3, 5))
+        self.assertEqual(worst_defense_values(self.chain_mail.current.defenses, 'P'), (2, 6))
+        self.assertEqual(worst_defense_values(self.chain_mail.current.defenses, 'B,E'), (0, 0))
+        self.assertEqual(self.chain_mail.worst_defense_values('B,P,S'), (2, 5))
+
+    def test_set_defenses_invalidates_values(self):
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('S'), 5)
+        self.chain_mail.set_defenses({
+            'B': {'h': 1, 'd': 3},
+            'P': {'h': 2, 'd': 2},
+            'S': {'h': 3, 'd': 1}})
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('S'), 1)
+        self.assertEqual(self.chain_mail.worst_defense_hardness('S'), 3)
+        self.assertEqual(self.chain_mail.damage_through(10, self.battleaxe, 'swing'), 9)
+
+    def test_set_defense(self):
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('P'), 2)
+        self.chain_mail.set_defense('P', 'd', 4)
+        self.assertEqual(self.chain_mail.current.Pd(), 4)
+        self.assertEqual(self.chain_mail.original.Pd(), 2)
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('P'), 4)
+        self.chain_mail.set_defense('P', 'h', -1)
+        self.assertEqual(self.chain_mail.worst_defense_hardness('P'), 0)
+
+    def test_share_defense_table(self):
+        table = {}
+        other_chain_mail = ArmorInstance(self.chain_mail.original, 'Chainy too')
+        self.chain_mail.share_defense_table(table)
+        other_chain_mail.share_defense_table(table)
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('B,S'), 3)
+        self.assertEqual(table, {'B,S': (3, 5)})
+        # Setting the defenses of one leaves the shared table to the other
+        self.chain_mail.set_defense('B', 'd', 0)
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('B,S'), 0)
+        self.assertEqual(other_chain_mail.worst_defense_damage_stopped('B,S'), 3)
+        self.assertEqual(table, {'B,S': (3, 5)})
+        # Resetting it takes up the shared table again
+        self.chain_mail.reset()
+        self.assertIs(self.chain_mail._defense_table, table)
+        self.assertEqual(self.chain_mail.worst_defense_damage_stopped('B,S'), 3)
+
 class TestArmorDictionary(unittest.TestCase):
     def setUp(self):
         self.armors_file = '../src/config/armors.tsv'
@@ -3,11 +3,12 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "test_being.py 2024-03-15T10:53-03:00"
+__version__ = "test_being.py 2026-10-19T00:30-03:00"
 
 # TODO: Check comprehensiveness
 
 import json
+import pickle
 import unittest
 import sys
 import os
@@ -404,6 +405,84 @@ class TestBeingInstance(unittest.TestCase):
         self.assertIn(chosen, currently_possible)
 #        print(f'Chose: {chosen}')
 
+    def test_capabilities(self):
+        profile = self.being_inst.capabilities(self.universe)
+        self.assertEqual((profile.weapons, profile.shields, profile.melee_types, 
+                          profile.has_free_hand), ({}, {}, set(), False))
+        self.assertIs(self.being_inst.capabilities(self.universe), profile)
+        self.assertFalse(self.being_inst.melee_action_supported(self.universe))
+
+        weapon_id = self.universe.make_weapon_for_being(self.being_inst.id, "Longsword", "Longey")
+        self.universe.arm_being(self.being_inst.id, weapon_id, "right hand")
+        profile = self.being_inst.capabilities(self.universe)
+        self.assertEqual(profile.weapons, {"right hand": weapon_id})
+        self.assertEqual(profile.melee_types, {"swing", "thrust"})
+        self.assertTrue(self.being_inst.has_swing_weapon(self.universe))
+        self.assertTrue(self.being_inst.has_thrust_weapon(self.universe))
+        self.assertFalse(self.being_inst.has_entangle_weapon(self.universe))
+
+        shield_id = self.universe.make_weapon_for_being(self.being_inst.id, "Buckler", "Buckles")
+        self.universe.arm_being(self.being_inst.id, shield_id, "left hand")
+        self.assertEqual(self.being_inst.shielded_with(self.universe), {"left hand": shield_id})
+        self.assertEqual(self.being_inst.armed_with(self.universe), 
+                         {"right hand": weapon_id, "left hand": shield_id})
+        # The dictionaries returned are copies
+        self.being_inst.armed_with(self.universe).clear()
+        self.assertEqual(len(self.being_inst.armed_with(self.universe)), 2)
+
+        self.being_inst.body_part_remove_object("left hand")
+        self.assertEqual(self.being_inst.shielded_with(self.universe), {})
+        self.being_inst.set_body_part_holds_object("left hand", None)
+        self.assertTrue(self.being_inst.capabilities(self.universe).has_free_hand)
+
+        armor_id = self.universe.make_armor_for_being(self.being_inst.id, "Chain mail", "Links")
+        self.assertEqual(self.being_inst.capabilities(self.universe).armor_id, armor_id)
+        profile = self.being_inst.capabilities(self.universe)
+        self.being_inst.drop_weapon(weapon_id)
+        self.assertIsNot(self.being_inst.capabilities(self.universe), profile)
+        profile = self.being_inst.capabilities(self.universe)
+        self.being_inst.invalidate_capabilities()
+        self.assertIsNot(self.being_inst.capabilities(self.universe), profile)
+        # The actions eligible with a profile are looked up once
+        self.being_inst.currently_possible_actions(self.universe)
+        eligible = self.being_inst.capabilities(self.universe).eligible
+        self.assertIn('thrust at being', eligible)
+        self.assertNotIn('block', eligible)
+        self.being_inst.reset()
+        self.assertEqual(self.being_inst.armed_with(self.universe), {})
+
+    def test_possible_actions(self):
+        actions = self.being_inst.possible_actions(self.universe)
+        self.assertIn('swing at being', actions)
+        self.assertNotIn('stun', actions)
+        self.assertNotIn('parry (armed)', actions)
+        # The actions are kept until a skill level is set
+        self.assertIs(self.being_inst._get_possible_actions(self.universe), 
+                      self.being_inst._get_possible_actions(self.universe))
+        self.being_inst.set_skill_level(self.universe.get_skill_dictionary(), 'stun', 1)
+        self.assertIn('stun', self.being_inst.possible_actions(self.universe))
+        self.being_inst.set_weapon_skill_level(self.universe.get_weapon_dictionary(), 
+                                               'Longsword', 2)
+        actions = self.being_inst.possible_actions(self.universe)
+        self.assertIn('parry (armed)', actions)
+        # The actions are in the order of the ActionDictionary
+        order = list(self.universe.get_action_dictionary().actions)
+        self.assertEqual(list(actions), sorted(actions, key=order.index))
+        self.being_inst.reset()
+        self.assertNotIn('stun', self.being_inst.possible_actions(self.universe))
+        self.assertNotIn('stun', self.being_def.get_skills())
+
+    def test_to_json(self):
+        self.being_inst.set_strategy(2, 1, 3, 0)
+        data = json.loads(self.being_inst.to_json())
+        self.assertEqual(data['current']['skills'], {'skills': {}, 'weapon_skills': {}})
+        self.assertEqual(data['current']['abilities'], 
+                         {'abilities': self.being_inst.get_abilities()})
+        self.assertEqual(data['current']['states'], {'states': {}})
+        strategy = pickle.loads(pickle.dumps(self.being_inst.strategy))
+        self.assertEqual(strategy.to_dict(), 
+                         {'attack': 2, 'defense': 1, 'timing': 3, 'extra_damage': 0})
+
 #     def test_shielded_with(self):
 #         self.being_inst.current.body_parts = {"right_arm": "Longsword"}
 #         shielded = self.being_inst.shielded_with(self.weapon_dict)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_damage.py 2026-10-18T20:20-03:00"
+
+import random
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+
+import damage
+from damage import Hit, apply_hit, apply_hits, shield_stage, armor_stage, victim_stage
+from library import Library
+from universe import Universe
+
+class TestDamage(unittest.TestCase):
+    def setUp(self):
+        self.universe = Universe(name="Test Universe", library=Library(config_dir="../src/config"))
+        self.beings = [self.universe.get_object_by_id(self.universe.make_being("Human", f"H{i}"))
+                       for i in range(4)]
+        self.shields = [self.universe.get_object_by_id(self.universe.make_weapon(shield, shield))
+                        for shield in ("Small shield", "Tower shield")]
+        self.armors = [self.universe.get_object_by_id(self.universe.make_armor(armor, armor))
+                       for armor in ("Chain mail", "Leather armor")]
+        self.objects = self.beings + self.shields + self.armors
+
+    def hit_points(self):
+        return [obj.current.hit_points for obj in self.objects]
+
+    def set_hit_points(self, hit_points):
+        for obj, hp in zip(self.objects, hit_points):
+            obj.current.hit_points = hp
+
+    def random_hits(self, rng, n):
+        hits = []
+        for i in range(n):
+            if rng.random() < 0.1:
+                hits.append(Hit(rng.choice(self.beings), fatal=True))
+                continue
+            hits.append(Hit(rng.choice(self.beings), rng.randint(0, 12), rng.choice([0, 0, 5]),
+                            rng.choice(self.shields + [None]), rng.randint(1, 10),
+                            rng.choice(self.armors + [None]), rng.choice(["B", "P,S", "E"])))
+        return hits
+
+    def test_shield_stage(self):
+        shield = self.shields[0]
+        size = int(shield.get_weapon_size())
+        hp = shield.hit_points()
+        self.assertEqual(shield_stage(size + 3, shield, size + 5), size + 3)
+        self.assertEqual(shield.hit_points(), hp)
+        self.assertEqual(shield_stage(size + 3, shield, 1), 3)
+        self.assertEqual(shield.hit_points(), max(hp - size - 3, 0))
+        self.assertEqual(shield_stage(7, None, None), 7)
+
+    def test_armor_stage(self):
+        armor = self.armors[0]
+        stopped, hardness = armor.worst_defense_values("B")
+        hp = armor.hit_points()
+        self.assertEqual(armor_stage(stopped + 4, armor, "B"), 4)
+        self.assertEqual(armor.hit_points(), max(hp - max(stopped + 4 - hardness, 0), 0))
+        self.assertEqual(armor_stage(stopped - 1, armor, "B"), 0)
+        self.assertEqual(armor_stage(7, None, None), 7)
+
+    def test_victim_stage(self):
+        being = self.beings[0]
+        being.set_hit_points(5)
+        victim_stage(being, 3)
+        self.assertEqual(being.hit_points(), 2)
+        victim_stage(being, 0, True)
+        self.assertEqual(being.hit_points(), -10)
+        # Any damage after a fatal hit, even none, leaves 0 hit points
+        victim_stage(being, 0)
+        self.assertEqual(being.hit_points(), 0)
+
+    def test_apply_hit(self):
+        being = self.beings[0]
+        being.set_hit_points(20)
+        hit = Hit(being, 6, 2)
+        self.assertIsNone(hit.applied)
+        apply_hit(hit)
+        self.assertEqual(being.hit_points(), 12)
+        self.assertEqual((hit.shield_stopped, hit.armor_stopped, hit.applied), (0, 0, 8))
+        shield = self.shields[0]
+        size = int(shield.get_weapon_size())
+        hit = Hit(being, size + 4, 0, shield, 1, self.armors[0], "B")
+        apply_hit(hit)
+        stopped = self.armors[0].worst_defense_damage_stopped("B")
+        self.assertEqual(hit.shield_stopped, size)
+        self.assertEqual(hit.armor_stopped, min(stopped, 4))
+        self.assertEqual(hit.applied, max(4 - stopped, 0))
+
+    def check_apply_hits(self, seed):
+        rng = random.Random(seed)
+        for n in (1, 5, 40):
+            start = [rng.randint(-10, 25) if obj in self.beings else obj.current.hit_points
+                     for obj in self.objects]
+            hits = self.random_hits(rng, n)
+            self.set_hit_points(start)
+            expected_kills = []
+            for hit in hits:
+                alive = hit.victim.hit_points() > 0
+                apply_hit(hit)
+                expected_kills.append(alive and hit.victim.hit_points() <= 0)
+            expected = self.hit_points()
+            expected_stages = [(hit.shield_stopped, hit.armor_stopped, hit.applied)
+                               for hit in hits]
+            self.set_hit_points(start)
+            for hit in hits:
+                hit.shield_stopped = hit.armor_stopped = hit.applied = None
+            self.assertEqual(apply_hits(hits, 0), expected_kills)
+            self.assertEqual(self.hit_points(), expected)
+            self.assertEqual([(hit.shield_stopped, hit.armor_stopped, hit.applied)
+                              for hit in hits], expected_stages)
+
+    def test_apply_hits(self):
+        # A batch gives the same results as the Hits one at a time
+        for seed in range(20):
+            self.check_apply_hits(seed)
+        self.assertEqual(apply_hits([], 0), [])
+
+    @unittest.skipIf(damage.np is None, "NumPy is not installed")
+    def test_resolve_hit_arrays(self):
+        np = damage.np
+        result = damage.resolve_hit_arrays(
+            np.array([0, 1, 0, 1]), np.array([False, True, False, False]),
+            np.array([6, 0, 9, 3]), np.array([0, 0, 4, 0]), np.array([0, -1, -1, -1]),
+            np.array([2, 0, 0, 0]), np.array([3, 0, 0, 0]), np.array([-1, -1, 0, -1]),
+            np.array([0, 0, 3, 0]), np.array([0, 0, 5, 0]), np.array([20, 8]),
+            np.array([10]), np.array([30]))
+        # 6-2 then 9-3+4 to the first victim, fatal then 3 to the second
+        self.assertEqual(result["victim_hit_points"].tolist(), [6, 0])
+        self.assertEqual(result["shield_hit_points"].tolist(), [4])
+        self.assertEqual(result["armor_hit_points"].tolist(), [26])
+        self.assertEqual(result["shield_stopped"].tolist(), [2, 0, 0, 0])
+        self.assertEqual(result["armor_stopped"].tolist(), [0, 0, 3, 0])
+        self.assertEqual(result["applied"].tolist(), [4, 0, 10, 3])
+        self.assertEqual(result["kills"].tolist(), [False, True, False, False])
+
+    def test_apply_hits_without_numpy(self):
+        np = damage.np
+        damage.np = None
+        try:
+            for seed in range(5):
+                self.check_apply_hits(seed)
+        finally:
+            damage.np = np
+
+if __name__ == '__main__':
+    unittest.main()
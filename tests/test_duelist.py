@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_duelist.py 2026-10-18T11:45-03:00"
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+from duelist import Duelist, make_duelist, make_duelists
+from library import Library
+from matchup import Matchup
+from strategy import Strategy
+from universe import Universe
+
+class TestDuelist(unittest.TestCase):
+    def setUp(self):
+        self.universe = Universe(name="Test Universe", library=Library(config_dir="../src/config"))
+
+    def test_make_duelist(self):
+        being_id = self.universe.make_being("Human", "Tobe")
+        weapon_id = self.universe.make_weapon("Longsword", "Loki")
+        self.universe.arm_being(being_id, weapon_id, "right hand")
+        shield_id = self.universe.make_weapon("Large shield", "Wall")
+        self.universe.arm_being(being_id, shield_id, "left hand")
+        self.universe.make_armor_for_being(being_id, "Chain mail", "Links")
+        being = self.universe.get_object_by_id(being_id)
+        being.set_strategy(attack=2, defense=1)
+
+        duelist = make_duelist(self.universe, being_id)
+        self.assertEqual(duelist.hit_points, being.hit_points())
+        self.assertEqual(duelist.defense_level, 1)
+        self.assertEqual(duelist.shield_sizes, [4])
+        # Swing and thrust, each with the longsword or the shield
+        self.assertEqual(len(duelist.attacks), 4)
+        swing = duelist.attacks[0]
+        self.assertEqual(swing["attack_type"], "swing")
+        self.assertEqual(swing["timing"], 6)
+        self.assertEqual(swing["damage"], 8)
+        self.assertEqual(swing["penetration_types"], "S")
+        self.assertEqual(swing["attack_level"], 2)
+        armor = self.universe.get_object_by_id(being.get_armor_id())
+        self.assertEqual(duelist.damage_stopped("S"), armor.worst_defense_damage_stopped("S"))
+
+    def test_damage_stopped_without_armor(self):
+        duelist = Duelist("Tobe", 10, 0, 0, [])
+        self.assertEqual(duelist.damage_stopped("B,P,S"), 0)
+
+    def test_make_duelists(self):
+        matchup = Matchup("Human", "Spear", "Kobold", "Dagger", armor_b="Leather armor",
+                          strategy_a=Strategy(attack=1))
+        duelist_a, duelist_b = make_duelists(self.universe, matchup)
+        self.assertEqual(duelist_a.attacks[0]["attack_level"], 1)
+        self.assertIsNone(duelist_a.armor)
+        self.assertIsNotNone(duelist_b.armor)
+
+        matchup = Matchup("Human", "Longbow", "Kobold", "Dagger")
+        with self.assertRaises(ValueError):
+            make_duelists(self.universe, matchup)
+
+if __name__ == '__main__':
+    unittest.main()
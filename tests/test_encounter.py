@@ -3,24 +3,33 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "test_encounter.py 2024-02-28T03:00-03:00"
+__version__ = "test_encounter.py 2026-10-18T21:15-03:00"
 
 # TODO: Everything
 # TODO: Check comprehensiveness
 
+import json
+import random
 import unittest
 import sys
 import os
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath('../src'))
 #print(f'{__version__}:{sys.path}')
 
+from action import Action, ActionRecord, HIT_RESULTS
 from being import BeingDefinition, BeingInstance
+import damage
+import encounter as encounter_module
 from encounter import Encounter
+from encounterstats import EncounterStats
 from event import Event
 from library import Library
 from object import ObjectRegistry
+from outcomestats import OutcomeStats
 from universe import Universe
+from utils import spawn_rng
 
 import unittest
 
@@ -53,6 +62,281 @@ class TestEncounter(unittest.TestCase):
         self.encounter.add_being(being_id2)
         self.assertEqual(len(self.encounter.being_list),2)
         self.assertEqual(len(self.encounter.non_being_object_list),0)
-        
+
+    def test_resolve_actions(self):
+        being_id1 = self.encounter.make_being("Human", "Tobe")
+        being_id2 = self.encounter.make_being("Human", "NotTobe")
+        weapon_id1 = self.encounter.make_weapon_for_being(being_id1, "Longsword", "Loki")
+        weapon_id2 = self.encounter.make_weapon_for_being(being_id2, "Dagger", "Pokey")
+        self.encounter.arm_being(being_id1, weapon_id1, "right hand")
+        self.encounter.arm_being(being_id2, weapon_id2, "right hand")
+        swing = Action(self.universe, 0, None, "swing", being_id1, being_id2, weapon_id1)
+        thrust = Action(self.universe, 0, None, "thrust", being_id2, being_id1, weapon_id2)
+        self.encounter.schedule_action(swing)
+        self.encounter.schedule_action(thrust)
+        self.assertEqual(self.encounter.pending_action_list, [swing.id, thrust.id])
+        self.assertEqual(self.universe.get_event_by_id(swing.id), swing)
+
+        # Only the Actions that end by the current time are resolved
+        first, last = sorted([swing, thrust], key=lambda a: a.end_time)
+        self.encounter.time = first.end_time - 1
+        self.encounter.resolve_actions()
+        self.assertEqual(len(self.encounter.pending_action_list), 2)
+        self.assertEqual(len(self.encounter.finished_action_list), 0)
+        self.encounter.time = first.end_time
+        self.encounter.resolve_actions()
+        self.assertEqual(self.encounter.pending_action_list, [last.id])
+        self.assertEqual(self.encounter.finished_action_list, [first.id])
+        self.encounter.time = last.end_time
+        self.encounter.resolve_actions()
+        self.assertEqual(self.encounter.pending_action_list, [])
+        self.assertEqual(self.encounter.finished_action_list, [first.id, last.id])
+
+    def test_resolve_actions_records(self):
+        being_id1 = self.encounter.make_being("Human", "Tobe")
+        being_id2 = self.encounter.make_being("Human", "NotTobe")
+        weapon_id1 = self.encounter.make_weapon_for_being(being_id1, "Longsword", "Loki")
+        self.encounter.arm_being(being_id1, weapon_id1, "right hand")
+        swing = Action(self.universe, 0, None, "swing", being_id1, being_id2, weapon_id1)
+        self.encounter.schedule_action(swing)
+        hit_points = self.universe.get_object_by_id(being_id2).hit_points()
+        self.encounter.time = swing.end_time
+        self.encounter.resolve_actions()
+        # The finished Action is replaced by an ActionRecord in the event history
+        record = self.universe.get_event_by_id(swing.id)
+        self.assertIsInstance(record, ActionRecord)
+        self.assertEqual((record.actor_id, record.target_id, record.instrument_id),
+                         (being_id1, being_id2, weapon_id1))
+        self.assertEqual((record.start_time, record.end_time), (0, swing.end_time))
+        self.assertIn(record.hit_result(), HIT_RESULTS)
+        if record.hit_result() in ("normal", "critical"):
+            self.assertEqual(record.applied_damage, 
+                hit_points - self.universe.get_object_by_id(being_id2).hit_points())
+        # and it is saved with the Universe
+        saved = json.loads(self.universe.to_json())["event_history"][swing.id]
+        self.assertEqual(saved, record.to_dict())
+
+    def run_duel(self, seed, skip_idle_ticks, rng=None, stats=None, bind_actions=False,
+                 pool_actions=False):
+        being_id1 = self.universe.make_being("Human", "Tobe")
+        being_id2 = self.universe.make_being("Human", "NotTobe")
+        weapon_id1 = self.universe.make_weapon("Halberd", "Reach")
+        weapon_id2 = self.universe.make_weapon("Short sword", "Pilfer")
+        self.universe.arm_being(being_id1, weapon_id1, "right hand")
+        self.universe.arm_being(being_id2, weapon_id2, "right hand")
+        encounter = Encounter(self.universe, 15, 0, rng=rng, bind_actions=bind_actions,
+                              pool_actions=pool_actions)
+        encounter.add_being(being_id1)
+        encounter.add_being(being_id2)
+        random.seed(seed)
+        encounter.run(skip_idle_ticks=skip_idle_ticks, stats=stats)
+        being1 = self.universe.get_object_by_id(being_id1)
+        being2 = self.universe.get_object_by_id(being_id2)
+        return (being1.hit_points(), being2.hit_points(), encounter.time, 
+                len(encounter.finished_action_list))
+
+    def test_run_skip_idle_ticks(self):
+        # Skipping idle ticks gives the same results as stepping one tick at a time
+        for seed in range(10):
+            self.assertEqual(self.run_duel(seed, False), self.run_duel(seed, True))
+
+    def test_run_pool_actions(self):
+        # Pooled Actions give the same results, with no more Actions made than are 
+        # pending at once
+        for seed in range(5):
+            result = self.run_duel(seed, True, spawn_rng(seed), pool_actions=True)
+            self.assertEqual(result, self.run_duel(seed, True, spawn_rng(seed)))
+            # Only the Actions left pending are not given back
+            self.assertLessEqual(self.universe.get_action_pool().made, 2 * (seed + 1))
+        self.assertEqual(self.run_duel(0, True, spawn_rng(0), bind_actions=True, 
+                                       pool_actions=True),
+                         self.run_duel(0, True, spawn_rng(0)))
+
+    def test_run_rng(self):
+        # An Encounter with its own random number generator does not depend on the 
+        # state of the random module
+        self.assertEqual(self.run_duel(1, True, spawn_rng(5, 0)), 
+                         self.run_duel(2, True, spawn_rng(5, 0)))
+
+    def make_army(self, count):
+        being_ids = []
+        for i in range(count):
+            being_id = self.universe.make_being("Human", f"Soldier {i}")
+            weapon_id = self.universe.make_weapon("Spear", f"Spear {i}")
+            self.universe.arm_being(being_id, weapon_id, "right hand")
+            being_ids.append(being_id)
+        return being_ids
+
+    def test_add_being(self):
+        encounter = Encounter(self.universe, 15, 0)
+        being_ids = self.make_army(3)
+        for being_id in being_ids + being_ids:
+            encounter.add_being(being_id)
+        self.assertEqual(encounter.being_list, being_ids)
+        self.assertIsNone(encounter._being_set)
+
+        # Only a large battle keeps a set of the ids
+        encounter = Encounter(self.universe, 15, 0, large_battle=True)
+        for being_id in being_ids + being_ids:
+            encounter.add_being(being_id)
+        self.assertEqual(encounter.being_list, being_ids)
+        self.assertEqual(encounter._being_set, set(being_ids))
+
+    def test_choose_alive_opponent(self):
+        being_ids = self.make_army(5)
+        encounter = Encounter(self.universe, 15, 0, rng=spawn_rng(2), large_battle=True)
+        for being_id in being_ids:
+            encounter.add_being(being_id)
+        self.universe.get_object_by_id(being_ids[3]).set_hit_points(0)
+        encounter.find_alive_beings()
+        self.assertEqual(sorted(encounter._alive_list), sorted(being_ids[:3] + being_ids[4:]))
+        for i in range(50):
+            choice = encounter.choose_target_being(being_ids[1])
+            self.assertNotIn(choice, (being_ids[1], being_ids[3]))
+
+        # A Being is taken out of the alive list when its hit points cross zero
+        self.universe.get_object_by_id(being_ids[0]).set_hit_points(-10)
+        encounter.update_alive(being_ids[0])
+        encounter.update_alive(being_ids[2])
+        self.assertEqual(sorted(encounter._alive_list), sorted([being_ids[1], being_ids[2], being_ids[4]]))
+        for being_id, index in encounter._alive_index.items():
+            self.assertEqual(encounter._alive_list[index], being_id)
+        self.assertTrue(encounter.keep_going())
+
+    def test_run_large_battle(self):
+        being_ids = self.make_army(40)
+        encounter = Encounter(self.universe, 15, 0, rng=spawn_rng(4), large_battle=True)
+        for being_id in being_ids:
+            encounter.add_being(being_id)
+        encounter.run(skip_idle_ticks=True)
+        alive = [being_id for being_id in being_ids 
+                 if self.universe.get_object_by_id(being_id).hit_points() > 0]
+        self.assertLessEqual(len(alive), 1)
+        self.assertEqual(encounter._alive_list, alive)
+        self.assertFalse(encounter.keep_going())
+
+    def run_duel_resolve_lookups(self, seed, bind_actions):
+        '''
+        Run a duel and count the registry lookups made while Actions resolve, which 
+        leaves out those that bind() makes when an Action is scheduled.
+        '''
+        stats = EncounterStats()
+        resolve_lookups = []
+        resolve_actions = Encounter.resolve_actions
+        def counted_resolve_actions(encounter):
+            lookups = stats.registry_lookups
+            resolve_actions(encounter)
+            resolve_lookups.append(stats.registry_lookups - lookups)
+        with patch.object(Encounter, 'resolve_actions', counted_resolve_actions):
+            result = self.run_duel(seed, True, spawn_rng(seed), stats, 
+                                   bind_actions=bind_actions)
+        return result, sum(resolve_lookups), stats.actions_resolved()
+
+    def run_armed_battle(self, seed):
+        # A large battle in a Universe of its own, with shields and armor
+        universe = Universe(name="Battle", library=self.universe.library)
+        encounter = Encounter(universe, 15, 0, rng=spawn_rng(seed), large_battle=True)
+        for i in range(30):
+            being_id = universe.make_being("Human", f"Soldier {i}")
+            weapon_id = universe.make_weapon(["Spear", "Longsword"][i % 2], f"Weapon {i}")
+            universe.arm_being(being_id, weapon_id, "right hand")
+            if i % 3 == 0:
+                shield_id = universe.make_weapon("Large shield", f"Shield {i}")
+                universe.arm_being(being_id, shield_id, "left hand")
+            if i % 2 == 0:
+                universe.make_armor_for_being(being_id, "Chain mail", f"Armor {i}")
+            encounter.add_being(being_id)
+        outcomes = OutcomeStats()
+        encounter.run(skip_idle_ticks=True, outcomes=outcomes)
+        return (encounter.time, [universe.get_object_by_id(i).name for i in encounter._alive_list],
+                sorted((obj.name, obj.hit_points()) for obj_id, obj in universe.object_registry),
+                sorted((universe.get_object_by_id(being_id).name, counts) 
+                       for being_id, counts in outcomes.beings.items()))
+
+    def test_run_outcomes(self):
+        universe = Universe(name="Battle", library=self.universe.library)
+        encounter = Encounter(universe, 15, 0, rng=spawn_rng(7))
+        being_ids = []
+        for i in range(2):
+            being_id = universe.make_being("Human", f"Soldier {i}")
+            weapon_id = universe.make_weapon("Longsword", f"Weapon {i}")
+            universe.arm_being(being_id, weapon_id, "right hand")
+            universe.make_armor_for_being(being_id, "Chain mail", f"Armor {i}")
+            encounter.add_being(being_id)
+            being_ids.append(being_id)
+        outcomes = OutcomeStats()
+        encounter.run(skip_idle_ticks=True, stats=EncounterStats(), outcomes=outcomes)
+        records = [universe.get_event_by_id(action_id) 
+                   for action_id in encounter.finished_action_list]
+        self.assertEqual(sum(counts["attacks"] for counts in outcomes.beings.values()),
+                         len([record for record in records if record.outcome is not None]))
+        for being_id in being_ids:
+            counts = outcomes.beings[being_id]
+            self.assertEqual(counts["hits"] + counts["self hits"] + counts["misses"],
+                             counts["attacks"])
+            self.assertEqual(counts["damage dealt"], sum(record.applied_damage 
+                for record in records if record.actor_id == being_id
+                and record.hit_result() in ("normal", "critical", "fatal")))
+
+    def test_resolve_actions_batched(self):
+        # Resolving the due Actions of a tick in one pass, with or without arrays, gives
+        # the results of resolving them one at a time
+        def resolve_one_at_a_time(encounter, actions):
+            results = []
+            for action in actions:
+                results.append(action.resolve(encounter.difficulty_class,
+                    encounter.get_rng(), encounter.use_hit_table))
+                encounter.update_alive(action.actor_id)
+                encounter.update_alive(action.target_id)
+            return results
+        batched = [self.run_armed_battle(seed) for seed in range(3)]
+        resolve_actions_batched = Encounter.resolve_actions_batched
+        Encounter.resolve_actions_batched = resolve_one_at_a_time
+        try:
+            self.assertEqual([self.run_armed_battle(seed) for seed in range(3)], batched)
+        finally:
+            Encounter.resolve_actions_batched = resolve_actions_batched
+        if damage.np is None:
+            return
+        encounter_module.apply_hits = lambda hits: damage.apply_hits(hits, 0)
+        try:
+            self.assertEqual([self.run_armed_battle(seed) for seed in range(3)], batched)
+        finally:
+            encounter_module.apply_hits = damage.apply_hits
+
+    def test_run_bind_actions(self):
+        # Bound Actions give the same results with fewer registry lookups per resolved
+        # Action
+        for seed in range(5):
+            result, lookups, resolved = self.run_duel_resolve_lookups(seed, False)
+            bound_result, bound_lookups, bound_resolved = \
+                self.run_duel_resolve_lookups(seed, True)
+            self.assertEqual(result, bound_result)
+            self.assertGreater(bound_resolved, 0)
+            self.assertLess(bound_lookups / bound_resolved, lookups / resolved)
+
+    def test_run_stats(self):
+        # Instrumentation does not change the results
+        stats = EncounterStats()
+        result = self.run_duel(3, True, spawn_rng(3, 0), stats)
+        self.assertEqual(result, self.run_duel(3, True, spawn_rng(3, 0)))
+        hp1, hp2, time, finished = result
+        ticks = len(stats.ticks)
+        self.assertGreater(ticks, 1)
+        self.assertLess(ticks, time)
+        for phase in EncounterStats.phases:
+            self.assertEqual(stats.phase_calls[phase], ticks)
+        self.assertEqual(stats.actions_resolved(), finished)
+        # Every Action resolved was created, and at most two more are pending at the end
+        self.assertIn(stats.actions_created() - finished, (0, 1, 2))
+        self.assertEqual(stats.ticks[0][:3], (0, 2, 0))
+        self.assertEqual(stats.registry_lookups, sum(tick[3] for tick in stats.ticks))
+        self.assertGreater(stats.registry_lookups, 0)
+        # Lookups are no longer counted after the run
+        self.assertNotIn("get_object_by_id", self.universe.__dict__)
+        self.universe.get_object_by_id(0)
+        self.assertEqual(stats.registry_lookups, sum(tick[3] for tick in stats.ticks))
+
+
 if __name__ == '__main__':
     unittest.main()
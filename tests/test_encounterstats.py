@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_encounterstats.py 2026-10-18T14:50-03:00"
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+from encounterstats import EncounterStats
+
+class Registry():
+    def get_object_by_id(self, obj_id):
+        return obj_id
+
+    def get_event_by_id(self, event_id):
+        return event_id
+
+class TestEncounterStats(unittest.TestCase):
+    def test_time_phase(self):
+        stats = EncounterStats()
+        self.assertEqual(stats.time_phase("move", lambda: 7), 7)
+        stats.time_phase("move", lambda: None)
+        self.assertEqual(stats.phase_calls["move"], 2)
+        self.assertGreaterEqual(stats.phase_times["move"], 0)
+        self.assertEqual(stats.total_time(), stats.phase_times["move"])
+
+    def test_count_lookups(self):
+        stats = EncounterStats()
+        registry = Registry()
+        stats.count_lookups(registry)
+        self.assertEqual(registry.get_object_by_id(4), 4)
+        registry.get_event_by_id(5)
+        self.assertEqual(stats.registry_lookups, 2)
+        stats.stop_counting_lookups(registry)
+        registry.get_object_by_id(4)
+        self.assertEqual(stats.registry_lookups, 2)
+
+    def test_ticks(self):
+        stats = EncounterStats()
+        stats.add_tick(0, 2, 0, 10)
+        stats.add_tick(5, 1, 1, 6)
+        totals = stats.to_dict()
+        self.assertEqual(totals["ticks"], 2)
+        self.assertEqual(totals["actions created"], 3)
+        self.assertEqual(totals["actions resolved"], 1)
+        self.assertIn("2 ticks, 1.50 actions created", stats.summary())
+
+if __name__ == '__main__':
+    unittest.main()
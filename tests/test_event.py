@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "test_event.py 2024-02-28T03:22-03:00"
+__version__ = "test_event.py 2026-10-18T09:12-03:00"
 
 # TODO: Check comprehensiveness
 
@@ -17,7 +17,7 @@ sys.path.insert(0, os.path.abspath('../src'))
 from action import Action
 from being import BeingDefinition, BeingInstance
 from identifiable import Identifiable
-from event import Event
+from event import Event, EventQueue
 from library import Library
 from universe import Universe
 
@@ -115,5 +115,29 @@ class TestEvent(unittest.TestCase):
 
         self.assertTrue(event1.equivalent_to(event2))
 
+class TestEventQueue(unittest.TestCase):
+    def setUp(self):
+        self.universe = Universe(name="Test Universe", library=Library(config_dir="../src/config"))
+
+    def test_pop_due(self):
+        queue = EventQueue()
+        event1 = Event(self.universe, 0, 6, name="first")
+        event2 = Event(self.universe, 0, 4, name="second")
+        event3 = Event(self.universe, 2, 6, name="third")
+        queue.push(event1)
+        queue.push(event2)
+        queue.push(event3)
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.next_time(), 4)
+
+        # Nothing ends before time 4
+        self.assertEqual(queue.pop_due(3), [])
+        self.assertEqual(queue.pop_due(4), [event2])
+
+        # Events that end at the same time come out in the order they were scheduled
+        self.assertEqual(queue.pop_due(6), [event1, event3])
+        self.assertEqual(len(queue), 0)
+        self.assertIsNone(queue.next_time())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_exactduel.py 2026-10-18T12:40-03:00"
+
+import math
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from duelist import Duelist, make_duelists
+from library import Library
+from matchup import Matchup, MatchupRunner
+from universe import Universe
+
+if np is not None:
+    from exactduel import ExactDuel
+    from vectorduel import VectorDuel
+
+def make_jab_duelist(name, hit_points, timing):
+    attack = {"attack_type": "thrust", "timing": timing, "damage": 1,
+              "penetration_types": "P", "attack_level": 0}
+    return Duelist(name, hit_points, 0, 0, [attack])
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestExactDuel(unittest.TestCase):
+    def test_one_hit_point(self):
+        # Each attack hits for 1 on rolls of 15 through 20 and hits self on two 1s
+        duel = ExactDuel(make_jab_duelist("A", 1, 1), make_jab_duelist("B", 1, 1))
+        p_hit = 0.3 - 0.05 * 0.05 * 0.7
+        p_fatal = 0.05 * 0.05 * 0.7
+        p_self = 0.05 * 0.05
+        self.assertAlmostEqual(sum(duel.effects[0][0].values()), p_hit + p_fatal + p_self)
+        result = duel.solve()
+        self.assertAlmostEqual(sum(result.final.values()), 1.0)
+        # Both attack every turn, so the duel is symmetric but for who hits self
+        p_end = 1 - (1 - p_hit - p_fatal - p_self) ** 2
+        self.assertAlmostEqual(result.turns, 1 + 1 / p_end)
+        self.assertAlmostEqual(result.wins, result.losses)
+
+    def test_timing(self):
+        # A slower attack resolves less often
+        result = ExactDuel(make_jab_duelist("A", 5, 2), make_jab_duelist("B", 5, 3)).solve()
+        self.assertGreater(result.wins, result.losses)
+        self.assertAlmostEqual(result.wins + result.losses + result.draws, 1.0)
+
+    def test_matches_vector_duel(self):
+        duelist_a = make_jab_duelist("A", 4, 2)
+        duelist_b = make_jab_duelist("B", 3, 3)
+        duelist_b.shield_sizes = [1]
+        expected = ExactDuel(duelist_a, duelist_b).solve()
+        result = VectorDuel(duelist_a, duelist_b).result(100000, seed=6)
+        n = result.trials()
+        p = expected.wins
+        self.assertLess(abs(result.wins / n - p), 4 * math.sqrt(p * (1 - p) / n))
+        self.assertLess(abs(result.turns / n - expected.turns), 0.02 * expected.turns)
+
+    def test_matches_encounter(self):
+        universe = Universe(name="Test Universe", library=Library(config_dir="../src/config"))
+        matchup = Matchup("Human", "Longsword", "Human", "Dagger",
+            armor_a="Leather armor", shield_b="Buckler", trials=400, seed=3)
+        duelist_a, duelist_b = make_duelists(universe, matchup)
+        expected = ExactDuel(duelist_a, duelist_b, matchup.difficulty_class).solve()
+        result = MatchupRunner(config_dir="../src/config", processes=1).run(matchup)
+        n = result.trials()
+        p = expected.wins
+        self.assertLess(abs(result.wins / n - p), 4 * math.sqrt(p * (1 - p) / n))
+        self.assertLess(abs(result.turns / n - expected.turns), 0.1 * expected.turns)
+        self.assertLess(abs(result.hp_given / n - expected.hp_given), 0.1 * expected.hp_given)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_matchup.py 2026-10-18T21:15-03:00"
+
+import unittest
+import sys
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+import matchup
+from library import Library
+from matchup import Matchup, MatchupResult, MatchupRunner, NoMeleeActionError
+from strategy import Strategy
+from universe import Universe
+
+class TestMatchupResult(unittest.TestCase):
+    def test_add_trial(self):
+        result = MatchupResult()
+        result.add_trial(10, 5, 12)
+        result.add_trial(3, 8, 20)
+        result.add_trial(4, 4, 7)
+        self.assertEqual(result.trials(), 3)
+        self.assertEqual(result.to_dict(), {"wins": 1, "losses": 1, "draws": 1, 
+            "hp given": 17, "hp taken": 17, "turns": 39})
+
+    def test_merge(self):
+        result = MatchupResult(1, 2, 3, 4, 5, 6)
+        result.merge(MatchupResult(6, 5, 4, 3, 2, 1))
+        self.assertEqual(result.to_dict(), {"wins": 7, "losses": 7, "draws": 7, 
+            "hp given": 7, "hp taken": 7, "turns": 7})
+
+    def test_win_rate_interval(self):
+        self.assertEqual(MatchupResult().win_rate_interval(), (0.0, 1.0))
+        result = MatchupResult(wins=10)
+        low, high = result.win_rate_interval()
+        self.assertAlmostEqual(low, 10 / (10 + 1.959964 ** 2), places=5)
+        self.assertEqual(high, 1.0)
+        # More trials with the same win rate narrow the interval
+        result = MatchupResult(wins=20, losses=20)
+        self.assertAlmostEqual(sum(result.win_rate_interval()) / 2, 0.5)
+        wider = result.win_rate_ci_width()
+        result.merge(MatchupResult(wins=20, losses=20))
+        self.assertLess(result.win_rate_ci_width(), wider)
+        self.assertLess(result.win_rate_ci_width(0.9), result.win_rate_ci_width(0.99))
+
+class TestMatchupRunner(unittest.TestCase):
+    def setUp(self):
+        self.matchup = Matchup("Human", "Spear", "Human", "Quarterstaff", 
+            armor_a="Chain mail", armor_b="Chain mail", strategy_a=Strategy(attack=1), 
+            trials=40, seed=7)
+
+    def test_chunks(self):
+        runner = MatchupRunner(processes=2, chunk_size=15)
+        self.assertEqual(runner.chunks(40), [(0, 15), (15, 30), (30, 40)])
+        self.assertEqual(runner.chunks(40, 20), [(20, 35), (35, 40)])
+
+    def test_batches(self):
+        runner = MatchupRunner(processes=2)
+        self.assertEqual(runner.batches(self.matchup), [(0, 40)])
+        self.matchup.ci_width = 0.2
+        self.matchup.batch_size = 15
+        self.assertEqual(runner.batches(self.matchup), [(0, 15), (15, 30), (30, 40)])
+
+    def test_run(self):
+        runner = MatchupRunner(config_dir="../src/config", processes=1, chunk_size=7)
+        result = runner.run(self.matchup)
+        self.assertEqual(result.trials(), 40)
+        self.assertGreater(result.turns, 0)
+
+        # The same seed gives the same results serially or over a pool of workers
+        parallel_runner = MatchupRunner(config_dir="../src/config", processes=2)
+        self.assertEqual(parallel_runner.run(self.matchup).to_dict(), result.to_dict())
+
+    def test_reset_contestant(self):
+        universe = Universe(library=Library("../src/config"))
+        object_ids = matchup.make_contestant(universe, "Human", "A", "Spear", 
+            "Chain mail", "Buckler", Strategy())
+        being_id, weapon_id, shield_id, armor_id = object_ids
+        being = universe.get_object_by_id(being_id)
+        armor = universe.get_object_by_id(armor_id)
+        being.current.hit_points = 1
+        being.current.fatigue_level = 2
+        being.body_part_remove_object("right hand")
+        armor.current.hit_points = 0
+        matchup._reset_contestant(universe, object_ids, "Buckler", "Chain mail")
+        self.assertEqual(being.hit_points(), being.original.hit_points)
+        self.assertEqual(being.current.fatigue_level, 0)
+        self.assertEqual(being.get_body_parts().get("right hand"), weapon_id)
+        self.assertEqual(being.get_body_parts().get("left hand"), shield_id)
+        self.assertEqual(being.current.armor_id, armor_id)
+        self.assertEqual(armor.current.hit_points, armor.original.hit_points)
+
+    def test_run_trials_leaves_no_objects(self):
+        matchup._init_worker("../src/config")
+        registry = matchup._worker_universe.get_object_registry()
+        objects = registry.len()
+        matchup._run_trials((self.matchup, 0, 3))
+        matchup._run_trials((self.matchup, 3, 6))
+        self.assertEqual(registry.len(), objects)
+
+    def test_run_ci_width(self):
+        # A lopsided Matchup stops as soon as the win rate is known well enough
+        matchup = Matchup("Human", "Halberd", "Kobold", "Dagger", armor_b="Padded armor",
+            trials=1000, seed=11, ci_width=0.3, batch_size=10)
+        runner = MatchupRunner(config_dir="../src/config", processes=1)
+        result = runner.run(matchup)
+        self.assertLess(result.trials(), 1000)
+        self.assertEqual(result.trials() % 10, 0)
+        self.assertLessEqual(result.win_rate_ci_width(), 0.3)
+        parallel_runner = MatchupRunner(config_dir="../src/config", processes=2)
+        self.assertEqual(parallel_runner.run(matchup).to_dict(), result.to_dict())
+
+        # Or when it runs out of trials
+        matchup.ci_width = 0.01
+        matchup.trials = 25
+        self.assertEqual(runner.run(matchup).trials(), 25)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_run_buffered_rolls(self):
+        runner = MatchupRunner(config_dir="../src/config", processes=1, chunk_size=7)
+        self.matchup.buffered_rolls = True
+        result = runner.run(self.matchup)
+        self.assertEqual(result.trials(), 40)
+        parallel_runner = MatchupRunner(config_dir="../src/config", processes=2)
+        self.assertEqual(parallel_runner.run(self.matchup).to_dict(), result.to_dict())
+
+    def test_run_use_hit_table(self):
+        runner = MatchupRunner(config_dir="../src/config", processes=1)
+        self.matchup.use_hit_table = True
+        result = runner.run(self.matchup)
+        self.assertEqual(result.trials(), 40)
+        self.assertEqual(runner.run(self.matchup).to_dict(), result.to_dict())
+
+    def test_run_pool_actions(self):
+        runner = MatchupRunner(config_dir="../src/config", processes=1)
+        result = runner.run(self.matchup)
+        self.matchup.pool_actions = True
+        self.assertEqual(runner.run(self.matchup).to_dict(), result.to_dict())
+        # The trials reuse the same few Actions
+        self.assertLessEqual(matchup._worker_universe.get_action_pool().made, 2)
+
+    def test_run_not_melee(self):
+        runner = MatchupRunner(config_dir="../src/config", processes=1)
+        matchup = Matchup("Human", "Longbow", "Human", "Dagger", trials=1)
+        with self.assertRaises(NoMeleeActionError):
+            runner.run(matchup)
+        # A name that is not in the Library is a different error
+        matchup = Matchup("Human", "Longswrod", "Human", "Dagger", trials=1)
+        with self.assertRaises(ValueError) as context:
+            runner.run(matchup)
+        self.assertNotIsInstance(context.exception, NoMeleeActionError)
+
+if __name__ == '__main__':
+    unittest.main()
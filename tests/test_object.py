@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2024 Rauthiflor LLC"
-__version__ = "test_object.py 2024-03-15T22:54-03:00"
+__version__ = "test_object.py 2026-10-18T23:40-03:00"
 
 # TODO: Check comprehensiveness
 # TODO: Make sure an ObjectInstance is inside one and only one ObjectInstance as it's immediate container
@@ -15,8 +15,11 @@ import os
 sys.path.insert(0, os.path.abspath('../src'))
 #print(f'{__version__}:{sys.path}')
 
-from object import ObjectInstance, ObjectDefinition, ObjectDictionary, ObjectRegistry
+from object import ObjectInstance, ObjectDefinition, ObjectDictionary, ObjectRegistry, \
+    CopyOnWrite, copy_value
 
+import json
+import pickle
 import unittest
 
 class TestObjectDefinition(unittest.TestCase):
@@ -202,6 +205,36 @@ class TestObjectInstance(unittest.TestCase):
         self.apple_inst.damage(hp_before-1)
         self.assertEqual(self.apple_inst.hit_points(), 1)
 
+    def test_copy_on_write(self):
+        current = self.apple_inst.current
+        self.assertIsInstance(current, CopyOnWrite)
+        self.assertIsInstance(current, ObjectDefinition)
+        self.assertIs(current.get_definition(), self.apple_def)
+        self.assertEqual(current.get_changed_values(), {})
+        # Changes to the current values leave the definition alone
+        self.apple_inst.damage(5)
+        self.apple_inst.set_tag('ripe', True)
+        self.apple_inst.add_weapon_category('fruit')
+        self.assertEqual((self.apple_def.hit_points, self.apple_def.tags, 
+                          self.apple_def.weapon_categories), (20, {}, []))
+        self.assertEqual(set(current.get_changed_values()), 
+                         {'hit_points', 'tags', 'weapon_categories'})
+        values = current.get_values()
+        self.assertEqual(list(values), list(vars(self.apple_def)))
+        self.assertEqual((values['hit_points'], values['tags']), (15, {'ripe': True}))
+        self.assertEqual(json.loads(self.apple_inst.to_json())['current']['hit_points'], 15)
+        restored = pickle.loads(pickle.dumps(current))
+        self.assertEqual(restored.get_values(), values)
+        with self.assertRaises(AttributeError):
+            current.no_such_value
+
+    def test_copy_value(self):
+        attacks = {'S': {'t': 5, 'd': 8}}
+        copied = copy_value(attacks)
+        self.assertEqual(copied, attacks)
+        self.assertIsNot(copied['S'], attacks['S'])
+        self.assertIs(copy_value('B,P'), 'B,P')
+
 class TestObjectDictionary(unittest.TestCase):
     def setUp(self):
         self.objects_file = '../src/config/objects.tsv'
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_outcomestats.py 2026-10-18T20:20-03:00"
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+from action import ActionRecord, HIT_RESULT_CODES
+from outcomestats import OutcomeStats
+
+def record(hit_type, actor_id="A", target_id="B", rolled=0, shield=0, armor=0, applied=0):
+    outcome = None if hit_type is None else HIT_RESULT_CODES[hit_type]
+    return ActionRecord("id", "swing", actor_id, target_id, "W", 0, 5, outcome, rolled,
+                        shield, armor, applied)
+
+class TestOutcomeStats(unittest.TestCase):
+    def setUp(self):
+        self.stats = OutcomeStats()
+        self.stats.add(record("normal", rolled=8, shield=2, armor=3, applied=3))
+        self.stats.add(record("critical", rolled=12, armor=3, applied=9))
+        self.stats.add(record("miss"))
+        self.stats.add(record("hit self", rolled=4, armor=1, applied=3))
+        self.stats.add(record("fatal", actor_id="B", target_id="A"))
+        self.stats.add(record(None))
+
+    def test_add(self):
+        a = self.stats.beings["A"]
+        self.assertEqual((a["attacks"], a["hits"], a["criticals"], a["self hits"],
+                          a["misses"]), (4, 2, 1, 1, 1))
+        self.assertEqual((a["damage rolled"], a["damage dealt"]), (24, 15))
+        # Damage stopped and taken is credited to the victim
+        self.assertEqual((a["shield stopped"], a["armor stopped"], a["damage taken"]),
+                         (0, 1, 3))
+        b = self.stats.beings["B"]
+        self.assertEqual((b["attacks"], b["fatal hits"], b["criticals"]), (1, 1, 1))
+        self.assertEqual((b["shield stopped"], b["armor stopped"], b["damage taken"]),
+                         (2, 6, 12))
+
+    def test_rates(self):
+        self.assertEqual(self.stats.hit_rate("A"), 0.5)
+        self.assertEqual(self.stats.critical_rate("A"), 0.25)
+        self.assertEqual(self.stats.hit_rate("B"), 1)
+        self.assertEqual(self.stats.hit_rate("C"), 0)
+
+    def test_merge(self):
+        merged = OutcomeStats()
+        merged.merge(self.stats)
+        merged.merge(self.stats)
+        self.assertEqual(merged.beings["A"]["attacks"], 8)
+        self.assertEqual(merged.hit_rate("A"), self.stats.hit_rate("A"))
+
+    def test_to_dict_and_summary(self):
+        data = self.stats.to_dict()
+        self.assertEqual(data["A"]["hit rate"], 0.5)
+        self.assertEqual(data["B"]["damage taken"], 12)
+        lines = self.stats.summary({"A": "Tobe"}).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("Tobe"))
+
+if __name__ == '__main__':
+    unittest.main()
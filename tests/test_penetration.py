@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_penetration.py 2026-10-18T18:30-03:00"
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+
+from armor import ArmorInstance
+from library import Library
+from universe import Universe
+
+class TestPenetrationMatrix(unittest.TestCase):
+    def setUp(self):
+        self.library = Library(config_dir="../src/config")
+        self.matrix = self.library.penetration_matrix
+
+    def test_matches_armor_instances(self):
+        for (weapon_type, attack_type), p in self.matrix.penetration_types.items():
+            weapon = self.library.get_weapon_definition(weapon_type)
+            for armor_type, armor_def in self.library.armor_dictionary.objects.items():
+                armor = ArmorInstance(armor_def, armor_type)
+                self.assertEqual(self.matrix.get(weapon_type, attack_type, armor_type),
+                    (armor.worst_defense_damage_stopped(p), armor.worst_defense_hardness(p)))
+
+    def test_get(self):
+        armor = self.library.get_armor_definition("Chain mail")
+        weapon = self.library.get_weapon_definition("Longsword")
+        stopped = min(armor.defenses[p]['d'] for p in weapon.Sp().split(','))
+        hardness = min(armor.defenses[p]['h'] for p in weapon.Sp().split(','))
+        self.assertEqual(self.matrix.damage_stopped("Longsword", "swing", "Chain mail"), stopped)
+        self.assertEqual(self.matrix.hardness("Longsword", "swing", "Chain mail"), hardness)
+        self.assertIsNone(self.matrix.get("Longsword", "swing", "Cardboard"))
+        self.assertIsNone(self.matrix.get("Arm", "throw", "Chain mail"))
+
+    def test_effectiveness(self):
+        effectiveness = self.matrix.effectiveness("Longsword", "thrust")
+        self.assertEqual(len(effectiveness), len(self.library.armor_dictionary.objects))
+        stopped = list(effectiveness.values())
+        self.assertEqual(stopped, sorted(stopped))
+
+    def test_rows(self):
+        rows = self.matrix.rows()
+        self.assertEqual(len(rows), len(self.matrix.penetration_types) *
+                         len(self.library.armor_dictionary.objects))
+        self.assertEqual(set(rows[0]), {"weapon", "attack type", "penetration types",
+                                        "armor", "damage stopped", "hardness"})
+
+    def test_universe_armor_shares_table(self):
+        universe = Universe(name="Test Universe", library=self.library)
+        armor = universe.get_object_by_id(universe.make_armor("Chain mail", "Chainy"))
+        table = self.matrix.armor_table("Chain mail")
+        self.assertIs(armor._defense_table, table)
+        armor.set_defenses({'B': {'h': 0, 'd': 0}, 'P': {'h': 0, 'd': 0},
+                            'S': {'h': 0, 'd': 0}})
+        self.assertIsNot(armor._defense_table, table)
+        self.assertEqual(armor.worst_defense_damage_stopped('S'), 0)
+        # The matrix is left as it was
+        self.assertEqual(self.matrix.damage_stopped("Longsword", "swing", "Chain mail"),
+                         self.library.get_armor_definition("Chain mail").Sd())
+
+if __name__ == '__main__':
+    unittest.main()
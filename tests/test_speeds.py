@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_speeds.py 2023-03-30T02:11-03:00"
+__version__ = "test_speeds.py 2026-10-19T00:30-03:00"
 
 # TODO: Check comprehensiveness
 
@@ -61,5 +61,12 @@ class TestSpeeds(unittest.TestCase):
         self.assertEqual(self.speed.fly(), 3)
         self.assertEqual(self.speed.swim(), 2)
 
+    def test_to_dict(self):
+        self.speed = Speed(6, 5, 4, 3, 2)
+        self.assertEqual(self.speed.to_dict(), {'speeds': 
+            {'ambulate': 6, 'burrow': 5, 'climb': 4, 'fly': 3, 'swim': 2}})
+        with self.assertRaises(AttributeError):
+            self.speed.walk = 3
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,18 +3,19 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_states.py 2023-03-30T02:11-03:00"
+__version__ = "test_states.py 2026-10-19T00:30-03:00"
 
 # TODO: Check comprehensiveness
 
 import unittest
 import sys
 import os
+import pickle
 
 sys.path.insert(0, os.path.abspath('../src'))
 #print(f'{__version__}:{sys.path}')
 
-from states import States, StatesList
+from states import States, StatesList, state_bit
 
 class TestStates(unittest.TestCase):
     def setUp(self):
@@ -46,5 +47,42 @@ class TestStates(unittest.TestCase):
         self.assertIsNot(self.states, copy)
         self.assertEqual(self.states.get_states(), copy.get_states())
 
+    def test_get_state(self):
+        self.assertIsNone(self.states.get_state('prone'))
+        self.states.set_state(self.states_list, 'prone', True)
+        self.states.set_state(self.states_list, 'held', False)
+        self.assertEqual((self.states.get_state('prone'), self.states.get_state('held')),
+                         (True, False))
+        self.assertEqual(self.states.get_states(), {'prone': True, 'held': False})
+        self.assertEqual(self.states.to_dict(), {'states': self.states.get_states()})
+        self.states.set_state(self.states_list, 'prone', False)
+        self.assertIs(self.states.get_state('prone'), False)
+
+    def test_any_in_effect(self):
+        bits = state_bit('stunned') | state_bit('paralyzed')
+        self.assertFalse(self.states.any_in_effect(bits))
+        self.states.set_state(self.states_list, 'paralyzed', False)
+        self.assertFalse(self.states.any_in_effect(bits))
+        self.states.set_state(self.states_list, 'stunned', True)
+        self.assertTrue(self.states.any_in_effect(bits))
+        self.states.remove_state('stunned')
+        self.assertFalse(self.states.any_in_effect(bits))
+        self.assertIsNone(self.states.get_state('stunned'))
+
+    def test_order(self):
+        other = States()
+        other.set_state(self.states_list, 'prone', True)
+        self.states.set_state(self.states_list, 'held', True)
+        self.states.set_state(self.states_list, 'prone', False)
+        self.assertEqual(list(self.states.get_states().items()), 
+                         [('held', True), ('prone', False)])
+        self.states.remove_state('held')
+        self.states.set_state(self.states_list, 'held', False)
+        self.assertEqual(list(self.states.get_states()), ['prone', 'held'])
+        restored = pickle.loads(pickle.dumps(self.states))
+        self.assertEqual(list(restored.get_states().items()), 
+                         [('prone', False), ('held', False)])
+        self.assertEqual(list(self.states.copy().get_states()), ['prone', 'held'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_tournament.py 2026-10-18T14:20-03:00"
+
+import csv
+import tempfile
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+from tournament import Tournament
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.directory.name, "results", "weapons.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_tournament(self, weapons, processes=1):
+        return Tournament(weapons, [None, "Leather armor"], ["Human"], self.output_file,
+            config_dir="../src/config", processes=processes, trials=6, seed=5)
+
+    def read_rows(self):
+        with open(self.output_file, newline='') as csvfile:
+            return list(csv.DictReader(csvfile))
+
+    def test_matchups(self):
+        tournament = self.make_tournament(["Dagger", "Spear", "Club"])
+        matchups = tournament.matchups()
+        self.assertEqual(len(matchups), 6)
+        self.assertEqual(tournament.key(matchups[0]), "Human||Dagger|Spear")
+        self.assertEqual(matchups[0].seed, "5:Human||Dagger|Spear")
+        self.assertEqual(tournament.checkpoint_file,
+                         os.path.join(self.directory.name, "results", "weapons.checkpoint"))
+
+    def test_run_and_resume(self):
+        tournament = self.make_tournament(["Dagger", "Spear"])
+        self.assertEqual(tournament.run(), 2)
+        rows = self.read_rows()
+        self.assertEqual([row["armor1"] for row in rows], ["", "Leather armor"])
+        self.assertEqual(rows[1]["trials"], "6")
+
+        # A bigger Tournament in the same files runs only the new Matchups
+        tournament = self.make_tournament(["Dagger", "Spear", "Longbow", "Club"])
+        self.assertEqual(len(tournament.pending_matchups()), 10)
+        self.assertEqual(tournament.run(), 4)
+        self.assertEqual(len(self.read_rows()), 6)
+        # Matchups with a weapon that cannot be used in melee are checkpointed
+        self.assertEqual(tournament.pending_matchups(), [])
+        self.assertEqual(tournament.run(), 0)
+
+    def test_resume_from_rows(self):
+        # A row written without its key in the checkpoint is not run again
+        tournament = self.make_tournament(["Dagger", "Spear"])
+        tournament.run()
+        os.remove(tournament.checkpoint_file)
+        self.assertEqual(tournament.pending_matchups(), [])
+
+    def test_resume_from_partial_row(self):
+        # A row cut short is run again, and the rows after it start on a line of their own
+        tournament = self.make_tournament(["Dagger", "Spear"])
+        tournament.run()
+        rows = self.read_rows()
+        size = os.path.getsize(self.output_file)
+        with open(self.output_file, 'rb+') as csvfile:
+            csvfile.truncate(size - 25)
+        os.remove(tournament.checkpoint_file)
+        self.assertEqual(len(tournament.pending_matchups()), 1)
+        self.assertEqual(tournament.run(), 1)
+        self.assertEqual(self.read_rows(), rows)
+
+    def test_unknown_names(self):
+        # Names not in the Library raise rather than being checkpointed without a row
+        tournament = Tournament(["Longsword", "Longswrod"], ["Chian mail"], ["Human"],
+            self.output_file, config_dir="../src/config", processes=1, trials=6)
+        with self.assertRaises(ValueError):
+            tournament.run()
+        self.assertFalse(os.path.exists(tournament.checkpoint_file))
+
+    def test_run_processes(self):
+        # Seeded results do not depend on the number of worker processes
+        tournament = self.make_tournament(["Dagger", "Spear", "Club"])
+        tournament.run()
+        serial = {row["Matchup"]: row for row in self.read_rows()}
+        os.remove(tournament.output_file)
+        os.remove(tournament.checkpoint_file)
+        self.make_tournament(["Dagger", "Spear", "Club"], processes=2).run()
+        parallel = {row["Matchup"]: row for row in self.read_rows()}
+        self.assertEqual(parallel, serial)
+
+if __name__ == '__main__':
+    unittest.main()
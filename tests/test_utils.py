@@ -3,7 +3,7 @@
 
 __author__ = "John Wieczorek"
 __copyright__ = "Copyright 2023 Rauthiflor LLC"
-__version__ = "test_utils.py 2023-01-03T14:43+02:00"
+__version__ = "test_utils.py 2026-10-18T16:40-03:00"
 
 # TODO: Check comprehensiveness
 
@@ -14,8 +14,17 @@ import os
 sys.path.insert(0, os.path.abspath('../src'))
 #print(f'{__version__}:{sys.path}')
 
-from utils import get_random_key
-from utils import roll_dice
+import random
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils import get_random_key, spawn_rng
+from utils import roll_dice, Dice, get_dice
+from utils import roll_dice_batch, roll_dice_matrix, RollBuffer
 from utils import convert_to_numeric, convert_to_boolean, convert_to_dc
 from utils import convert_to_ability, convert_to_speed, convert_to_experience
 from utils import convert_to_fatigue
@@ -39,6 +48,116 @@ class TestGetRandomKey(unittest.TestCase):
         result = get_random_key(the_dict)
         self.assertIn(result, the_dict.keys())
 
+    def test_with_rng(self):
+        the_dict = {'a': 1, 'b': 2, 'c': 3}
+        keys = [get_random_key(the_dict, random.Random(3)) for _ in range(10)]
+        self.assertEqual(len(set(keys)), 1)
+
+class TestSpawnRng(unittest.TestCase):
+    def test_same_seed_and_keys(self):
+        rng1 = spawn_rng(42, 7)
+        rng2 = spawn_rng(42, 7)
+        self.assertEqual([rng1.random() for _ in range(5)], [rng2.random() for _ in range(5)])
+
+    def test_different_keys(self):
+        rng1 = spawn_rng(42, 7)
+        rng2 = spawn_rng(42, 8)
+        self.assertNotEqual([rng1.random() for _ in range(5)], [rng2.random() for _ in range(5)])
+
+class TestDice(unittest.TestCase):
+    def test_parse(self):
+        dice = Dice.parse("3d6-2")
+        self.assertEqual((dice.num_dice, dice.num_sides, dice.modifier), (3, 6, -2))
+        self.assertEqual(Dice(1, 20).expression, "1d20")
+        self.assertEqual(Dice(2, 4, 1).expression, "2d4+1")
+        with self.assertRaises(ValueError):
+            Dice.parse("d20")
+
+    def test_get_dice(self):
+        self.assertIs(get_dice("1d10+0"), get_dice("1d10+0"))
+        self.assertEqual(get_dice("1d10+0").modifier, 0)
+
+    def test_min_max_mean(self):
+        dice = get_dice("2d6+3")
+        self.assertEqual(dice.min(), 5)
+        self.assertEqual(dice.max(), 15)
+        self.assertEqual(dice.mean(), 10)
+
+    def test_distribution(self):
+        distribution = get_dice("2d6-1").distribution()
+        self.assertEqual(sum(distribution.values()), 1)
+        self.assertEqual(distribution[1], Fraction(1, 36))
+        self.assertEqual(distribution[6], Fraction(6, 36))
+        self.assertEqual(min(distribution), 1)
+        self.assertEqual(max(distribution), 11)
+        mean = sum(total * p for total, p in distribution.items())
+        self.assertEqual(mean, get_dice("2d6-1").mean())
+
+    def test_roll(self):
+        dice = get_dice("3d4+1")
+        rolls = dice.roll_many(200, random.Random(5))
+        self.assertEqual(len(rolls), 200)
+        self.assertTrue(all(dice.min() <= roll <= dice.max() for roll in rolls))
+        # The same stream of rolls as roll_dice
+        rng = random.Random(5)
+        self.assertEqual(rolls, [roll_dice("3d4+1", rng) for _ in range(200)])
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestRollDiceBatch(unittest.TestCase):
+    def test_roll_dice_batch(self):
+        rolls = roll_dice_batch("2d6+1", 10000, np.random.default_rng(1))
+        self.assertEqual(rolls.shape, (10000,))
+        self.assertEqual(rolls.min(), 3)
+        self.assertEqual(rolls.max(), 13)
+        self.assertAlmostEqual(rolls.mean(), 8, delta=0.1)
+        # The same seed gives the same rolls
+        self.assertTrue(np.array_equal(roll_dice_batch("1d20", 50, 3), roll_dice_batch("1d20", 50, 3)))
+
+    def test_roll_dice_batch_shape(self):
+        rolls = roll_dice_batch("1d4", (3, 5), 2)
+        self.assertEqual(rolls.shape, (3, 5))
+        self.assertTrue(((rolls >= 1) & (rolls <= 4)).all())
+
+    def test_roll_dice_matrix(self):
+        matrix = roll_dice_matrix(["1d20", "1d8", "1d10+0"], 1000, 4)
+        self.assertEqual(matrix.shape, (3, 1000))
+        self.assertEqual(matrix[1].max(), 8)
+        self.assertEqual(matrix[2].min(), 1)
+
+class TestRollBuffer(unittest.TestCase):
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_random_compatible(self):
+        rng = RollBuffer(5, block_size=16)
+        rolls = [rng.randint(1, 20) for _ in range(100)]
+        self.assertTrue(all(1 <= roll <= 20 for roll in rolls))
+        self.assertEqual(len(set(rolls)), 20)
+        self.assertTrue(all(0 <= rng.randrange(3) < 3 for _ in range(50)))
+        self.assertTrue(all(2 <= rng.randrange(2, 4) < 4 for _ in range(50)))
+        self.assertIn(rng.choice(['a', 'b']), ['a', 'b'])
+        self.assertTrue(0 <= rng.random() < 1)
+        self.assertIn(get_random_key({'a': 1, 'b': 2}, rng), ['a', 'b'])
+        with self.assertRaises(IndexError):
+            rng.choice([])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_shared_block(self):
+        # Every range is scaled from the same block of uniform draws
+        rng1, rng2 = RollBuffer(3, block_size=8), RollBuffer(3, block_size=8)
+        for stop in range(2, 40):
+            self.assertEqual(rng1.randrange(stop), int(rng2.random() * stop))
+        counts = [0] * 6
+        for _ in range(6000):
+            counts[rng1.randint(1, 6) - 1] += 1
+        self.assertTrue(all(900 < count < 1100 for count in counts))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_roll_dice(self):
+        # Rolls from a buffer are reproducible from its seed
+        rolls = [roll_dice("1d8", RollBuffer(9)) for _ in range(3)]
+        self.assertEqual(len(set(rolls)), 1)
+        rng1, rng2 = RollBuffer(9), RollBuffer(9)
+        self.assertEqual(get_dice("3d6").roll_many(500, rng1), get_dice("3d6").roll_many(500, rng2))
+
 class TestRollDice(unittest.TestCase):    
     def test_valid_input(self):
         i=0
@@ -76,6 +195,13 @@ class TestRollDice(unittest.TestCase):
             result = roll_dice('2d4-1')
             self.assertLessEqual(result,7)
             self.assertGreaterEqual(result,1)
+
+    def test_with_rng(self):
+        rng1 = random.Random(11)
+        rng2 = random.Random(11)
+        rolls1 = [roll_dice('3d6+1', rng1) for _ in range(20)]
+        rolls2 = [roll_dice('3d6+1', rng2) for _ in range(20)]
+        self.assertEqual(rolls1, rolls2)
     
     def test_invalid_input(self):
         with self.assertRaises(ValueError) as cm:
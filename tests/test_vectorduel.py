@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = "John Wieczorek"
+__copyright__ = "Copyright 2024 Rauthiflor LLC"
+__version__ = "test_vectorduel.py 2026-10-18T11:45-03:00"
+
+import math
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('../src'))
+#print(f'{__version__}:{sys.path}')
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from duelist import make_duelists
+from library import Library
+from matchup import Matchup, MatchupRunner
+from universe import Universe
+
+if np is not None:
+    from vectorduel import VectorDuel, NORMAL, FATAL, HIT_SELF, MISS
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorDuel(unittest.TestCase):
+    def setUp(self):
+        self.universe = Universe(name="Test Universe", library=Library(config_dir="../src/config"))
+        self.matchup = Matchup("Human", "Longsword", "Human", "Dagger",
+            armor_a="Leather armor", shield_b="Buckler", trials=400, seed=3)
+        duelist_a, duelist_b = make_duelists(self.universe, self.matchup)
+        self.duel = VectorDuel(duelist_a, duelist_b, 15)
+
+    def test_hit_results(self):
+        rng = np.random.default_rng(1)
+        codes = self.duel.hit_results(rng, 0, np.zeros(200000, dtype=np.int64))
+        # With no attack or defense levels rolls of 2 through 14 miss a DC 15
+        self.assertAlmostEqual(np.mean(codes == MISS), 0.65, delta=0.005)
+        self.assertAlmostEqual(np.mean(codes == NORMAL), 0.25 + 0.05 * 0.7, delta=0.005)
+        self.assertAlmostEqual(np.mean(codes == HIT_SELF), 0.05 * 0.05, delta=0.001)
+        # A fatal hit takes two natural 20s and a failed saving throw
+        self.assertAlmostEqual(np.mean(codes == FATAL), 0.05 * 0.05 * 0.7, delta=0.001)
+
+    def test_run(self):
+        outcome = self.duel.run(1000, seed=4)
+        # Every duel ends with at most one Duelist standing
+        self.assertFalse(np.any((outcome["hp_a"] > 0) & (outcome["hp_b"] > 0)))
+        self.assertTrue(np.all(outcome["turns"] > 1))
+        # The same seed gives the same duels
+        again = self.duel.run(1000, seed=4)
+        self.assertTrue(np.array_equal(outcome["turns"], again["turns"]))
+
+    def test_matches_encounter(self):
+        # The vectorized duels and Encounters agree within sampling error
+        expected = MatchupRunner(config_dir="../src/config", processes=1).run(self.matchup)
+        result = self.duel.result(40000, seed=5)
+        n = expected.trials()
+        p = result.wins / result.trials()
+        self.assertLess(abs(expected.wins / n - p), 4 * math.sqrt(p * (1 - p) / n))
+        mean_turns = result.turns / result.trials()
+        self.assertLess(abs(expected.turns / n - mean_turns), 0.1 * mean_turns)
+        mean_hp_given = result.hp_given / result.trials()
+        self.assertLess(abs(expected.hp_given / n - mean_hp_given), 0.1 * mean_hp_given)
+
+if __name__ == '__main__':
+    unittest.main()